@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark for the `trident` and `veil` CLIs.
+
+For every subcommand this runs a fresh interpreter several times and
+reports:
+- wall-clock time of the whole invocation (median / min)
+- total import time and the slowest top-level imports from
+  `python -X importtime`
+
+Use it to catch start-up regressions, e.g. a heavy module imported at
+module level again:
+
+    python benchmarks/cold_start.py
+    python benchmarks/cold_start.py --json > baseline.json
+    python benchmarks/cold_start.py --compare baseline.json --tolerance 0.25
+
+Exit status is 1 when a command fails, exceeds --budget-ms, or is slower
+than the --compare baseline by more than --tolerance.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# (label, argv after the interpreter). Real read-only invocations, so the
+# modules each handler imports lazily are part of the measurement. The
+# veil log and cache point at throwaway directories (see _env): `veil
+# logs` queries an empty log, the diagnostics report is cached by the
+# warm-up run, and `veil update` answers from a seeded version cache
+# (see _seed_version_cache) instead of asking the index.
+COMMANDS = [
+    ("trident --help", ["-m", "trident", "--help"]),
+    ("trident --json status", ["-m", "trident", "--json", "status"]),
+    ("veil --help", ["-m", "trident.veil", "--help"]),
+    ("veil logs --since 1s", ["-m", "trident.veil", "logs", "--since", "1s"]),
+    ("veil --json diagnostics --max-age 3600", ["-m", "trident.veil", "--json", "diagnostics", "--max-age", "3600"]),
+    ("veil --json repair --plan", ["-m", "trident.veil", "--json", "repair", "--plan"]),
+    ("veil --json update", ["-m", "trident.veil", "--json", "update"]),
+]
+
+# Runs with the benchmark environment, so the entry matches the index URL
+# the measured commands will look up.
+_SEED_VERSION_CACHE = """
+import time
+from trident.veil import self_update
+from trident.veil.cache import write_cache
+from trident.veil.identity import get_version
+write_cache(self_update.VERSION_CACHE_FILE, {
+    "url": self_update.get_index_url(), "version": get_version(),
+    "etag": None, "last_modified": None, "fetched_at": time.time(),
+})
+"""
+
+_IMPORTTIME = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+
+def _env(scratch: str) -> Dict[str, str]:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(REPO_ROOT), env.get("PYTHONPATH")]))
+    env["VEIL_LOG_DIR"] = os.path.join(scratch, "logs")
+    env["XDG_CACHE_HOME"] = os.path.join(scratch, "cache")
+    return env
+
+
+def _seed_version_cache(env: Dict[str, str]) -> None:
+    subprocess.run([sys.executable, "-c", _SEED_VERSION_CACHE], cwd=REPO_ROOT, env=env, check=True)
+
+
+def measure_wall(argv: List[str], runs: int, env: Dict[str, str]) -> Dict[str, Any]:
+    times = []
+    returncode = 0
+    for _ in range(runs):
+        start = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, *argv],
+            cwd=REPO_ROOT,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        times.append((time.perf_counter() - start) * 1000)
+        returncode = returncode or proc.returncode
+    return {
+        "median_ms": round(statistics.median(times), 2),
+        "min_ms": round(min(times), 2),
+        "returncode": returncode,
+    }
+
+
+def measure_imports(argv: List[str], top: int, env: Dict[str, str]) -> Dict[str, Any]:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", *argv],
+        cwd=REPO_ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    roots = []
+    for line in proc.stderr.splitlines():
+        match = _IMPORTTIME.match(line)
+        if not match:
+            continue
+        cumulative, indent, module = int(match.group(2)), len(match.group(3)), match.group(4)
+        # Top-level imports are the least indented entries.
+        if indent <= 1:
+            roots.append((cumulative, module))
+    roots.sort(reverse=True)
+    return {
+        "import_ms": round(sum(c for c, _ in roots) / 1000, 2),
+        "slowest": [{"module": m, "ms": round(c / 1000, 2)} for c, m in roots[:top]],
+    }
+
+
+def run(commands, runs: int, top: int) -> Dict[str, Dict[str, Any]]:
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="veil-bench-") as scratch:
+        env = _env(scratch)
+        _seed_version_cache(env)
+        for label, argv in commands:
+            # Untimed warm-up: fills caches a real host would already have.
+            measure_wall(argv, 1, env)
+            result = measure_wall(argv, runs, env)
+            result.update(measure_imports(argv, top, env))
+            results[label] = result
+    return results
+
+
+def render(results: Dict[str, Dict[str, Any]]) -> str:
+    width = max(len(label) for label in results)
+    lines = [f"{'command'.ljust(width)}  median_ms  min_ms  import_ms  slowest imports"]
+    for label, r in results.items():
+        slowest = ", ".join(f"{s['module']} {s['ms']}" for s in r["slowest"])
+        status = "" if r["returncode"] == 0 else f"  [exit {r['returncode']}]"
+        lines.append(
+            f"{label.ljust(width)}  {r['median_ms']:>9}  {r['min_ms']:>6}  {r['import_ms']:>9}  {slowest}{status}"
+        )
+    return "\n".join(lines)
+
+
+def check(results, budget_ms, baseline, tolerance) -> List[str]:
+    problems = []
+    for label, r in results.items():
+        if r["returncode"] != 0:
+            problems.append(f"{label}: exited with {r['returncode']}")
+        if budget_ms is not None and r["median_ms"] > budget_ms:
+            problems.append(f"{label}: {r['median_ms']} ms exceeds budget {budget_ms} ms")
+        base = (baseline or {}).get(label)
+        if base and r["median_ms"] > base["median_ms"] * (1 + tolerance):
+            problems.append(
+                f"{label}: {r['median_ms']} ms vs baseline {base['median_ms']} ms "
+                f"(+{(r['median_ms'] / base['median_ms'] - 1) * 100:.0f}%)"
+            )
+    return problems
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Cold-start benchmark for the trident and veil CLIs.")
+    parser.add_argument("--runs", type=int, default=10, help="Invocations per command (default: 10).")
+    parser.add_argument("--top", type=int, default=3, help="Slowest imports to show per command.")
+    parser.add_argument("--only", action="append", default=[], metavar="LABEL",
+                        help="Only run commands whose label contains LABEL (repeatable).")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON.")
+    parser.add_argument("--budget-ms", type=float, help="Fail if any median exceeds this.")
+    parser.add_argument("--compare", type=Path, metavar="FILE", help="Baseline JSON from a previous --json run.")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed slowdown against --compare (default: 0.25 = 25%%).")
+    args = parser.parse_args()
+
+    commands = [c for c in COMMANDS if not args.only or any(o in c[0] for o in args.only)]
+    results = run(commands, max(1, args.runs), args.top)
+
+    if args.json:
+        print(json.dumps(results, indent=2, sort_keys=True))
+    else:
+        print(render(results))
+
+    baseline = json.loads(args.compare.read_text(encoding="utf-8")) if args.compare else None
+    problems = check(results, args.budget_ms, baseline, args.tolerance)
+    for problem in problems:
+        print(f"[REGRESSION] {problem}", file=sys.stderr)
+    if problems:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -11,14 +11,20 @@ This script:
     "update"   -> "harden"   (best-effort where it makes sense)
 - Creates .bak backups before modifying any file
 - Skips obvious binary assets
+
+The replacements live in trident.veil.rewrite.DOCS_REFACTOR_RULES and are
+applied in a single pass; pass --rules FILE to load them from YAML instead.
 """
 
 from __future__ import annotations
 
+import argparse
 import os
 from pathlib import Path
 from typing import Iterable
 
+from trident.veil.rewrite import DOCS_REFACTOR_RULES, RewriteEngine, load_rules
+
 
 PROJECT_ROOT = Path(__file__).resolve().parent
 DOCS_ROOT = PROJECT_ROOT / "docs"
@@ -28,6 +34,8 @@ SKIP_SUFFIXES = {
     ".svg", ".ttf", ".woff", ".woff2", ".pdf",
 }
 
+ENGINE = RewriteEngine(DOCS_REFACTOR_RULES)
+
 
 def is_text_file(path: Path) -> bool:
     if path.suffix.lower() in SKIP_SUFFIXES:
@@ -58,35 +66,10 @@ def backup_once(path: Path):
 
 def rewrite_content(text: str) -> str:
     """
-    Apply ordered replacements to avoid collisions.
-    Adjust/extend these as needed.
+    Apply the ordered replacements in one scan of the text.
+    Earlier rules win where several match at the same position.
     """
-    # Whole-word / capitalized forms first
-    replacements = [
-        ("Veil Updater", "Veil Sentinel Hardener"),
-        ("Updater Module", "Hardener Module"),
-        ("updater module", "hardener module"),
-
-        ("Updater", "Hardener"),
-        ("updater", "hardener"),
-
-        # Action verbs – this is a bit heuristic
-        ("run the updater", "run the hardener"),
-        ("Run the updater", "Run the hardener"),
-        ("update pass", "hardening pass"),
-        ("update pipeline", "hardening pipeline"),
-        ("Update pipeline", "Hardening pipeline"),
-
-        # Generic verb-ish swaps (careful: very broad)
-        ("update run", "hardener run"),
-        ("update", "harden"),
-        ("Update", "Harden"),
-    ]
-
-    new = text
-    for old, new_val in replacements:
-        new = new.replace(old, new_val)
-    return new
+    return ENGINE.rewrite(text)
 
 
 def process_file(path: Path):
@@ -113,6 +96,19 @@ def maybe_rename_updater_md():
 
 
 def main():
+    global ENGINE
+
+    parser = argparse.ArgumentParser(description="Docs refactor: Updater → Hardener")
+    parser.add_argument(
+        "--rules",
+        type=Path,
+        metavar="FILE",
+        help="Load the ordered replacement rules from a YAML file.",
+    )
+    args = parser.parse_args()
+    if args.rules is not None:
+        ENGINE = RewriteEngine(load_rules(args.rules))
+
     if not DOCS_ROOT.exists():
         print(f"[ERROR] docs directory not found at {DOCS_ROOT}")
         return
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+from trident.veil import hardener
+from trident.veil import logging as veil_logging
+from trident.veil.log_writer import close_logs
+
+TEMPLATE_BODY = "print('hardened')\n"
+
+
+@pytest.fixture(autouse=True)
+def isolated_state(tmp_path, monkeypatch):
+    """Keep caches and veil logs out of the checkout and the home directory."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    monkeypatch.setenv(veil_logging.LOG_DIR_ENV, str(tmp_path / "veil-logs"))
+    monkeypatch.setattr(veil_logging, "_LOG_FILE", None)
+    yield
+    close_logs()
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch) -> Path:
+    """
+    A throwaway project root with app/, infra/ and docs/, bound as the
+    hardener's target, and a single template rendered to app/main.py.
+    """
+    root = tmp_path / "project"
+    for name in ("app", "infra", "docs"):
+        (root / name).mkdir(parents=True)
+    templates = tmp_path / "templates"
+    templates.mkdir()
+    (templates / "main.py").write_text(TEMPLATE_BODY, encoding="utf-8")
+
+    for name in (
+        "PROJECT_ROOT", "LOG_PATH", "MANIFEST_PATH", "JOURNAL_DIR",
+        "OBJECT_DIR", "DRIFT_PATH", "CANONICAL_ZONES",
+    ):
+        monkeypatch.setattr(hardener, name, getattr(hardener, name))
+    hardener.bind_target(root)
+    monkeypatch.setattr(hardener, "TEMPLATE_ROOT", templates)
+    monkeypatch.setattr(hardener, "FILES_FROM_TEMPLATES", [("app/main.py", "main.py")])
+    monkeypatch.setattr(hardener, "_rendered", {})
+    monkeypatch.setattr(hardener, "RUN_STATS", {"changed": 0, "skipped": 0, "drifted": 0})
+    monkeypatch.setattr(hardener, "ECHO", False)
+    monkeypatch.setattr(hardener, "DIFF_MODE", "none")
+    return root
+
+
+def log_lines(root: Path) -> list:
+    hardener.flush_logs()
+    path = root / "logs" / "hardener.log"
+    return path.read_text(encoding="utf-8").splitlines() if path.exists() else []
+
+
+class IndexStandIn:
+    """
+    A local package index: the JSON API under /pypi, a PEP 503 simple
+    index under /simple and the files themselves under /files.
+    """
+
+    def __init__(self):
+        self.latest = "1.0.0"
+        self.etag = '"v1"'
+        self.files = {}      # version -> {filename: bytes}
+        self.digests = {}    # filename -> published sha256 (default: real)
+        self.requests = []   # (path, headers)
+        self.server = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def add_file(self, version: str, name: str, data: bytes):
+        self.files.setdefault(version, {})[name] = data
+
+    def _json(self, version=None) -> dict:
+        urls = []
+        for name, data in self.files.get(version, {}).items():
+            digest = self.digests.get(name, hashlib.sha256(data).hexdigest())
+            urls.append({"filename": name, "digests": {"sha256": digest}})
+        return {"info": {"version": version or self.latest}, "urls": urls}
+
+    def handle(self, handler):
+        path = handler.path.split("?", 1)[0]
+        self.requests.append((path, dict(handler.headers)))
+        parts = [p for p in path.split("/") if p]
+        body, ctype, headers = None, "application/json", {}
+        if parts[:1] == ["pypi"] and parts[-1:] == ["json"]:
+            if len(parts) == 3:
+                if handler.headers.get("If-None-Match") == self.etag:
+                    handler.send_response(304)
+                    handler.end_headers()
+                    return
+                body, headers = json.dumps(self._json()), {"ETag": self.etag}
+            elif len(parts) == 4 and parts[2] in self.files:
+                body = json.dumps(self._json(parts[2]))
+        elif parts[:1] == ["simple"] and len(parts) == 2:
+            links = "".join(
+                f'<a href="/files/{name}#sha256={hashlib.sha256(data).hexdigest()}">{name}</a>\n'
+                for files in self.files.values() for name, data in files.items()
+            )
+            body, ctype = f"<html><body>\n{links}</body></html>", "text/html"
+        elif parts[:1] == ["files"] and len(parts) == 2:
+            for files in self.files.values():
+                if parts[1] in files:
+                    data = files[parts[1]]
+                    handler.send_response(200)
+                    handler.send_header("Content-Type", "application/octet-stream")
+                    handler.send_header("Content-Length", str(len(data)))
+                    handler.end_headers()
+                    handler.wfile.write(data)
+                    return
+        if body is None:
+            handler.send_error(404)
+            return
+        data = body.encode("utf-8")
+        handler.send_response(200)
+        handler.send_header("Content-Type", ctype)
+        handler.send_header("Content-Length", str(len(data)))
+        for key, value in headers.items():
+            handler.send_header(key, value)
+        handler.end_headers()
+        handler.wfile.write(data)
+
+
+@pytest.fixture
+def index(monkeypatch):
+    """Serve an IndexStandIn and point TRIDENT_INDEX_URL at it."""
+    stand_in = IndexStandIn()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            stand_in.handle(self)
+
+        def log_message(self, format, *args):
+            pass
+
+    stand_in.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=stand_in.server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setenv("TRIDENT_INDEX_URL", f"{stand_in.url}/pypi")
+    monkeypatch.setenv("NO_PROXY", "127.0.0.1")
+    monkeypatch.setenv("no_proxy", "127.0.0.1")
+    yield stand_in
+    stand_in.server.shutdown()
+    stand_in.server.server_close()
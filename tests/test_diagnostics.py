@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from trident.veil import diagnostics
+
+SUITE = "test"
+
+
+@pytest.fixture
+def checks():
+    """Register checks in a private suite; returns the per-check call counts."""
+    calls = {"cached": 0, "uncached": 0}
+    key = {"value": "v1"}
+    release = threading.Event()
+
+    def cached():
+        calls["cached"] += 1
+        return {"ok": True, "value": calls["cached"]}
+
+    def uncached():
+        calls["uncached"] += 1
+        return {"ok": True}
+
+    diagnostics.register_check("t_cached", cached, ttl=3600, key=lambda: key["value"], suite=SUITE)
+    diagnostics.register_check("t_uncached", uncached, suite=SUITE)
+    diagnostics.register_check("t_hung", lambda: release.wait(10) and {"ok": True}, timeout=0.2, suite="hung")
+    yield calls, key
+    release.set()
+    for name in ("t_cached", "t_uncached", "t_hung"):
+        diagnostics.unregister_check(name)
+
+
+def _by_name(result):
+    return {c["name"]: c for c in result["checks"]}
+
+
+def test_ttl_reuses_cached_results(checks):
+    calls, _ = checks
+    first = _by_name(diagnostics.run_diagnostics(suites=[SUITE]))
+    second = _by_name(diagnostics.run_diagnostics(suites=[SUITE]))
+
+    assert calls == {"cached": 1, "uncached": 2}
+    assert not first["t_cached"].get("cached")
+    assert second["t_cached"]["cached"] is True
+    assert second["t_cached"]["value"] == 1
+    assert not second["t_uncached"].get("cached")
+
+
+def test_key_change_and_fresh_rerun(checks):
+    calls, key = checks
+    diagnostics.run_diagnostics(suites=[SUITE])
+
+    key["value"] = "v2"
+    diagnostics.run_diagnostics(suites=[SUITE])
+    assert calls["cached"] == 2
+
+    diagnostics.run_diagnostics(suites=[SUITE], fresh=True)
+    assert calls["cached"] == 3
+
+
+def test_max_age_serves_the_whole_report(checks):
+    calls, _ = checks
+    diagnostics.run_diagnostics(suites=[SUITE])
+    report = diagnostics.run_diagnostics(suites=[SUITE], max_age=60)
+
+    assert report["cached"] is True
+    assert calls == {"cached": 1, "uncached": 1}
+
+    # A zero max_age also caps per-check reuse.
+    diagnostics.run_diagnostics(suites=[SUITE], max_age=0)
+    assert calls == {"cached": 2, "uncached": 2}
+
+
+def test_hung_check_times_out_without_blocking(checks):
+    result = diagnostics.run_diagnostics(suites=["hung"])
+    hung = _by_name(result)["t_hung"]
+
+    assert hung["timed_out"] is True
+    assert result["overall_ok"] is False
+    assert result["duration_ms"] < 5000
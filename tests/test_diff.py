@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import difflib
+import random
+
+import pytest
+
+from trident.veil import hardener
+
+
+def _apply(opcodes, a, b):
+    out = []
+    for tag, i1, i2, j1, j2 in opcodes:
+        out.extend(a[i1:i2] if tag == "equal" else b[j1:j2])
+    return out
+
+
+def _edits(opcodes):
+    return sum(max(i2 - i1, 0) + max(j2 - j1, 0) for tag, i1, i2, j1, j2 in opcodes if tag != "equal")
+
+
+def test_opcodes_rebuild_the_new_side_with_a_minimal_script():
+    rng = random.Random(7)
+    for _ in range(300):
+        a = [rng.choice("abcde") for _ in range(rng.randint(0, 30))]
+        b = [rng.choice("abcde") for _ in range(rng.randint(0, 30))]
+        opcodes = hardener.diff_opcodes(a, b)
+
+        assert _apply(opcodes, a, b) == b
+        # Opcodes tile both sides without gaps.
+        assert sum(i2 - i1 for _, i1, i2, _, _ in opcodes) == len(a)
+        assert sum(j2 - j1 for _, _, _, j1, j2 in opcodes) == len(b)
+        # Myers finds the shortest edit script; difflib never beats it.
+        reference = difflib.SequenceMatcher(None, a, b, autojunk=False).get_opcodes()
+        assert _edits(opcodes) <= _edits(reference)
+
+
+def test_limits_return_none():
+    a = [str(i) for i in range(100)]
+    b = [str(-i) for i in range(100)]
+    assert hardener.diff_opcodes(a, b, max_edits=10) is None
+    assert hardener.diff_opcodes(a, b, max_lines=50) is None
+
+
+@pytest.mark.parametrize("old,new", [
+    ("one\ntwo\nthree\n", "banner\n\none\ntwo\nthree\n"),
+    ("a\nb\nc\nd\ne\nf\ng\nh\ni\nj\n", "a\nb\nC\nd\ne\nf\ng\nh\nI\nj\n"),
+    ("keep\nUpdater\nkeep\n", "keep\nHardener\nkeep\n"),
+])
+def test_full_diff_matches_unified_diff(old, new, tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(hardener, "ECHO", True)
+    path = tmp_path / "doc.md"
+
+    hardener.show_diff(old, new, path, mode="full")
+
+    expected = difflib.unified_diff(old.splitlines(), new.splitlines(), str(path), str(path), lineterm="")
+    assert capsys.readouterr().out.splitlines() == list(expected)
+
+
+def test_stat_mode_counts_lines(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(hardener, "ECHO", True)
+    hardener.show_diff("a\nb\n", "a\nB\nc\n", tmp_path / "x", mode="stat")
+    assert capsys.readouterr().out.strip().endswith("| +2 -1")
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import random
+from pathlib import Path
+
+import pytest
+
+from trident.veil import hardener
+from trident.veil.rewrite import DOCS_REFACTOR_RULES, RewriteEngine, RewriteRule
+
+
+def _chunked(text, rng):
+    cuts = sorted(rng.sample(range(len(text) + 1), min(len(text) + 1, rng.randint(0, 8))))
+    return [text[a:b] for a, b in zip([0] + cuts, cuts + [len(text)])]
+
+
+def test_rewrite_chunks_matches_rewrite_across_boundaries():
+    rng = random.Random(11)
+    engine = RewriteEngine(DOCS_REFACTOR_RULES + [RewriteRule("up", "UP", word=True)])
+    words = ["update", "Updater", "Veil Updater", "run the updater", "up", "upx", " ", "\n", "é"]
+    for _ in range(1000):
+        text = "".join(rng.choice(words) for _ in range(rng.randint(0, 50)))
+        assert "".join(engine.rewrite_chunks(_chunked(text, rng))) == engine.rewrite(text)
+
+
+def test_banner_chunks_match_add_banner():
+    rng = random.Random(5)
+    for text in ["", "short", hardener.HARDENED_BANNER + "body", "x" * 500]:
+        for _ in range(20):
+            out = "".join(hardener.add_banner_chunks(_chunked(text, rng)))
+            assert out == hardener.add_banner(text)
+
+
+@pytest.fixture
+def no_full_reads(monkeypatch):
+    """Fail if a docs file is read into memory in one piece."""
+    read_text = Path.read_text
+
+    def guarded(self, *args, **kwargs):
+        if self.suffix == ".md":
+            raise AssertionError(f"{self} was read in full")
+        return read_text(self, *args, **kwargs)
+
+    monkeypatch.setattr(Path, "read_text", guarded)
+
+
+def test_large_markdown_is_streamed_through_the_whole_chain(project, monkeypatch, no_full_reads):
+    monkeypatch.setattr(hardener, "DOCS_INLINE_LIMIT", 1024)
+    monkeypatch.setattr(hardener, "HASH_CHUNK_SIZE", 100)  # many chunk boundaries
+    big = project / "docs" / "big.md"
+    body = "The Updater runs.\r\n" * 500
+    big.write_bytes(body.encode("utf-8"))
+    big.chmod(0o640)
+
+    with hardener.WriteTransaction() as txn:
+        hardener.harden_docs(project / "docs", txn=txn)
+
+    expected = hardener.HARDENED_BANNER + body.replace("Updater", "Hardener")
+    assert big.read_bytes() == expected.encode("utf-8")
+    assert big.stat().st_mode & 0o777 == 0o640
+    assert not list((project / "docs").glob(".*veil-tmp"))
+
+    # A second pass finds nothing to do, and the run can be rolled back.
+    before = hardener.RUN_STATS["changed"]
+    hardener.harden_docs(project / "docs", dry_run=True)
+    assert hardener.RUN_STATS["changed"] == before
+    hardener.rollback_all()
+    assert big.read_bytes() == body.encode("utf-8")
+
+
+def test_large_text_file_gets_banner_only(project, monkeypatch, no_full_reads):
+    monkeypatch.setattr(hardener, "DOCS_INLINE_LIMIT", 1024)
+    notes = project / "docs" / "notes.txt"
+    notes.write_text("Updater\n" * 500, encoding="utf-8")
+
+    hardener.harden_docs(project / "docs")
+
+    # The language rule only applies to Markdown.
+    assert notes.read_text(encoding="utf-8") == hardener.HARDENED_BANNER + "Updater\n" * 500
+
+
+def test_large_file_with_non_streaming_plugin_is_read_inline(project, monkeypatch):
+    monkeypatch.setattr(hardener, "DOCS_INLINE_LIMIT", 1024)
+    plugin = hardener.DocsTransform("upper", str.upper, "v1", suffixes={".md"})
+    big = project / "docs" / "big.md"
+    big.write_text("the updater\n" * 200, encoding="utf-8")
+
+    hardener.harden_docs(project / "docs", transforms=hardener.docs_transforms() + [plugin])
+
+    assert big.read_text(encoding="utf-8") == (hardener.HARDENED_BANNER + "the updater\n" * 200).upper()
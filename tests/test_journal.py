@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import json
+import stat
+
+import pytest
+
+from trident.veil import hardener
+
+
+def _mode(path):
+    return stat.S_IMODE(path.stat().st_mode)
+
+
+@pytest.mark.parametrize("mode", [0o600, 0o755])
+def test_atomic_write_keeps_mode(tmp_path, mode):
+    path = tmp_path / "file.txt"
+    path.write_text("old", encoding="utf-8")
+    path.chmod(mode)
+
+    hardener.atomic_write_text(path, "new")
+
+    assert path.read_text(encoding="utf-8") == "new"
+    assert _mode(path) == mode
+    assert not list(tmp_path.glob("*.veil-tmp"))
+
+
+def test_atomic_prepend_keeps_mode_and_body(tmp_path):
+    path = tmp_path / "big.md"
+    path.write_bytes(b"body\n" * 1000)
+    path.chmod(0o640)
+
+    hardener.atomic_prepend(path, b"banner\n")
+
+    assert path.read_bytes() == b"banner\n" + b"body\n" * 1000
+    assert _mode(path) == 0o640
+
+
+def test_transaction_journals_writes_and_commits(project):
+    target = project / "docs" / "a.md"
+    target.write_text("before", encoding="utf-8")
+
+    with hardener.WriteTransaction(run_id="run1") as txn:
+        txn.write_text(target, "after")
+
+    entries = [json.loads(line) for line in txn.journal_path.read_text(encoding="utf-8").splitlines()]
+    assert [e["op"] for e in entries] == ["begin", "write", "commit"]
+    assert entries[1]["path"] == str(target)
+
+
+def test_interrupted_run_is_rolled_back(project):
+    target = project / "docs" / "a.md"
+    target.write_text("before", encoding="utf-8")
+
+    with pytest.raises(RuntimeError):
+        with hardener.WriteTransaction(run_id="killed") as txn:
+            txn.write_text(target, "half done")
+            raise RuntimeError("killed mid-run")
+
+    assert target.read_text(encoding="utf-8") == "half done"
+    hardener.recover_interrupted_runs()
+    assert target.read_text(encoding="utf-8") == "before"
+
+    # Recovery is recorded; a second pass leaves the file alone.
+    target.write_text("edited later", encoding="utf-8")
+    hardener.recover_interrupted_runs()
+    assert target.read_text(encoding="utf-8") == "edited later"
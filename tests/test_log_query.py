@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import json
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+from trident.veil import log_writer
+from trident.veil.log_query import LogFilter, parse_since, query_logs
+from trident.veil.log_writer import BufferedLogWriter, list_segments
+
+BASE = 1_700_000_000.0
+
+
+def _iso(seconds):
+    return datetime.fromtimestamp(seconds, timezone.utc).isoformat()
+
+
+@pytest.fixture
+def rotated_log(tmp_path, monkeypatch):
+    """A log of 2000 JSON records, one second apart, over many gzip segments."""
+    monkeypatch.setattr(log_writer, "INDEX_INTERVAL", 1024)
+    path = tmp_path / "veil.log"
+    writer = BufferedLogWriter(path, sync=True, max_bytes=16 * 1024, keep=1000)
+    for i in range(2000):
+        ts = _iso(BASE + i)
+        level = "ERROR" if i % 100 == 0 else "INFO"
+        writer.write(json.dumps({"timestamp": ts, "level": level, "message": f"record {i}"}) + "\n", ts)
+    writer.close()
+    # Segments rotated while the compressor was busy wait for the next pass.
+    log_writer._compress_and_prune(path, 1000)
+    return path
+
+
+def _numbers(lines):
+    return [int(json.loads(line)["message"].split()[1]) for line in lines]
+
+
+def test_rotated_segments_are_compressed_and_indexed(rotated_log):
+    segments = list_segments(rotated_log)
+    assert segments[-1] == rotated_log
+    assert all(s.suffix == ".gz" for s in segments[:-1])
+    assert all(log_writer.read_index(s) for s in segments[:-1])
+
+
+def test_query_reads_everything_in_order(rotated_log):
+    assert _numbers(query_logs(rotated_log, LogFilter())) == list(range(2000))
+
+
+def test_since_seeks_past_older_records(rotated_log):
+    lines = list(query_logs(rotated_log, LogFilter(since=BASE + 1500)))
+    assert _numbers(lines) == list(range(1500, 2000))
+
+
+def test_level_and_message_filters(rotated_log):
+    errors = list(query_logs(rotated_log, LogFilter(level="ERROR")))
+    assert _numbers(errors) == list(range(0, 2000, 100))
+    matched = list(query_logs(rotated_log, LogFilter(message=r"record 19\d\d$")))
+    assert _numbers(matched) == list(range(1900, 2000))
+
+
+def test_keep_prunes_old_segments(tmp_path):
+    path = tmp_path / "veil.log"
+    writer = BufferedLogWriter(path, sync=True, max_bytes=1024, keep=2)
+    for i in range(500):
+        writer.write(f"line {i:04d} " + "x" * 40 + "\n")
+    writer.close()
+    # Segments rotated while the compressor was busy wait for the next pass.
+    log_writer._compress_and_prune(path, 2)
+    assert len(list_segments(path)) == 3
+
+
+def test_parse_since():
+    assert abs(parse_since("90s") - (time.time() - 90)) < 5
+    assert parse_since("2023-11-14T22:13:20Z") == BASE
+    with pytest.raises(ValueError):
+        parse_since("yesterday")
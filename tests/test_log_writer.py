@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from trident.veil.log_writer import BufferedLogWriter, list_segments, read_index
+from trident.veil.log_query import LogFilter, query_logs
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+WRITER_SCRIPT = """
+import json, sys
+from datetime import datetime, timezone
+from pathlib import Path
+from trident.veil.log_writer import BufferedLogWriter
+
+path, tag, count = Path(sys.argv[1]), sys.argv[2], int(sys.argv[3])
+writer = BufferedLogWriter(path, flush_bytes=512, max_bytes=4096, keep=1000)
+for i in range(count):
+    ts = datetime.now(timezone.utc).isoformat()
+    writer.write(json.dumps({"timestamp": ts, "writer": tag, "i": i}) + "\\n", ts)
+writer.close()
+"""
+
+
+def _records(path):
+    return [json.loads(line) for line in query_logs(path, LogFilter())]
+
+
+def test_buffered_records_reach_the_file_on_flush(tmp_path):
+    path = tmp_path / "veil.log"
+    writer = BufferedLogWriter(path, flush_interval=60)
+    writer.write("one\n")
+    writer.write("two\n")
+    writer.flush()
+    assert path.read_text(encoding="utf-8") == "one\ntwo\n"
+    writer.close()
+
+
+def test_sync_mode_writes_before_returning(tmp_path):
+    path = tmp_path / "veil.log"
+    writer = BufferedLogWriter(path, sync=True)
+    writer.write("now\n")
+    assert path.read_text(encoding="utf-8") == "now\n"
+    writer.close()
+
+
+def test_rotation_with_two_writer_processes(tmp_path):
+    path = tmp_path / "veil.log"
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [str(REPO_ROOT), os.environ.get("PYTHONPATH")])))
+    procs = [
+        subprocess.Popen([sys.executable, "-c", WRITER_SCRIPT, str(path), tag, "1500"], env=env)
+        for tag in ("a", "b")
+    ]
+    assert [p.wait(timeout=120) for p in procs] == [0, 0]
+
+    segments = list_segments(path)
+    assert len(segments) > 2, "expected the writers to rotate"
+    assert not list(tmp_path.glob("*.tmp"))
+
+    # Every record arrives exactly once and whole.
+    records = _records(path)
+    for tag in ("a", "b"):
+        assert sorted(r["i"] for r in records if r["writer"] == tag) == list(range(1500))
+
+    # Index offsets of the plain active file point at record starts.
+    data = path.read_bytes()
+    for _, offset in read_index(path):
+        assert offset == 0 or data[offset - 1:offset] == b"\n"
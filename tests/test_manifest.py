@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from trident.veil import hardener
+from trident.veil.rewrite import RewriteRule
+
+from conftest import log_lines
+
+
+def _run(**kwargs):
+    for key in hardener.RUN_STATS:
+        hardener.RUN_STATS[key] = 0
+    hardener.harden_project(incremental=True, **kwargs)
+    return dict(hardener.RUN_STATS)
+
+
+def test_incremental_run_skips_unchanged_files(project):
+    (project / "docs" / "guide.md").write_text("The Updater.\n", encoding="utf-8")
+
+    first = _run()
+    assert first["changed"] > 0
+    assert hardener.MANIFEST_PATH.exists()
+
+    second = _run()
+    assert second["changed"] == 0
+    assert second["skipped"] >= 2  # template output and the docs file
+
+
+def test_incremental_run_redoes_files_edited_since(project):
+    guide = project / "docs" / "guide.md"
+    guide.write_text("The Updater.\n", encoding="utf-8")
+    _run()
+
+    guide.write_text("Back to the Updater.\n", encoding="utf-8")
+    stats = _run()
+
+    assert stats["changed"] == 1
+    assert guide.read_text(encoding="utf-8").endswith("Back to the Hardener.\n")
+
+
+def test_rule_change_invalidates_manifest_entries(project, monkeypatch):
+    guide = project / "docs" / "guide.md"
+    guide.write_text("The Updater.\n", encoding="utf-8")
+    _run()
+
+    monkeypatch.setattr(hardener, "LANGUAGE_ENGINE", hardener.LANGUAGE_ENGINE)
+    monkeypatch.setattr(hardener, "LANGUAGE_SOURCE", hardener.LANGUAGE_SOURCE)
+    hardener.set_language_rules([RewriteRule("Hardener", "Sentinel")])
+    _run()
+
+    assert guide.read_text(encoding="utf-8").endswith("The Sentinel.\n")
+    assert any("[WRITE] Hardened" in line and "guide.md" in line for line in log_lines(project))
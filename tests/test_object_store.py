@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import gzip
+import stat
+
+import pytest
+
+from trident.veil import hardener
+
+from conftest import TEMPLATE_BODY
+
+
+def _mode(path):
+    return stat.S_IMODE(path.stat().st_mode)
+
+
+def test_identical_content_is_stored_once(project):
+    a = project / "docs" / "a.md"
+    b = project / "docs" / "b.md"
+    a.write_text("same", encoding="utf-8")
+    b.write_text("same", encoding="utf-8")
+
+    digest = hardener.store_backup(a)
+    assert hardener.store_backup(b) == digest
+    assert digest == hardener.file_hash(a)
+    assert [p for p in hardener.OBJECT_DIR.rglob("*") if p.is_file()] == [hardener._object_path(digest)]
+
+
+def test_in_place_write_does_not_touch_the_backup(project):
+    path = project / "docs" / "a.md"
+    path.write_text("original", encoding="utf-8")
+    digest = hardener.store_backup(path)
+
+    with path.open("r+", encoding="utf-8") as f:
+        f.write("edited!!")
+
+    obj = hardener._object_path(digest)
+    assert obj.stat().st_ino != path.stat().st_ino
+    assert obj.read_text(encoding="utf-8") == "original"
+
+
+def test_missing_file_has_no_backup(project):
+    assert hardener.store_backup(project / "docs" / "nope.md") is None
+
+
+def test_restore_from_gzip_object(project):
+    path = project / "docs" / "a.md"
+    path.write_text("original", encoding="utf-8")
+    digest = hardener.file_hash(path)
+    obj = hardener._object_path(digest)
+    obj.parent.mkdir(parents=True)
+    with gzip.open(obj.with_name(obj.name + ".gz"), "wb") as f:
+        f.write(b"original")
+
+    path.write_text("changed", encoding="utf-8")
+    hardener.restore_backup(digest, path)
+
+    assert path.read_text(encoding="utf-8") == "original"
+
+
+def test_corrupt_object_is_not_restored(project):
+    path = project / "docs" / "a.md"
+    path.write_text("original", encoding="utf-8")
+    digest = hardener.store_backup(path)
+    hardener.atomic_write_text(path, "changed")
+    hardener._object_path(digest).write_text("bit rot", encoding="utf-8")
+
+    with pytest.raises(ValueError):
+        hardener.restore_backup(digest, path)
+    assert path.read_text(encoding="utf-8") == "changed"
+
+
+def test_harden_then_rollback_restores_content_and_mode(project):
+    guide = project / "docs" / "guide.md"
+    guide.write_text("Run the Updater.\n", encoding="utf-8")
+    guide.chmod(0o640)
+    script = project / "app" / "main.py"
+    script.write_text("print('local')\n", encoding="utf-8")
+    script.chmod(0o700)
+
+    hardener.harden_project()
+    assert guide.read_text(encoding="utf-8").startswith(hardener.HARDENED_BANNER)
+    assert script.read_text(encoding="utf-8") == hardener.HARDENED_BANNER + TEMPLATE_BODY
+    assert _mode(guide) == 0o640
+    assert _mode(script) == 0o700
+
+    # Restored files must not pick up the umask's mode.
+    guide.chmod(0o644)
+    script.chmod(0o644)
+    hardener.rollback_all()
+
+    assert guide.read_text(encoding="utf-8") == "Run the Updater.\n"
+    assert script.read_text(encoding="utf-8") == "print('local')\n"
+    assert _mode(guide) == 0o640
+    assert _mode(script) == 0o700
+    # __init__.py files the run created are removed again.
+    assert not (project / "app" / "__init__.py").exists()
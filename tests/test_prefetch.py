@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import io
+import zipfile
+
+import pytest
+
+from trident.veil import self_update, wheel_cache
+
+VERSION = "9.9.9"
+WHEEL = f"trident_cli-{VERSION}-py3-none-any.whl"
+
+
+def _wheel() -> bytes:
+    dist_info = f"trident_cli-{VERSION}.dist-info"
+    files = {
+        f"{dist_info}/METADATA": f"Metadata-Version: 2.1\nName: trident-cli\nVersion: {VERSION}\n",
+        f"{dist_info}/WHEEL": "Wheel-Version: 1.0\nGenerator: tests\nRoot-Is-Purelib: true\nTag: py3-none-any\n",
+    }
+    files[f"{dist_info}/RECORD"] = "".join(f"{name},,\n" for name in files) + f"{dist_info}/RECORD,,\n"
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as zf:
+        for name, text in files.items():
+            zf.writestr(zipfile.ZipInfo(name, date_time=(1980, 1, 1, 0, 0, 0)), text)
+    return buf.getvalue()
+
+
+WHEEL_BYTES = _wheel()
+
+
+@pytest.fixture
+def release(index, monkeypatch):
+    monkeypatch.setenv("PIP_DISABLE_PIP_VERSION_CHECK", "1")
+    monkeypatch.setenv("PIP_NO_INPUT", "1")
+    index.latest = VERSION
+    index.add_file(VERSION, WHEEL, WHEEL_BYTES)
+    return index
+
+
+def test_simple_index_follows_the_json_api(monkeypatch):
+    monkeypatch.delenv(self_update.SIMPLE_INDEX_URL_ENV, raising=False)
+    monkeypatch.delenv(self_update.INDEX_URL_ENV, raising=False)
+    # Nothing configured: pip's own index settings apply.
+    assert self_update.get_simple_index_url() is None
+    assert self_update._index_args() == []
+
+    monkeypatch.setenv(self_update.INDEX_URL_ENV, "http://mirror.local/pypi/")
+    assert self_update.get_simple_index_url() == "http://mirror.local/simple/"
+
+    monkeypatch.setenv(self_update.SIMPLE_INDEX_URL_ENV, "http://other.local/simple")
+    assert self_update.get_simple_index_url() == "http://other.local/simple/"
+
+
+def test_prefetch_downloads_verifies_and_stores_wheels(release):
+    result = self_update.prefetch_update()
+
+    assert result["ok"] is True, result
+    assert [f["file"] for f in result["files"]] == [WHEEL]
+    target = wheel_cache.verified_set(VERSION)
+    assert target is not None and (target / WHEEL).read_bytes() == WHEEL_BYTES
+    # pip was pointed at the configured index, not its default one.
+    assert any(path.startswith("/simple/") for path, _ in release.requests)
+
+    again = self_update.prefetch_update(VERSION)
+    assert again["already_cached"] is True
+
+
+def test_digest_mismatch_is_not_cached(release):
+    release.digests[WHEEL] = "0" * 64
+
+    result = self_update.prefetch_update(VERSION)
+
+    assert result["ok"] is False
+    assert "sha256 mismatch" in result["files"][0]["error"]
+    assert wheel_cache.verified_set(VERSION) is None
+
+
+def test_tampered_cache_is_not_used(release):
+    self_update.prefetch_update(VERSION)
+    target = wheel_cache.verified_set(VERSION)
+    (target / WHEEL).write_bytes(b"not the wheel")
+
+    assert wheel_cache.verified_set(VERSION) is None
+
+
+def test_apply_installs_from_the_prefetched_set(release, monkeypatch):
+    assert self_update.prefetch_update(VERSION)["ok"] is True
+    commands = []
+    monkeypatch.setattr(self_update.subprocess, "check_call", commands.append)
+
+    result = self_update.run_self_update(apply=True)
+
+    assert result["prefetched"] is True
+    assert "--no-index" in commands[0]
+    assert commands[0][commands[0].index("--find-links") + 1] == str(wheel_cache.verified_set(VERSION))
+
+
+def test_apply_without_prefetch_uses_the_configured_index(release, monkeypatch):
+    commands = []
+    monkeypatch.setattr(self_update.subprocess, "check_call", commands.append)
+
+    result = self_update.run_self_update(apply=True)
+
+    assert result["prefetched"] is False
+    assert commands[0][commands[0].index("--index-url") + 1] == f"{release.url}/simple/"
+
+
+def test_prune_keeps_the_newest_sets(tmp_path):
+    wheel = tmp_path / "x.whl"
+    for version in ("1", "2", "3"):
+        wheel.write_bytes(version.encode())
+        wheel_cache.store_set(version, {wheel: wheel_cache.sha256_file(wheel)})
+
+    removed = wheel_cache.prune(keep=2)
+
+    assert len(removed) == 1
+    assert len(list((wheel_cache.wheel_cache_dir() / "blobs").iterdir())) == 2
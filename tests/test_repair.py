@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from trident.veil import repair
+from trident.veil.repair import RepairStep, plan_repair, register_step, run_repair
+
+
+@pytest.fixture(autouse=True)
+def empty_registry(monkeypatch):
+    monkeypatch.setattr(repair, "_REGISTRY", {})
+
+
+def _ok(dry_run):
+    return {"ok": True}
+
+
+def _actions(plan):
+    return {entry["name"]: entry["action"] for entry in plan["steps"]}
+
+
+def test_steps_are_grouped_into_dependency_waves():
+    steps = [
+        RepairStep("d", _ok, requires=("b", "c")),
+        RepairStep("a", _ok),
+        RepairStep("b", _ok, requires=("a",)),
+        RepairStep("c", _ok, requires=("a",)),
+    ]
+    assert plan_repair(steps)["waves"] == [["a"], ["b", "c"], ["d"]]
+
+
+@pytest.mark.parametrize("steps", [
+    [RepairStep("a", _ok, requires=("b",)), RepairStep("b", _ok, requires=("a",))],
+    [RepairStep("a", _ok, requires=("missing",))],
+])
+def test_cycles_and_unknown_dependencies_are_rejected(steps):
+    with pytest.raises(ValueError):
+        plan_repair(steps)
+
+
+def test_probes_decide_run_skip_and_recheck():
+    steps = [
+        RepairStep("broken", _ok, probe=lambda: True),
+        RepairStep("healthy", _ok, probe=lambda: False),
+        RepairStep("after_broken", _ok, probe=lambda: False, requires=("broken",)),
+        RepairStep("after_healthy", _ok, probe=lambda: False, requires=("healthy",)),
+        RepairStep("no_probe", _ok),
+        RepairStep("probe_fails", _ok, probe=lambda: 1 / 0),
+    ]
+    plan = plan_repair(steps)
+    assert _actions(plan) == {
+        "broken": "run",
+        "healthy": "skip",
+        "after_broken": "recheck",
+        "after_healthy": "skip",
+        "no_probe": "run",
+        "probe_fails": "run",
+    }
+    assert "ZeroDivisionError" in next(e for e in plan["steps"] if e["name"] == "probe_fails")["probe_error"]
+
+
+def test_recheck_probes_again_after_the_dependency_ran():
+    state = {"dir_created": False, "child_ran": False}
+
+    def create_dir(dry_run):
+        state["dir_created"] = True
+        return {"ok": True}
+
+    def fix_child(dry_run):
+        state["child_ran"] = True
+        return {"ok": True}
+
+    register_step("dir", create_dir, probe=lambda: not state["dir_created"])
+    # Nothing to do for the child once the directory exists.
+    register_step("child", fix_child, probe=lambda: False, requires=("dir",))
+
+    result = run_repair()
+
+    assert result["overall_ok"] is True
+    assert state == {"dir_created": True, "child_ran": False}
+    assert result["summary"]["skipped"] == 1
+
+
+def test_failed_dependency_blocks_dependents():
+    ran = []
+    register_step("base", lambda dry_run: {"ok": False, "error": "nope"})
+    register_step("child", lambda dry_run: ran.append("child") or {"ok": True}, requires=("base",))
+
+    result = run_repair()
+    child = next(s for s in result["steps"] if s["name"] == "child")
+
+    assert result["overall_ok"] is False
+    assert child["blocked_by"] == ["base"]
+    assert ran == []
+
+
+def test_independent_steps_run_concurrently():
+    barrier = threading.Barrier(2, timeout=5)
+
+    def meet(dry_run):
+        barrier.wait()
+        return {"ok": True}
+
+    register_step("left", meet)
+    register_step("right", meet)
+
+    assert run_repair()["overall_ok"] is True
+
+
+def test_healthy_host_only_runs_probes():
+    ran = []
+    register_step("a", lambda dry_run: ran.append("a") or {"ok": True}, probe=lambda: False)
+    register_step("b", lambda dry_run: ran.append("b") or {"ok": True}, probe=lambda: False, requires=("a",))
+
+    result = run_repair()
+
+    assert ran == []
+    assert result["summary"]["skipped"] == 2
+
+
+def test_saved_plan_must_match_the_registry():
+    register_step("a", _ok)
+    register_step("b", _ok, requires=("a",))
+    plan = {"waves": [["b"], ["a"]], "steps": [
+        {"name": "b", "action": "run"}, {"name": "a", "action": "run"},
+    ]}
+    with pytest.raises(ValueError):
+        run_repair(plan=plan)
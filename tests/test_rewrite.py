@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import random
+import re
+
+import pytest
+
+from trident.veil.rewrite import (
+    DOCS_REFACTOR_RULES,
+    LANGUAGE_RULES,
+    RewriteEngine,
+    RewriteRule,
+    load_rules,
+)
+
+
+def _sequential(rules, text):
+    """The replace chain the engine stands in for."""
+    for rule in rules:
+        if rule.word:
+            text = re.sub(rf"\b{re.escape(rule.old)}\b", rule.new, text)
+        else:
+            text = text.replace(rule.old, rule.new)
+    return text
+
+
+# Rules whose output never contains another rule's input, so applying them
+# one after another and in a single scan must agree.
+INDEPENDENT_RULES = [
+    RewriteRule("Veil Updater", "Veil Sentinel Hardener"),
+    RewriteRule("Updater", "Hardener"),
+    RewriteRule("updater", "hardener"),
+    RewriteRule("pipeline", "flow"),
+    RewriteRule("up", "UP", word=True),
+]
+
+
+def test_matches_sequential_replace_chain():
+    rng = random.Random(3)
+    words = ["Veil Updater", "Updater", "updater", "pipeline", "up", "upper", " ", "\n", "x"]
+    engine = RewriteEngine(INDEPENDENT_RULES)
+    for _ in range(500):
+        text = "".join(rng.choice(words) for _ in range(rng.randint(0, 40)))
+        assert engine.rewrite(text) == _sequential(INDEPENDENT_RULES, text)
+
+
+def test_language_rules_match_the_old_replace():
+    text = "The Updater and the Veil Updater.\n" * 10
+    assert RewriteEngine(LANGUAGE_RULES).rewrite(text) == text.replace("Updater", "Hardener")
+
+
+def test_earlier_rule_wins_at_the_same_offset():
+    engine = RewriteEngine(DOCS_REFACTOR_RULES)
+    assert engine.rewrite("Veil Updater") == "Veil Sentinel Hardener"
+    assert engine.rewrite("update pipeline") == "hardening pipeline"
+
+
+def test_duplicate_rule_text_uses_the_first_rule():
+    engine = RewriteEngine([RewriteRule("a", "1"), RewriteRule("a", "2"), RewriteRule("b", "3")])
+    assert engine.rewrite("ab") == "13"
+
+
+def test_signature_tracks_the_rule_set():
+    assert RewriteEngine(LANGUAGE_RULES).signature == RewriteEngine(list(LANGUAGE_RULES)).signature
+    assert RewriteEngine(LANGUAGE_RULES).signature != RewriteEngine(DOCS_REFACTOR_RULES).signature
+
+
+def test_load_rules_from_yaml(tmp_path):
+    path = tmp_path / "rules.yaml"
+    path.write_text(
+        'rules:\n  - from: "Updater"\n    to: "Hardener"\n  - from: update\n    to: harden\n    word: true\n',
+        encoding="utf-8",
+    )
+    assert load_rules(path) == [RewriteRule("Updater", "Hardener"), RewriteRule("update", "harden", True)]
+
+    path.write_text("- to: nowhere\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        load_rules(path)
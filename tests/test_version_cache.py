@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from trident.veil import self_update
+from trident.veil.cache import read_cache, write_cache
+
+
+def _lookups(index):
+    return [headers for path, headers in index.requests if path == "/pypi/trident-cli/json"]
+
+
+def _wait_for_refresh():
+    thread = self_update._refresh_thread
+    if thread is not None:
+        thread.join(timeout=10)
+
+
+def test_fresh_cache_answers_without_the_network(index):
+    index.latest = "2.0.0"
+    assert self_update._lookup_latest_version() == ("2.0.0", "index")
+
+    index.latest = "3.0.0"
+    assert self_update._lookup_latest_version() == ("2.0.0", "cache")
+    assert len(_lookups(index)) == 1
+
+
+def test_stale_entry_is_served_and_revalidated_in_the_background(index):
+    self_update._lookup_latest_version()
+    entry = read_cache(self_update.VERSION_CACHE_FILE)
+    write_cache(self_update.VERSION_CACHE_FILE, dict(entry, fetched_at=time.time() - 2 * self_update.VERSION_TTL))
+
+    assert self_update._lookup_latest_version() == ("1.0.0", "stale")
+    _wait_for_refresh()
+
+    revalidation = _lookups(index)[-1]
+    assert revalidation.get("If-None-Match") == index.etag
+    refreshed = read_cache(self_update.VERSION_CACHE_FILE)
+    assert time.time() - refreshed["fetched_at"] < 60
+    assert self_update._lookup_latest_version() == ("1.0.0", "cache")
+
+
+def test_refresh_revalidates_and_picks_up_new_releases(index):
+    self_update._lookup_latest_version()
+
+    # Unchanged: a conditional request answered with 304.
+    assert self_update._lookup_latest_version(refresh=True) == ("1.0.0", "index")
+    assert _lookups(index)[-1].get("If-None-Match") == index.etag
+
+    index.latest, index.etag = "1.1.0", '"v2"'
+    assert self_update._lookup_latest_version(refresh=True) == ("1.1.0", "index")
+
+
+def test_index_change_ignores_the_cached_answer(index, monkeypatch):
+    self_update._lookup_latest_version()
+    monkeypatch.setenv(self_update.INDEX_URL_ENV, f"{index.url}/pypi/")
+    assert self_update._lookup_latest_version()[1] == "cache"
+
+    monkeypatch.setenv(self_update.INDEX_URL_ENV, f"{index.url}/mirror/pypi")
+    assert self_update._lookup_latest_version() == ("unknown", "unavailable")
+
+
+@pytest.mark.parametrize("cached", [True, False])
+def test_unreachable_index(index, cached):
+    if cached:
+        self_update._lookup_latest_version()
+    index.server.shutdown()
+    index.server.server_close()
+
+    expected = ("1.0.0", "stale") if cached else ("unknown", "unavailable")
+    assert self_update._lookup_latest_version(refresh=True) == expected
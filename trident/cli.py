@@ -1,17 +1,37 @@
 from __future__ import annotations
 
+import functools
 import json
 import typer
-from rich.console import Console
-from rich.panel import Panel
-from rich import box
 
-from trident.core.self_update import run_self_update
-from trident.core.config import set_default_channel, get_default_channel
-from trident.core.channel import validate_channel
+# rich and the trident.core modules are imported inside the commands that
+# use them: `trident status --json` runs from health probes, and
+# interpreter start-up dominates each call. See benchmarks/cold_start.py.
 
 app = typer.Typer(add_completion=False)
-console = Console()
+
+
+@functools.lru_cache(maxsize=None)
+def _console():
+    from rich.console import Console
+
+    return Console()
+
+
+def _print_json(result) -> None:
+    typer.echo(json.dumps(result, indent=2))
+
+
+def _print_panel(title: str, style: str) -> None:
+    from rich import box
+    from rich.panel import Panel
+
+    _console().print(Panel.fit(title, style=style, box=box.ROUNDED))
+
+
+def _print_fields(result) -> None:
+    for key, value in result.items():
+        _console().print(f"[cyan]{key}[/cyan]: {value}")
 
 
 # ------------------------------------------------------------
@@ -19,13 +39,14 @@ console = Console()
 # ------------------------------------------------------------
 @app.callback()
 def main(
+    ctx: typer.Context,
     json_output: bool = typer.Option(
         False,
         "--json",
         help="Output results in JSON format."
     )
 ):
-    typer.get_current_context().obj = {"json": json_output}
+    ctx.obj = {"json": json_output}
 
 
 # ------------------------------------------------------------
@@ -33,34 +54,49 @@ def main(
 # ------------------------------------------------------------
 @app.command(name="update")
 def update_dry_run(
+    ctx: typer.Context,
     channel: str = typer.Option(
         None,
         "--channel",
         help="Choose update channel: stable, edge, dev. If omitted, uses default.",
-    )
+    ),
+    all_channels: bool = typer.Option(
+        False,
+        "--all-channels",
+        help="Resolve every channel on every configured registry mirror at once.",
+    ),
 ):
     """
     Check for updates without applying them.
     """
-    ctx = typer.get_current_context()
     as_json = ctx.obj.get("json", False)
 
+    if all_channels:
+        from trident.core.resolver import resolve_all_channels
+
+        result = resolve_all_channels()
+        if as_json:
+            _print_json(result)
+            return
+
+        _print_panel(f"Release Channels (registry: {result.get('selected_registry')})", "bold yellow")
+        for name, entry in result["channels"].items():
+            _console().print(
+                f"[cyan]{name}[/cyan]: {entry.get('digest', 'unresolved')} "
+                f"({entry.get('last_updated')}, from {entry.get('source')})"
+            )
+        return
+
+    from trident.core.self_update import run_self_update
+
     result = run_self_update(apply=False, channel=channel)
 
     if as_json:
-        console.print(json.dumps(result, indent=2))
+        _print_json(result)
         return
 
-    console.print(
-        Panel.fit(
-            f"Update Check (channel: {result.get('channel')})",
-            style="bold yellow",
-            box=box.ROUNDED,
-        )
-    )
-
-    for key, value in result.items():
-        console.print(f"[cyan]{key}[/cyan]: {value}")
+    _print_panel(f"Update Check (channel: {result.get('channel')})", "bold yellow")
+    _print_fields(result)
 
 
 # ------------------------------------------------------------
@@ -68,6 +104,7 @@ def update_dry_run(
 # ------------------------------------------------------------
 @app.command(name="update-apply")
 def update_apply(
+    ctx: typer.Context,
     channel: str = typer.Option(
         None,
         "--channel",
@@ -77,13 +114,14 @@ def update_apply(
     """
     Apply an update using the selected release channel.
     """
-    ctx = typer.get_current_context()
+    from trident.core.self_update import run_self_update
+
     as_json = ctx.obj.get("json", False)
 
     result = run_self_update(apply=True, channel=channel)
 
     if as_json:
-        console.print(json.dumps(result, indent=2))
+        _print_json(result)
         return
 
     title = (
@@ -94,16 +132,8 @@ def update_apply(
 
     panel_style = "bold green" if result.get("applied") else "bold red"
 
-    console.print(
-        Panel.fit(
-            title,
-            style=panel_style,
-            box=box.ROUNDED,
-        )
-    )
-
-    for key, value in result.items():
-        console.print(f"[cyan]{key}[/cyan]: {value}")
+    _print_panel(title, panel_style)
+    _print_fields(result)
 
 
 # ------------------------------------------------------------
@@ -111,6 +141,7 @@ def update_apply(
 # ------------------------------------------------------------
 @app.command(name="promote")
 def promote_version(
+    ctx: typer.Context,
     version: str = typer.Argument(..., help="Version to promote, e.g. 1.1.3"),
     to: str = typer.Option(
         "stable",
@@ -123,7 +154,8 @@ def promote_version(
     """
     import subprocess
 
-    ctx = typer.get_current_context()
+    from trident.core.channel import validate_channel
+
     as_json = ctx.obj.get("json", False)
 
     # Validate channel
@@ -150,7 +182,7 @@ def promote_version(
         result["error"] = str(exc)
 
     if as_json:
-        console.print(json.dumps(result, indent=2))
+        _print_json(result)
         return
 
     title = (
@@ -160,10 +192,8 @@ def promote_version(
     )
     style = "bold green" if result["promoted"] else "bold red"
 
-    console.print(Panel.fit(title, style=style, box=box.ROUNDED))
-
-    for key, value in result.items():
-        console.print(f"[cyan]{key}[/cyan]: {value}")
+    _print_panel(title, style)
+    _print_fields(result)
 
 
 # ------------------------------------------------------------
@@ -171,38 +201,35 @@ def promote_version(
 # ------------------------------------------------------------
 @app.command(name="set-channel")
 def set_channel(
+    ctx: typer.Context,
     channel: str = typer.Argument(..., help="Channel to set as default: stable, edge, dev.")
 ):
     """
     Set the default update channel for this machine.
     """
-    ctx = typer.get_current_context()
+    from trident.core.config import set_default_channel
+
     as_json = ctx.obj.get("json", False)
 
     result = set_default_channel(channel)
 
     if as_json:
-        console.print(json.dumps(result, indent=2))
+        _print_json(result)
         return
 
-    console.print(
-        Panel.fit(
-            f"Default channel set to: {result['channel']}",
-            style="bold green",
-            box=box.ROUNDED,
-        )
-    )
+    _print_panel(f"Default channel set to: {result['channel']}", "bold green")
 
 
 # ------------------------------------------------------------
 # SHOW CURRENT CONFIG
 # ------------------------------------------------------------
 @app.command(name="status")
-def status():
+def status(ctx: typer.Context):
     """
     Show updater status and default channel.
     """
-    ctx = typer.get_current_context()
+    from trident.core.config import get_default_channel
+
     as_json = ctx.obj.get("json", False)
 
     default_channel = get_default_channel()
@@ -212,16 +239,10 @@ def status():
     }
 
     if as_json:
-        console.print(json.dumps(result, indent=2))
+        _print_json(result)
         return
 
-    console.print(
-        Panel.fit(
-            f"Default Channel: {default_channel}",
-            style="bold cyan",
-            box=box.ROUNDED,
-        )
-    )
+    _print_panel(f"Default Channel: {default_channel}", "bold cyan")
 
 
 # ------------------------------------------------------------
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import json
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List
 
 from trident.core.channel import validate_channel
 
@@ -46,6 +46,16 @@ def get_default_channel() -> str:
     return load_config().get("channel", "stable")
 
 
+def get_mirrors() -> List[str]:
+    """
+    Return the configured registry mirrors (the "mirrors" list of base URLs).
+    """
+    mirrors = load_config().get("mirrors", [])
+    if not isinstance(mirrors, list):
+        return []
+    return [m.rstrip("/") for m in mirrors if isinstance(m, str) and m]
+
+
 def set_default_channel(channel: str) -> Dict[str, Any]:
     """
     Update the default channel in the config file.
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import functools
+
+# (connect, read) seconds for every request made through the session.
+DEFAULT_TIMEOUT = (3.05, 5)
+
+# Connections kept alive per host; sized for concurrent channel lookups.
+POOL_SIZE = 16
+
+
+@functools.lru_cache(maxsize=None)
+def get_session():
+    """
+    Return the process-wide requests.Session.
+
+    Connections are pooled and kept alive, so repeated lookups against the
+    same index or registry skip the TCP and TLS handshakes. The session is
+    shared between threads; only use it for simple requests.
+
+    Returns:
+        requests.Session: The shared session.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    from trident.veil.identity import DIST_NAME, get_version
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["User-Agent"] = f"{DIST_NAME}/{get_version()}"
+    return session
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from trident.veil.identity import get_timestamp
+from trident.veil.logging import log
+from trident.core.channel import VALID_CHANNELS, resolve_docker_tag
+from trident.core.config import get_mirrors
+from trident.core.http import DEFAULT_TIMEOUT, get_session
+
+IMAGE_REPOSITORY = "notchofhwend/updater"
+
+# Docker Hub's tag API. Mirrors from the config must serve the same
+# /v2/repositories/<repo>/tags/<tag> endpoint.
+DEFAULT_REGISTRY = "https://hub.docker.com"
+
+
+def _query_tag(registry: str, channel: str) -> Dict[str, Any]:
+    """
+    Look up one channel tag on one registry.
+
+    Returns:
+        Dict[str, Any]: `registry`, `channel`, `ok`, `latency_ms` and either
+        `digest`/`last_updated` or `error`.
+    """
+    tag = resolve_docker_tag(channel)
+    url = f"{registry}/v2/repositories/{IMAGE_REPOSITORY}/tags/{tag}"
+    result: Dict[str, Any] = {"registry": registry, "channel": channel, "ok": False}
+    t0 = time.perf_counter()
+    try:
+        response = get_session().get(url, timeout=DEFAULT_TIMEOUT)
+        response.raise_for_status()
+        data = response.json()
+        digest = data.get("digest")
+        if not digest:
+            # Multi-arch tags only carry per-image digests.
+            images = data.get("images") or [{}]
+            digest = images[0].get("digest")
+        result.update(ok=True, digest=digest, last_updated=data.get("last_updated"))
+    except Exception as exc:
+        result["error"] = str(exc)
+    result["latency_ms"] = round((time.perf_counter() - t0) * 1000, 2)
+    return result
+
+
+def resolve_all_channels(
+    channels: Optional[List[str]] = None,
+    registries: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """
+    Resolve every release channel on every registry concurrently.
+
+    All (registry, channel) lookups share one pooled keep-alive session. A
+    registry is healthy when it answered every channel; the healthy one
+    with the lowest median latency is selected and supplies each channel's
+    digest, falling back to any other registry that answered that channel.
+
+    Args:
+        channels: Channels to resolve (default: all of VALID_CHANNELS).
+        registries: Registry base URLs (default: Docker Hub plus the
+            configured mirrors).
+
+    Returns:
+        Dict[str, Any]: `selected_registry`, per-registry health, and one
+        entry per channel with `docker_image`, `digest`, `last_updated`,
+        `source` and `consistent` (all registries agree on the digest).
+    """
+    channels = list(channels or VALID_CHANNELS)
+    if registries is None:
+        registries = [DEFAULT_REGISTRY] + [m for m in get_mirrors() if m != DEFAULT_REGISTRY]
+
+    t0 = time.perf_counter()
+    jobs = [(registry, channel) for registry in registries for channel in channels]
+    with ThreadPoolExecutor(max_workers=max(1, len(jobs))) as pool:
+        answers = list(pool.map(lambda job: _query_tag(*job), jobs))
+
+    health = []
+    for registry in registries:
+        mine = [a for a in answers if a["registry"] == registry]
+        ok = [a for a in mine if a["ok"]]
+        health.append({
+            "url": registry,
+            "healthy": len(ok) == len(mine),
+            "answered": len(ok),
+            "median_latency_ms": round(statistics.median(a["latency_ms"] for a in ok), 2) if ok else None,
+            "errors": [a["error"] for a in mine if not a["ok"]],
+        })
+    healthy = sorted((h for h in health if h["healthy"]), key=lambda h: h["median_latency_ms"])
+    selected = healthy[0]["url"] if healthy else None
+
+    # Selected registry first, then the others by speed.
+    order = [selected] if selected else []
+    order += [h["url"] for h in sorted(health, key=lambda h: h["median_latency_ms"] or float("inf")) if h["url"] != selected]
+
+    resolved: Dict[str, Dict[str, Any]] = {}
+    for channel in channels:
+        found = {a["registry"]: a for a in answers if a["channel"] == channel and a["ok"]}
+        entry: Dict[str, Any] = {
+            "docker_image": f"{IMAGE_REPOSITORY}:{resolve_docker_tag(channel)}",
+            "ok": bool(found),
+        }
+        source = next((r for r in order if r in found), None)
+        if source is not None:
+            entry.update(
+                digest=found[source]["digest"],
+                last_updated=found[source]["last_updated"],
+                source=source,
+                consistent=len({a["digest"] for a in found.values()}) == 1,
+            )
+        resolved[channel] = entry
+
+    result = {
+        "timestamp": get_timestamp(),
+        "selected_registry": selected,
+        "duration_ms": round((time.perf_counter() - t0) * 1000, 2),
+        "registries": health,
+        "channels": resolved,
+    }
+    log("Resolved release channels", context={"selected_registry": selected, "channels": len(channels)})
+    return result
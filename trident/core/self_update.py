@@ -2,14 +2,14 @@ from __future__ import annotations
 
 import subprocess
 import sys
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
-from trident.identity import get_version, get_timestamp
-from trident.logging import log, log_section
+from trident.veil.identity import get_version, get_timestamp
+from trident.veil.logging import log, log_section
 from trident.core.channel import validate_channel, resolve_docker_tag
 
 
-def run_self_update(apply: bool = False, channel: str = "stable") -> Dict[str, Any]:
+def run_self_update(apply: bool = False, channel: Optional[str] = "stable") -> Dict[str, Any]:
     """
     Self-update logic with channel support.
 
@@ -21,6 +21,10 @@ def run_self_update(apply: bool = False, channel: str = "stable") -> Dict[str, A
     log_section("Self-Update Check")
 
     # Validate and resolve channel
+    if channel is None:
+        from trident.core.config import get_default_channel
+
+        channel = get_default_channel()
     channel = validate_channel(channel)
     tag = resolve_docker_tag(channel)
     image = f"notchofhwend/updater:{tag}"
@@ -6,27 +6,54 @@ It is designed to be:
 - installable as a modern Python package
 - runnable via `python -m veil`
 - extensible with additional subcommands and backends
+
+Public names are imported on first access (PEP 562), so `import trident.veil`
+does not load diagnostics, repair or self-update until they are used.
 """
 
-from .identity import (
-    get_project_root,
-    get_timestamp,
-    get_banner,
-    get_version,
-)
+from importlib import import_module
 
-from .diagnostics import run_diagnostics
-from .repair import run_repair
-from .self_update import run_self_update
+_EXPORTS = {
+    "get_identity": ".identity",
+    "get_project_root": ".identity",
+    "get_timestamp": ".identity",
+    "get_banner": ".identity",
+    "get_version": ".identity",
+    "run_diagnostics": ".diagnostics",
+    "register_check": ".diagnostics",
+    "run_repair": ".repair",
+    "plan_repair": ".repair",
+    "register_step": ".repair",
+    "run_self_update": ".self_update",
+}
 
 __all__ = [
+    "get_identity",
     "get_project_root",
     "get_timestamp",
     "get_banner",
     "get_version",
     "run_diagnostics",
+    "register_check",
     "run_repair",
-    "run_updater",
+    "plan_repair",
+    "register_step",
+    "run_self_update",
 ]
 
-__version__ = get_version()
+
+def __getattr__(name: str):
+    if name == "__version__":
+        from .identity import get_version
+
+        value = get_version()
+    elif name in _EXPORTS:
+        value = getattr(import_module(_EXPORTS[name], __name__), name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__ + ["__version__"])
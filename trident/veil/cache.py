@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Optional
+
+
+def get_cache_dir() -> Path:
+    """
+    Return the per-user cache directory for trident.
+
+    Uses $XDG_CACHE_HOME/trident when set, otherwise ~/.cache/trident.
+    The directory is not created here.
+    """
+    base = os.environ.get("XDG_CACHE_HOME")
+    return (Path(base) if base else Path.home() / ".cache") / "trident"
+
+
+def read_cache(name: str) -> Optional[Any]:
+    """
+    Load a JSON cache file from the cache directory.
+
+    Args:
+        name: File name inside the cache directory.
+
+    Returns:
+        The decoded JSON, or None if the file is missing or unreadable.
+    """
+    try:
+        with (get_cache_dir() / name).open("r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_cache(name: str, data: Any) -> None:
+    """
+    Atomically replace a JSON cache file. Failures are ignored: a cache
+    that cannot be written only costs a recomputation next time.
+
+    Args:
+        name: File name inside the cache directory.
+        data: JSON-serialisable value.
+    """
+    cache_dir = get_cache_dir()
+    tmp = cache_dir / f".{name}.{os.getpid()}.tmp"
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp.write_text(json.dumps(data, sort_keys=True), encoding="utf-8")
+        os.replace(tmp, cache_dir / name)
+    except OSError:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
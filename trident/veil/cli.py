@@ -2,13 +2,11 @@ from __future__ import annotations
 
 import argparse
 import json
+import sys
 from typing import Any, Dict
 
-from .diagnostics import run_diagnostics, render_diagnostics_report
-from .repair import run_repair
-from .self_update import run_self_update
-from .identity import get_banner
-from .logging import log
+# Subcommand modules are imported inside their handlers so that each
+# invocation only loads what it runs. See benchmarks/cold_start.py.
 
 
 def _print_json(data: Dict[str, Any]) -> None:
@@ -16,7 +14,17 @@ def _print_json(data: Dict[str, Any]) -> None:
 
 
 def _handle_diagnostics(args: argparse.Namespace) -> None:
-    result = run_diagnostics()
+    suites = ["core", "perf"] if args.perf else ["core"]
+    if args.serve:
+        from .metrics import serve_diagnostics
+
+        serve_diagnostics(host=args.host, port=args.port, interval=args.interval, suites=suites)
+        return
+
+    from .diagnostics import run_diagnostics, render_diagnostics_report
+    from .identity import get_banner
+
+    result = run_diagnostics(max_age=args.max_age, fresh=args.fresh, suites=suites)
     if args.json:
         _print_json(result)
     else:
@@ -26,7 +34,24 @@ def _handle_diagnostics(args: argparse.Namespace) -> None:
 
 
 def _handle_repair(args: argparse.Namespace) -> None:
-    result = run_repair()
+    from .identity import get_banner
+    from .repair import plan_repair, run_repair
+
+    if args.plan:
+        plan = plan_repair()
+        if args.json:
+            _print_json(plan)
+        else:
+            print(get_banner(extra="Mode: repair plan"))
+            print()
+            print(json.dumps(plan, indent=2, sort_keys=True))
+        return
+
+    plan = None
+    if args.from_plan:
+        with open(args.from_plan, "r", encoding="utf-8") as f:
+            plan = json.load(f)
+    result = run_repair(dry_run=args.dry_run, plan=plan)
     if args.json:
         _print_json(result)
     else:
@@ -36,8 +61,15 @@ def _handle_repair(args: argparse.Namespace) -> None:
 
 
 def _handle_update(args: argparse.Namespace, apply_changes: bool) -> None:
-    result = run_updater(dry_run=not apply_changes)
-    mode = "update-apply" if apply_changes else "update (dry run)"
+    from .identity import get_banner
+    from .self_update import prefetch_update, run_self_update
+
+    if getattr(args, "prefetch", False):
+        result = prefetch_update()
+        mode = "update (prefetch)"
+    else:
+        result = run_self_update(apply=apply_changes, refresh=getattr(args, "refresh", False))
+        mode = "update-apply" if apply_changes else "update (dry run)"
 
     if args.json:
         _print_json(result)
@@ -47,6 +79,30 @@ def _handle_update(args: argparse.Namespace, apply_changes: bool) -> None:
         print(json.dumps(result, indent=2, sort_keys=True))
 
 
+def _handle_logs(args: argparse.Namespace) -> None:
+    from .log_query import LogFilter, parse_since, query_logs
+
+    if args.file == "hardener":
+        from .hardener import LOG_PATH as path
+    else:
+        from .logging import _get_log_file
+        path = _get_log_file()
+
+    try:
+        since = parse_since(args.since) if args.since else None
+    except ValueError as exc:
+        raise SystemExit(f"veil logs: {exc}")
+
+    flt = LogFilter(since=since, level=args.level, message=args.message)
+    try:
+        for line in query_logs(path, flt, follow=args.follow):
+            sys.stdout.write(line if line.endswith("\n") else line + "\n")
+            if args.follow:
+                sys.stdout.flush()
+    except KeyboardInterrupt:
+        pass
+
+
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         prog="veil",
@@ -66,6 +122,45 @@ def build_parser() -> argparse.ArgumentParser:
         "diagnostics",
         help="Run diagnostics checks and report environment health.",
     )
+    diag_parser.add_argument(
+        "--max-age",
+        type=float,
+        metavar="SECONDS",
+        help="Return the last report if it is at most SECONDS old (for frequent health probes).",
+    )
+    diag_parser.add_argument(
+        "--fresh",
+        action="store_true",
+        help="Ignore cached results and rerun every check.",
+    )
+    diag_parser.add_argument(
+        "--perf",
+        action="store_true",
+        help="Also run host performance probes (disk throughput, fs latency, CPU quota, memory, load).",
+    )
+    diag_parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Serve results as Prometheus metrics at http://HOST:PORT/metrics until interrupted.",
+    )
+    diag_parser.add_argument(
+        "--host",
+        default="127.0.0.1",
+        help="Address for --serve to bind (default: 127.0.0.1).",
+    )
+    diag_parser.add_argument(
+        "--port",
+        type=int,
+        default=9464,
+        help="Port for --serve (default: 9464).",
+    )
+    diag_parser.add_argument(
+        "--interval",
+        type=float,
+        default=60.0,
+        metavar="SECONDS",
+        help="Seconds between diagnostics runs with --serve (default: 60).",
+    )
     diag_parser.set_defaults(func=_handle_diagnostics)
 
     # repair
@@ -73,37 +168,97 @@ def build_parser() -> argparse.ArgumentParser:
         "repair",
         help="Run repair routines to fix common issues.",
     )
+    repair_parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Report what would be repaired without changing anything.",
+    )
+    repair_parser.add_argument(
+        "--plan",
+        action="store_true",
+        help="Probe every step and print the execution plan without running it.",
+    )
+    repair_parser.add_argument(
+        "--from-plan",
+        metavar="FILE",
+        help="Run a plan saved from `veil --json repair --plan` instead of probing again.",
+    )
     repair_parser.set_defaults(func=_handle_repair)
 
     # update (dry run)
     update_parser = subparsers.add_parser(
         "update",
-        help="Run updater in dry-run mode (diff only, no writes).",
+        help="Check for a newer release without installing it.",
+    )
+    update_parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Ask the package index now instead of using the cached latest version.",
+    )
+    update_parser.add_argument(
+        "--prefetch",
+        action="store_true",
+        help="Download and verify the latest release's wheels so update-apply can install offline.",
     )
     update_parser.set_defaults(func=lambda args: _handle_update(args, apply_changes=False))
 
     # update-apply
     update_apply_parser = subparsers.add_parser(
         "update-apply",
-        help="Run updater and apply changes (with backups).",
+        help="Install the newest release if one is available.",
     )
     update_apply_parser.set_defaults(func=lambda args: _handle_update(args, apply_changes=True))
 
-    return parser
+    # logs
+    logs_parser = subparsers.add_parser(
+        "logs",
+        help="Query or follow the Veil logs, including rotated segments.",
+    )
+    logs_parser.add_argument(
+        "--file",
+        choices=["veil", "hardener"],
+        default="veil",
+        help="Which log to read (default: veil).",
+    )
+    logs_parser.add_argument(
+        "--since",
+        help="Only records from this ISO-8601 time, or this long ago (e.g. 15m, 2h, 1d).",
+    )
+    logs_parser.add_argument(
+        "--level",
+        type=str.upper,
+        choices=["DEBUG", "INFO", "WARN", "ERROR"],
+        help="Only records at or above this level.",
+    )
+    logs_parser.add_argument(
+        "--message",
+        help="Only records whose message matches this regular expression.",
+    )
+    logs_parser.add_argument(
+        "-f",
+        "--follow",
+        action="store_true",
+        help="Keep printing new records as they are written.",
+    )
+    logs_parser.set_defaults(func=_handle_logs)
 
     # self-update
     self_update_parser = subparsers.add_parser(
-    "self-update",
-    help="Check for the latest version and optionally update The Veil."
+        "self-update",
+        help="Check for the latest version and optionally update The Veil.",
     )
     self_update_parser.add_argument(
-    "--apply",
-    action="store_true",
-    help="Apply the update if a newer version is available."
+        "--apply",
+        action="store_true",
+        help="Apply the update if a newer version is available.",
     )
     self_update_parser.set_defaults(func=_handle_self_update)
 
+    return parser
+
+
 def _handle_self_update(args: argparse.Namespace) -> None:
+    from .identity import get_banner
     from .self_update import run_self_update
 
     result = run_self_update(apply=args.apply)
@@ -120,7 +275,11 @@ def main() -> None:
     parser = build_parser()
     args = parser.parse_args()
 
-    log("CLI invoked", context={"command": args.command, "json": bool(getattr(args, "json", False))})
+    # Health probes reading a cached diagnostics report skip the log write.
+    if getattr(args, "max_age", None) is None:
+        from .logging import log
+
+        log("CLI invoked", context={"command": args.command, "json": bool(getattr(args, "json", False))})
 
     func = getattr(args, "func", None)
     if func is None:
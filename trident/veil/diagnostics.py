@@ -1,14 +1,151 @@
 from __future__ import annotations
 
+import os
 import platform
 import sys
+import threading
+import time
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List, Optional
 
+from .cache import read_cache, write_cache
 from .identity import get_project_root, get_timestamp, get_version
 from .logging import log, log_section
 
 
+# Seconds a check may run before it is reported as timed out.
+DEFAULT_CHECK_TIMEOUT = 5.0
+
+# Third-party packages can register checks through this entry point group;
+# each entry point must resolve to a zero-argument callable returning a dict.
+ENTRY_POINT_GROUP = "trident.veil.diagnostics"
+
+# Cached check results and the last full report, under get_cache_dir().
+CACHE_FILE = "diagnostics.json"
+
+# Checks run by default. Other suites are opt-in (`veil diagnostics --perf`);
+# built-in suites are defined in these modules, imported on first use.
+DEFAULT_SUITE = "core"
+SUITE_MODULES = {"perf": ".perf"}
+
+
+@dataclass(frozen=True)
+class DiagnosticCheck:
+    """
+    A registered diagnostics check.
+
+    Attributes:
+        name: Unique check name, used as the result's `name`.
+        func: Zero-argument callable returning a result dict with at least `ok`.
+        timeout: Seconds before the check is reported as timed out.
+        ttl: Seconds a cached result stays valid (0 disables caching).
+        key: Callable returning a string that identifies the environment the
+            result depends on; a cached result is discarded when it changes.
+        suite: Suite the check belongs to (see SUITE_MODULES).
+    """
+
+    name: str
+    func: Callable[[], Dict[str, Any]]
+    timeout: float = DEFAULT_CHECK_TIMEOUT
+    ttl: float = 0.0
+    key: Optional[Callable[[], str]] = None
+    suite: str = DEFAULT_SUITE
+
+    def cache_key(self) -> str:
+        return self.key() if self.key is not None else ""
+
+
+_REGISTRY: Dict[str, DiagnosticCheck] = {}
+_entry_points_loaded = False
+
+
+def register_check(
+    name: str,
+    func: Optional[Callable[[], Dict[str, Any]]] = None,
+    timeout: float = DEFAULT_CHECK_TIMEOUT,
+    ttl: float = 0.0,
+    key: Optional[Callable[[], str]] = None,
+    suite: str = DEFAULT_SUITE,
+):
+    """
+    Register a diagnostics check. Works directly or as a decorator:
+
+        @register_check("docker_socket", timeout=2.0, ttl=30)
+        def _check_docker_socket():
+            ...
+
+    Registering an existing name replaces that check.
+
+    Args:
+        name: Unique check name.
+        func: Zero-argument callable returning a result dict.
+        timeout: Per-check timeout in seconds.
+        ttl: Seconds a cached result may be reused (0 = always rerun).
+        key: Cheap callable whose value invalidates cached results when it changes.
+        suite: Suite the check runs in; only DEFAULT_SUITE runs unless asked.
+    """
+    def decorator(f: Callable[[], Dict[str, Any]]):
+        _REGISTRY[name] = DiagnosticCheck(name=name, func=f, timeout=timeout, ttl=ttl, key=key, suite=suite)
+        return f
+
+    if func is not None:
+        return decorator(func)
+    return decorator
+
+
+def unregister_check(name: str) -> None:
+    """
+    Remove a check from the registry (no-op if it is not registered).
+    """
+    _REGISTRY.pop(name, None)
+
+
+def _load_entry_point_checks() -> None:
+    global _entry_points_loaded
+    if _entry_points_loaded:
+        return
+    _entry_points_loaded = True
+
+    from importlib import metadata
+
+    for ep in metadata.entry_points(group=ENTRY_POINT_GROUP):
+        if ep.name in _REGISTRY:
+            continue
+        try:
+            register_check(ep.name, ep.load())
+        except Exception as exc:
+            log("Failed to load diagnostics check", level="WARN", context={"name": ep.name, "error": str(exc)})
+
+
+def _load_suites(suites) -> None:
+    import importlib
+
+    for suite in suites:
+        module = SUITE_MODULES.get(suite)
+        if module is not None:
+            importlib.import_module(module, __package__)
+
+
+def registered_checks(suites=(DEFAULT_SUITE,)) -> List[DiagnosticCheck]:
+    """
+    Return the registered checks of the given suites, built-ins first, in
+    registration order.
+    """
+    _load_suites(suites)
+    _load_entry_point_checks()
+    return [check for check in _REGISTRY.values() if check.suite in suites]
+
+
+def _host_key() -> str:
+    return " ".join(os.uname()) if hasattr(os, "uname") else sys.platform
+
+
+@register_check(
+    "python_version",
+    ttl=3600,
+    key=lambda: f"{sys.executable} {sys.version}",
+)
 def _check_python_version() -> Dict[str, Any]:
     version_info = sys.version_info
     ok = version_info.major == 3 and version_info.minor >= 8
@@ -20,6 +157,11 @@ def _check_python_version() -> Dict[str, Any]:
     }
 
 
+@register_check(
+    "virtual_environment",
+    ttl=3600,
+    key=lambda: f"{sys.prefix} {sys.version}",
+)
 def _check_venv() -> Dict[str, Any]:
     in_venv = (
         hasattr(sys, "base_prefix")
@@ -34,6 +176,11 @@ def _check_venv() -> Dict[str, Any]:
     }
 
 
+@register_check(
+    "project_paths",
+    ttl=300,
+    key=lambda: str(get_project_root()),
+)
 def _check_paths() -> Dict[str, Any]:
     root = get_project_root()
     pyproject = root / "pyproject.toml"
@@ -48,6 +195,7 @@ def _check_paths() -> Dict[str, Any]:
     }
 
 
+@register_check("platform", ttl=86400, key=_host_key)
 def _check_platform() -> Dict[str, Any]:
     return {
         "name": "platform",
@@ -58,8 +206,57 @@ def _check_platform() -> Dict[str, Any]:
     }
 
 
+def _run_checks(checks: List[DiagnosticCheck]) -> List[Dict[str, Any]]:
+    """
+    Run checks concurrently, one daemon thread each.
+
+    Every check is waited on until its own deadline. A check that is still
+    running then is reported as timed out; its thread is abandoned (daemon
+    threads never block interpreter exit), so a hung check cannot hold up
+    the report.
+    """
+    slots: List[Dict[str, Any]] = [{} for _ in checks]
+    done = [threading.Event() for _ in checks]
+    started = time.monotonic()
+
+    def worker(i: int, check: DiagnosticCheck) -> None:
+        t0 = time.perf_counter()
+        try:
+            result = dict(check.func() or {})
+        except Exception as exc:
+            result = {"ok": False, "error": f"{type(exc).__name__}: {exc}"}
+        result.setdefault("name", check.name)
+        result.setdefault("ok", False)
+        result["duration_ms"] = round((time.perf_counter() - t0) * 1000, 2)
+        slots[i] = result
+        done[i].set()
+
+    for i, check in enumerate(checks):
+        threading.Thread(
+            target=worker, args=(i, check), name=f"diagnostics:{check.name}", daemon=True
+        ).start()
+
+    results: List[Dict[str, Any]] = []
+    for i, check in enumerate(checks):
+        remaining = started + check.timeout - time.monotonic()
+        if done[i].wait(max(0.0, remaining)):
+            results.append(slots[i])
+        else:
+            results.append({
+                "name": check.name,
+                "ok": False,
+                "timed_out": True,
+                "error": f"timed out after {check.timeout:g}s",
+                "duration_ms": round(check.timeout * 1000, 2),
+            })
+    return results
+
+
 def _format_result(result: Dict[str, Any]) -> str:
-    status = "OK" if result.get("ok") else "WARN"
+    if result.get("timed_out"):
+        status = "TIMEOUT"
+    else:
+        status = "OK" if result.get("ok") else "WARN"
     parts = [f"[{status}] {result.get('name', 'unknown')}"]
 
     for key, value in result.items():
@@ -70,25 +267,94 @@ def _format_result(result: Dict[str, Any]) -> str:
     return "\n".join(parts)
 
 
-def run_diagnostics() -> Dict[str, Any]:
+def _cached_report(cache: Dict[str, Any], suites, now: float, max_age: float) -> Optional[Dict[str, Any]]:
+    report = cache.get("reports", {}).get(",".join(suites))
+    if not isinstance(report, dict):
+        return None
+    # Only checks already registered in this process are compared, so the
+    # fast path never pays for entry point discovery; checks loaded from
+    # entry points are bounded by max_age alone.
+    stored_keys = report.get("keys", {})
+    for name, check in _REGISTRY.items():
+        if check.suite in suites and stored_keys.get(name) != check.cache_key():
+            return None
+    age = now - report.get("stored_at", 0)
+    if not 0 <= age <= max_age:
+        return None
+    return dict(report["result"], cached=True, age_s=round(age, 3))
+
+
+def run_diagnostics(
+    max_age: Optional[float] = None,
+    fresh: bool = False,
+    suites: Optional[List[str]] = None,
+) -> Dict[str, Any]:
     """
-    Run a suite of diagnostics checks and return a structured result.
+    Run the registered diagnostics checks and return a structured result.
+
+    Checks run concurrently, each under its own timeout (see
+    register_check); every check result carries its `duration_ms`.
+
+    Results are cached on disk (see cache.get_cache_dir). A check's cached
+    result is reused while it is younger than the check's `ttl` and its
+    invalidation key is unchanged.
+
+    Args:
+        max_age: Accept a cached full report up to this many seconds old
+            without running anything or writing the log, and never reuse a
+            check result older than this.
+        fresh: Ignore the cache and rerun every check.
+        suites: Suites to run, e.g. ["core", "perf"] (default: core only).
 
     This function is used by the CLI and may also be imported programmatically.
     """
+    suites = sorted(set(suites or [DEFAULT_SUITE]))
+    now = time.time()
+    cache = None if fresh else read_cache(CACHE_FILE)
+    if not isinstance(cache, dict):
+        cache = {}
+    if max_age is not None:
+        report = _cached_report(cache, suites, now, max_age)
+        if report is not None:
+            return report
+
+    registry = registered_checks(suites)
+    keys = {check.name: check.cache_key() for check in registry}
+
     log_section("Diagnostics Run")
 
-    checks: List[Dict[str, Any]] = [
-        _check_python_version(),
-        _check_venv(),
-        _check_paths(),
-        _check_platform(),
-    ]
+    t0 = time.perf_counter()
+    cached_checks = cache.get("checks", {})
+    checks: List[Optional[Dict[str, Any]]] = []
+    to_run: List[DiagnosticCheck] = []
+    for check in registry:
+        entry = cached_checks.get(check.name)
+        limit = check.ttl if max_age is None else min(check.ttl, max_age)
+        if isinstance(entry, dict) and entry.get("key") == keys[check.name]:
+            age = now - entry.get("stored_at", 0)
+            if 0 <= age <= limit:
+                checks.append(dict(entry["result"], cached=True, age_s=round(age, 3)))
+                continue
+        checks.append(None)
+        to_run.append(check)
+
+    ran = iter(_run_checks(to_run))
+    new_entries = {}
+    for i, check in enumerate(registry):
+        if checks[i] is None:
+            checks[i] = next(ran)
+            if check.ttl > 0 and not checks[i].get("timed_out"):
+                new_entries[check.name] = {"key": keys[check.name], "stored_at": now, "result": checks[i]}
 
     for c in checks:
         log(
             "Diagnostic check",
-            context={"name": c.get("name"), "ok": c.get("ok")},
+            context={
+                "name": c.get("name"),
+                "ok": c.get("ok"),
+                "duration_ms": c.get("duration_ms"),
+                "timed_out": bool(c.get("timed_out")),
+            },
         )
 
     overall_ok = all(c.get("ok", False) for c in checks)
@@ -97,9 +363,16 @@ def run_diagnostics() -> Dict[str, Any]:
         "timestamp": get_timestamp(),
         "version": get_version(),
         "overall_ok": overall_ok,
+        "duration_ms": round((time.perf_counter() - t0) * 1000, 2),
         "checks": checks,
     }
 
+    stored = {name: entry for name, entry in cached_checks.items() if name in _REGISTRY}
+    stored.update(new_entries)
+    reports = cache.get("reports", {}) if isinstance(cache.get("reports"), dict) else {}
+    reports[",".join(suites)] = {"stored_at": now, "keys": keys, "result": result}
+    write_cache(CACHE_FILE, {"checks": stored, "reports": reports})
+
     return result
 
 
@@ -117,6 +390,7 @@ def render_diagnostics_report(result: Dict[str, Any]) -> str:
     lines.append(f"Diagnostics Report — {result.get('timestamp')}")
     lines.append(f"Version: {result.get('version')}")
     lines.append(f"Overall OK: {result.get('overall_ok')}")
+    lines.append(f"Duration: {result.get('duration_ms')} ms")
     lines.append("")
 
     for check in result.get("checks", []):
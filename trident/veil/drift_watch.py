@@ -0,0 +1,339 @@
+"""
+Live drift detection for the canonical zones (`hardener --watch`).
+
+One full scan at start-up, then Linux inotify keeps the drift set current:
+only the files and directories named in events are re-checked. Every
+change is logged like a normal drift scan and published to
+.veil/drift.json, which `hardener --drift-status` reads without scanning.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import signal
+import struct
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from . import hardener
+from .hardener import log
+
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+
+# Watched directories under a zone or the template root.
+DIR_MASK = IN_CREATE | IN_DELETE | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_ONLYDIR
+# The project root itself: only zone directories appearing or going away.
+ROOT_MASK = IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO | IN_ONLYDIR
+
+_EVENT = struct.Struct("iIII")
+
+# Events arriving within this window are handled as one batch, so an
+# editor's write + rename or a `git checkout` is re-checked once.
+COALESCE_SECONDS = 0.2
+
+
+class Inotify:
+    """
+    Minimal ctypes binding for the Linux inotify API.
+    """
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError(errno.ENOSYS, "inotify is not available on this platform")
+        self._libc = libc
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, f"inotify_init1: {os.strerror(err)}")
+
+    def add_watch(self, path: Path, mask: int) -> int:
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), ctypes.c_uint32(mask))
+        if wd < 0:
+            err = ctypes.get_errno()
+            if err == errno.ENOSPC:
+                raise OSError(err, "inotify watch limit reached (raise fs.inotify.max_user_watches)")
+            raise OSError(err, f"inotify_add_watch {path}: {os.strerror(err)}")
+        return wd
+
+    def rm_watch(self, wd: int) -> None:
+        # EINVAL just means the kernel already dropped the watch.
+        self._libc.inotify_rm_watch(self.fd, wd)
+
+    def read(self, timeout: Optional[float] = None) -> List[Tuple[int, int, str]]:
+        """
+        Wait up to timeout seconds and return [(wd, mask, name), ...].
+        """
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            buf = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+
+        events = []
+        offset = 0
+        while offset < len(buf):
+            wd, mask, _cookie, length = _EVENT.unpack_from(buf, offset)
+            offset += _EVENT.size
+            name = buf[offset:offset + length].rstrip(b"\0")
+            offset += length
+            events.append((wd, mask, os.fsdecode(name)))
+        return events
+
+    def close(self) -> None:
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+    def __enter__(self) -> "Inotify":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _under(path: Path, root: Path) -> bool:
+    return path == root or root in path.parents
+
+
+class DriftWatcher:
+    """
+    Keeps the drift set of the canonical zones current from inotify events.
+
+    Directories are watched with the same pruning and .gitignore/.veilignore
+    rules as the hardener's TreeIndex. Changes to an ignore file, a new
+    virtualenv or a queue overflow re-sync the affected zone from disk.
+    """
+
+    def __init__(self, inotify: Inotify):
+        self.inotify = inotify
+        self.drift: Dict[str, str] = {}
+        self._watches: Dict[int, Path] = {}
+        self._wds: Dict[Path, int] = {}
+        self._rules: Dict[Path, list] = {}
+        self._dirty = False
+
+    # ── watches ──────────────────────────────
+
+    def _watch(self, dirpath: Path, mask: int = DIR_MASK) -> None:
+        if dirpath in self._wds:
+            return
+        try:
+            wd = self.inotify.add_watch(dirpath, mask)
+        except (FileNotFoundError, NotADirectoryError):
+            return
+        self._watches[wd] = dirpath
+        self._wds[dirpath] = wd
+
+    def _unwatch(self, root: Path) -> None:
+        for dirpath in [d for d in self._wds if _under(d, root)]:
+            wd = self._wds.pop(dirpath)
+            self._watches.pop(wd, None)
+            self.inotify.rm_watch(wd)
+
+    def _dir_rules(self, dirpath: Path) -> list:
+        """Ignore rules in effect for entries of dirpath."""
+        rules = self._rules.get(dirpath)
+        if rules is None:
+            inherited = [] if dirpath == hardener.PROJECT_ROOT else self._dir_rules(dirpath.parent)
+            rules = list(inherited)
+            for name in hardener.IGNORE_FILES:
+                rules.extend(hardener._parse_ignore_file(dirpath / name))
+            self._rules[dirpath] = rules
+        return rules
+
+    def _zone_of(self, path: Path) -> Optional[Path]:
+        for zone in hardener.CANONICAL_ZONES:
+            if _under(path, zone):
+                return zone
+        return None
+
+    # ── drift state ──────────────────────────
+
+    def _set(self, repo_rel: str, reason: Optional[str]) -> None:
+        old = self.drift.get(repo_rel)
+        if reason == old:
+            return
+        if reason is None:
+            del self.drift[repo_rel]
+            log(f"[RESOLVED] {repo_rel} (was {old})")
+        else:
+            self.drift[repo_rel] = reason
+            hardener.log_drift(repo_rel, reason)
+        self._dirty = True
+
+    def _check(self, path: Path) -> None:
+        repo_rel = path.relative_to(hardener.PROJECT_ROOT).as_posix()
+        self._set(repo_rel, hardener.drift_path_reason(path))
+
+    def _check_declared(self, root: Path) -> None:
+        for repo_rel, _ in hardener.FILES_FROM_TEMPLATES:
+            path = hardener.PROJECT_ROOT / repo_rel
+            if _under(path, root):
+                self._check(path)
+
+    def resync(self, root: Path) -> None:
+        """Forget everything under root and rebuild it from one scandir pass."""
+        self._unwatch(root)
+        self._rules = {d: r for d, r in self._rules.items() if not _under(d, root)}
+        found = set()
+
+        if root.is_dir():
+            index = hardener.TreeIndex(hardener.PROJECT_ROOT)
+            index.add_root(root, rules=self._dir_rules(root.parent))
+            for dirpath in index.walk_dirs(root):
+                self._watch(dirpath)
+            for path in index.files(root):
+                found.add(path.relative_to(hardener.PROJECT_ROOT).as_posix())
+                self._check(path)
+
+        declared = dict(hardener.FILES_FROM_TEMPLATES)
+        for repo_rel in list(self.drift):
+            path = hardener.PROJECT_ROOT / repo_rel
+            if repo_rel not in found and repo_rel not in declared and _under(path, root):
+                self._set(repo_rel, None)
+        self._check_declared(root)
+
+    def _watch_templates(self) -> None:
+        template_root = hardener.TEMPLATE_ROOT
+        if not template_root.is_dir():
+            return
+        for dirpath, _, _ in os.walk(template_root):
+            self._watch(Path(dirpath))
+
+    # ── event loop ───────────────────────────
+
+    def start(self, jobs: int = 1) -> None:
+        root = hardener.PROJECT_ROOT
+        wd = self.inotify.add_watch(root, ROOT_MASK)
+        self._watches[wd] = root
+        self._wds[root] = wd
+
+        index = hardener.TreeIndex(root)
+        for zone in hardener.CANONICAL_ZONES:
+            index.add_root(zone)
+            for dirpath in index.walk_dirs(zone):
+                self._watch(dirpath)
+        self._watch_templates()
+
+        # Scan after the watches exist so nothing written meanwhile is lost.
+        self.drift = hardener.detect_drift(jobs=jobs)
+        log(f"[WATCH] Watching {len(self._wds)} director(ies); {len(self.drift)} drifted path(s)")
+
+    def handle(self, events) -> None:
+        """Apply one batch of inotify events."""
+        resync, check, templates = set(), set(), set()
+
+        for wd, mask, name in events:
+            if mask & IN_Q_OVERFLOW:
+                log("[WATCH] inotify queue overflowed; re-syncing canonical zones")
+                resync.update(hardener.CANONICAL_ZONES)
+                templates.add(None)
+                continue
+            if mask & IN_IGNORED:
+                dirpath = self._watches.pop(wd, None)
+                if dirpath is not None:
+                    self._wds.pop(dirpath, None)
+                continue
+
+            dirpath = self._watches.get(wd)
+            if dirpath is None or not name:
+                continue
+            path = dirpath / name
+            is_dir = bool(mask & IN_ISDIR)
+
+            if _under(path, hardener.TEMPLATE_ROOT):
+                if is_dir:
+                    if mask & (IN_CREATE | IN_MOVED_TO):
+                        self._watch_templates()
+                    templates.add(None)
+                else:
+                    templates.add(path.relative_to(hardener.TEMPLATE_ROOT).as_posix())
+                continue
+
+            if dirpath == hardener.PROJECT_ROOT:
+                if path in hardener.CANONICAL_ZONES:
+                    resync.add(path)
+                continue
+
+            zone = self._zone_of(path)
+            if zone is None:
+                continue
+            if name in hardener.IGNORE_FILES or name == "pyvenv.cfg":
+                resync.add(zone)
+            elif is_dir:
+                if name not in hardener.PRUNED_DIRS and not hardener._is_ignored(path, True, self._dir_rules(dirpath)):
+                    resync.add(path)
+            elif not hardener._is_ignored(path, False, self._dir_rules(dirpath)):
+                check.add(path)
+
+        # Outermost roots only; nested ones are covered by their parent.
+        roots = sorted(resync, key=lambda p: len(p.parts))
+        done: List[Path] = []
+        for root in roots:
+            if not any(_under(root, r) for r in done):
+                self.resync(root)
+                done.append(root)
+
+        for path in sorted(check):
+            if not any(_under(path, r) for r in done):
+                self._check(path)
+
+        if templates:
+            changed = None if None in templates else templates
+            for repo_rel, template_rel in hardener.FILES_FROM_TEMPLATES:
+                if changed is None or template_rel in changed:
+                    hardener.invalidate_template(template_rel)
+                    self._check(hardener.PROJECT_ROOT / repo_rel)
+
+    def publish(self) -> None:
+        if self._dirty:
+            self.drift = dict(sorted(self.drift.items()))
+            hardener.save_drift_state(self.drift)
+            self._dirty = False
+
+    def run(self) -> None:
+        while True:
+            events = self.inotify.read(timeout=None)
+            deadline = time.monotonic() + COALESCE_SECONDS
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                more = self.inotify.read(timeout=remaining)
+                if not more:
+                    break
+                events.extend(more)
+            self.handle(events)
+            self.publish()
+
+
+def watch_drift(jobs: int = 1) -> None:
+    """
+    Run the drift watcher until interrupted (Ctrl-C or SIGTERM).
+    """
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    with Inotify() as inotify:
+        watcher = DriftWatcher(inotify)
+        watcher.start(jobs=jobs)
+        try:
+            watcher.run()
+        except KeyboardInterrupt:
+            watcher.publish()
+            log("[WATCH] Stopped")
@@ -1,10 +1,23 @@
 import os
+import json
 import shutil
+import stat
 import hashlib
-import difflib
+import codecs
+import gzip
+import fnmatch
+import re
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timezone
 import argparse
+import sys
+import functools
+import importlib.resources
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from .log_writer import flush_logs, get_writer
+from .rewrite import LANGUAGE_RULES, RewriteEngine, load_rules
 
 # ─────────────────────────────────────────────
 # Paths
@@ -13,6 +26,19 @@ import argparse
 PROJECT_ROOT = Path(__file__).resolve().parent
 TEMPLATE_ROOT = PROJECT_ROOT / "hardening_content" / "templates"
 LOG_PATH = PROJECT_ROOT / "logs" / "hardener.log"
+MANIFEST_PATH = PROJECT_ROOT / ".veil" / "manifest"
+JOURNAL_DIR = PROJECT_ROOT / ".veil" / "journal"
+OBJECT_DIR = PROJECT_ROOT / ".veil" / "objects"
+DRIFT_PATH = PROJECT_ROOT / ".veil" / "drift.json"
+
+# ─────────────────────────────────────────────
+# Banner
+# ─────────────────────────────────────────────
+
+HARDENED_BANNER = (
+    "# 🔱 Auto‑generated by Veil Sentinel Hardener\n"
+    "# Do not edit manually — changes will be overwritten.\n\n"
+)
 
 # ─────────────────────────────────────────────
 # Canonical Template Map
@@ -31,60 +57,944 @@ FILES_FROM_TEMPLATES = [
 # Logging
 # ─────────────────────────────────────────────
 
+# Per-run outcome counts, keyed off the log tag. Captured records are only
+# tallied when replayed, so worker threads never touch the counter. Drift
+# is counted from detect_drift()'s result, since one drifted path can log
+# more than one [DRIFT] line.
+RUN_STATS = {"changed": 0, "skipped": 0, "drifted": 0}
+_TALLY_TAGS = {
+    "[WRITE]": "changed",
+    "[INIT]": "changed",
+    "[DRY‑RUN]": "changed",
+    "[SKIP]": "skipped",
+}
+ECHO = True
+
 def log(msg: str):
-    LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
-    from datetime import datetime, timezone
+    records = getattr(_capture, "records", None)
+    if records is not None:
+        records.append((log, msg))
+        return
+    tally = _TALLY_TAGS.get(msg.split(" ", 1)[0])
+    if tally is not None:
+        RUN_STATS[tally] += 1
     timestamp = datetime.now(timezone.utc).isoformat()
     entry = f"[{timestamp}] {msg}"
-    with LOG_PATH.open("a", encoding="utf-8") as f:
-        f.write(entry + "\n")
-    print(entry)
+    get_writer(LOG_PATH).write(entry + "\n", timestamp)
+    if ECHO:
+        print(entry)
+
+def emit(line: str):
+    """Print a line of console output (diffs), buffered while captured."""
+    records = getattr(_capture, "records", None)
+    if records is not None:
+        records.append((emit, line))
+        return
+    if ECHO:
+        print(line)
+
+# ─────────────────────────────────────────────
+# Per-file Executor
+# ─────────────────────────────────────────────
+# Per-file work runs on a thread pool when --jobs > 1. Each task's log and
+# diff output is captured and replayed in sorted item order, so a parallel
+# run prints and logs exactly what a serial run would.
+
+_capture = threading.local()
+
+def _run_captured(work, item):
+    _capture.records = []
+    try:
+        work(item)
+        return _capture.records, None
+    except Exception as exc:
+        return _capture.records, exc
+    finally:
+        _capture.records = None
+
+def run_per_file(items, work, jobs: int = 1):
+    items = sorted(items)
+    if jobs <= 1:
+        for item in items:
+            work(item)
+        return
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(_run_captured, work, item) for item in items]
+        for future in futures:
+            records, exc = future.result()
+            for sink, text in records:
+                sink(text)
+            if exc is not None:
+                raise exc
 
 # ─────────────────────────────────────────────
 # Hashing
 # ─────────────────────────────────────────────
 
-def file_hash(path: Path) -> str:
-    if not path.exists():
+# Files are hashed in fixed-size chunks so memory stays flat regardless of
+# file size. sha256 is the default; blake2b is faster on 64-bit hosts.
+
+HASH_CHUNK_SIZE = 1 << 20
+HASH_ALGORITHMS = {
+    "sha256": hashlib.sha256,
+    "blake2b": hashlib.blake2b,
+}
+
+def file_hash(path: Path, algorithm: str = "sha256") -> str:
+    h = HASH_ALGORITHMS[algorithm]()
+    buf = bytearray(HASH_CHUNK_SIZE)
+    view = memoryview(buf)
+    try:
+        with path.open("rb", buffering=0) as f:
+            while True:
+                n = f.readinto(buf)
+                if not n:
+                    break
+                h.update(view[:n])
+    except FileNotFoundError:
         return "<missing>"
-    h = hashlib.sha256()
-    with path.open("rb") as f:
-        h.update(f.read())
     return h.hexdigest()
 
+def _hash_worker(task):
+    path, algorithm = task
+    return file_hash(Path(path), algorithm)
+
+def hash_files(paths, jobs: int = 1, algorithm: str = "sha256") -> dict:
+    """
+    Hash many files, on a process pool when jobs > 1.
+
+    Returns a {Path: digest} mapping.
+    """
+    paths = list(paths)
+    if jobs <= 1 or len(paths) < 2:
+        return {path: file_hash(path, algorithm) for path in paths}
+
+    tasks = [(str(path), algorithm) for path in paths]
+    chunksize = max(1, len(tasks) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        digests = pool.map(_hash_worker, tasks, chunksize=chunksize)
+        return dict(zip(paths, digests))
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+# ─────────────────────────────────────────────
+# Incremental Manifest
+# ─────────────────────────────────────────────
+# Records size / mtime_ns / inode and the output hash of every file the
+# hardener manages, plus the hash of the transform that produced it. In
+# --incremental mode a file whose stat and source hash still match is
+# skipped without being opened.
+
+MANIFEST_VERSION = 1
+
+# Source hashes for the docs phases: they change whenever the banner or
+# the language rules change, which invalidates every recorded docs file.
+BANNER_SOURCE = text_hash(HARDENED_BANNER)
+LANGUAGE_ENGINE = RewriteEngine(LANGUAGE_RULES)
+LANGUAGE_SOURCE = LANGUAGE_ENGINE.signature
+
+def set_language_rules(rules):
+    """Swap the docs language rule set (e.g. from --rules FILE)."""
+    global LANGUAGE_ENGINE, LANGUAGE_SOURCE
+    LANGUAGE_ENGINE = RewriteEngine(rules)
+    LANGUAGE_SOURCE = LANGUAGE_ENGINE.signature
+
+def load_manifest() -> dict:
+    try:
+        data = json.loads(MANIFEST_PATH.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        data = None
+    if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+        data = {"version": MANIFEST_VERSION, "templates": {}, "files": {}}
+    return data
+
+def save_manifest(manifest: dict):
+    MANIFEST_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp = MANIFEST_PATH.with_name(MANIFEST_PATH.name + ".tmp")
+    tmp.write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8")
+    os.replace(tmp, MANIFEST_PATH)
+
+def _manifest_key(path: Path) -> str:
+    try:
+        return path.relative_to(PROJECT_ROOT).as_posix()
+    except ValueError:
+        return str(path)
+
+def _stat_signature(path: Path, index=None):
+    if index is not None:
+        st = index.stat(path)
+    else:
+        try:
+            st = path.stat()
+        except OSError:
+            st = None
+    if st is None:
+        return None
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "ino": st.st_ino}
+
+def _stat_matches(entry: dict, sig) -> bool:
+    return sig is not None and all(entry.get(k) == v for k, v in sig.items())
+
+def manifest_is_current(manifest: dict, path: Path, phase: str, source: str, index=None) -> bool:
+    entry = manifest["files"].get(_manifest_key(path))
+    if entry is None or entry.get("sources", {}).get(phase) != source:
+        return False
+    return _stat_matches(entry, _stat_signature(path, index))
+
+def manifest_record(manifest: dict, path: Path, phase: str, source: str, output_hash: str):
+    sig = _stat_signature(path)
+    if sig is None:
+        return
+    key = _manifest_key(path)
+    entry = manifest["files"].get(key, {})
+    if entry.get("sha256") != output_hash:
+        # Content changed since the other phases verified it.
+        entry = {}
+    entry.update(sig)
+    entry["sha256"] = output_hash
+    entry.setdefault("sources", {})[phase] = source
+    manifest["files"][key] = entry
+
+def rendered_template_hash(template_rel: str, manifest: dict = None) -> str:
+    """
+    Hash of banner + template. Taken from the compiled bundle when it is
+    fresh, otherwise from the manifest while the template's stat is
+    unchanged, so the template is not re-read.
+    """
+    entry = _fresh_bundle_entry(template_rel)
+    if entry is not None:
+        return entry["sha256"]
+    if manifest is None:
+        return rendered_template(template_rel)[1]
+
+    template_path = TEMPLATE_ROOT / template_rel
+    sig = _stat_signature(template_path)
+    entry = manifest["templates"].get(template_rel)
+    if entry is not None and _stat_matches(entry, sig):
+        return entry["rendered"]
+    rendered = rendered_template(template_rel)[1]
+    if sig is not None:
+        manifest["templates"][template_rel] = dict(sig, rendered=rendered)
+    return rendered
+
+# ─────────────────────────────────────────────
+# Tree Index
+# ─────────────────────────────────────────────
+# One os.scandir pass over app/, infra/ and docs/, shared by every phase.
+# DirEntry objects are kept so their cached stat data is reused, and
+# VCS/dependency/virtualenv directories plus .gitignore/.veilignore
+# matches are pruned before they are descended into.
+
+PRUNED_DIRS = {
+    ".git", ".hg", ".svn", ".veil", "node_modules", "__pycache__",
+    ".venv", "venv", ".tox", ".nox", ".mypy_cache", ".pytest_cache", ".ruff_cache",
+}
+IGNORE_FILES = (".gitignore", ".veilignore")
+
+def _parse_ignore_file(path: Path) -> list:
+    """
+    Parse a gitignore-style file into (base, regex, negate, dir_only, anchored)
+    rules. Supports comments, `!` negation, trailing `/` and anchored patterns.
+    """
+    try:
+        lines = path.read_text(encoding="utf-8").splitlines()
+    except (OSError, UnicodeDecodeError):
+        return []
+
+    rules = []
+    for line in lines:
+        line = line.rstrip()
+        if not line or line.startswith("#"):
+            continue
+        negate = line.startswith("!")
+        if negate:
+            line = line[1:]
+        dir_only = line.endswith("/")
+        line = line.strip("/") if dir_only else line
+        anchored = "/" in line
+        line = line.lstrip("/")
+        if not line:
+            continue
+        regex = re.compile(fnmatch.translate(line))
+        rules.append((path.parent, regex, negate, dir_only, anchored))
+    return rules
+
+def _is_ignored(path: Path, is_dir: bool, rules) -> bool:
+    ignored = False
+    for base, regex, negate, dir_only, anchored in rules:
+        if dir_only and not is_dir:
+            continue
+        target = path.relative_to(base).as_posix() if anchored else path.name
+        if regex.match(target):
+            ignored = not negate
+    return ignored
+
+class TreeIndex:
+    """
+    Filesystem index built once per run with os.scandir.
+
+    Lookups (`exists`, `is_dir`, `stat`) are answered from the index without
+    touching the disk again; stat data comes from the cached DirEntry.
+    """
+
+    def __init__(self, base: Path = None):
+        self.base = base or PROJECT_ROOT
+        self._entries = {}   # Path -> DirEntry | os.stat_result | None
+        self._children = {}  # dir Path -> (subdir Paths, file Paths)
+        self._base_rules = []
+        self._lock = threading.Lock()
+        for name in IGNORE_FILES:
+            self._base_rules.extend(_parse_ignore_file(self.base / name))
+
+    def add_root(self, root: Path, rules=None):
+        """
+        Index root recursively. `rules` are the ignore rules inherited from
+        root's ancestors; they default to the project root's ignore files.
+        """
+        if root in self._children or not root.is_dir():
+            return
+        rules = list(self._base_rules if rules is None else rules)
+        stack = [(root, rules)]
+        while stack:
+            dirpath, rules = stack.pop()
+            try:
+                with os.scandir(dirpath) as it:
+                    entries = list(it)
+            except OSError:
+                continue
+            names = {e.name for e in entries}
+            if dirpath != root and "pyvenv.cfg" in names:
+                # Unconventionally named virtualenv.
+                self._drop_dir(dirpath)
+                continue
+            if dirpath != self.base:
+                for name in IGNORE_FILES:
+                    if name in names:
+                        rules = rules + _parse_ignore_file(dirpath / name)
+
+            subdirs, files = [], []
+            for entry in sorted(entries, key=lambda e: e.name):
+                path = dirpath / entry.name
+                is_dir = entry.is_dir(follow_symlinks=False)
+                if is_dir and entry.name in PRUNED_DIRS:
+                    continue
+                if rules and _is_ignored(path, is_dir, rules):
+                    continue
+                self._entries[path] = entry
+                (subdirs if is_dir else files).append(path)
+            self._children[dirpath] = (subdirs, files)
+            stack.extend((d, rules) for d in reversed(subdirs))
+
+    def _drop_dir(self, dirpath: Path):
+        self._entries.pop(dirpath, None)
+        parent = self._children.get(dirpath.parent)
+        if parent is not None:
+            parent[0].remove(dirpath)
+
+    def walk_dirs(self, root: Path):
+        """Yield indexed directories under root, top-down, in sorted order."""
+        self.add_root(root)
+        if root not in self._children:
+            return
+        stack = [root]
+        while stack:
+            dirpath = stack.pop()
+            yield dirpath
+            stack.extend(reversed(self._children[dirpath][0]))
+
+    def files(self, root: Path, suffix: str = None):
+        """Return indexed files under root in sorted path order."""
+        found = []
+        for dirpath in self.walk_dirs(root):
+            for path in self._children[dirpath][1]:
+                if suffix is None or path.suffix == suffix:
+                    found.append(path)
+        return sorted(found)
+
+    def exists(self, path: Path) -> bool:
+        if path in self._entries or path in self._children:
+            return True
+        if path.parent in self._children:
+            return False
+        return path.exists()
+
+    def is_dir(self, path: Path) -> bool:
+        if path in self._children:
+            return True
+        entry = self._entries.get(path)
+        if isinstance(entry, os.DirEntry):
+            return entry.is_dir(follow_symlinks=False)
+        return path.is_dir()
+
+    def stat(self, path: Path):
+        entry = self._entries.get(path)
+        if isinstance(entry, os.DirEntry):
+            return entry.stat(follow_symlinks=False)
+        if isinstance(entry, os.stat_result):
+            return entry
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        if path in self._entries:
+            self._entries[path] = st
+        return st
+
+    def add_file(self, path: Path):
+        """Register a file created during the run."""
+        with self._lock:
+            if path in self._entries:
+                self._entries[path] = None
+                return
+            self._entries[path] = None
+            children = self._children.get(path.parent)
+            if children is not None:
+                children[1].append(path)
+                children[1].sort()
+
+    def invalidate(self, path: Path):
+        """Drop cached stat data for a file rewritten during the run."""
+        if path in self._entries:
+            self._entries[path] = None
+
+def build_tree_index(roots) -> TreeIndex:
+    index = TreeIndex(PROJECT_ROOT)
+    for root in roots:
+        index.add_root(root)
+    return index
+
+def hash_tree(root: Path, jobs: int = 1, algorithm: str = "sha256", index=None) -> dict:
+    """
+    Hash every indexed file under root (ignore rules apply).
+
+    Returns a {root-relative posix path: digest} mapping in sorted order.
+    """
+    index = index or build_tree_index([root])
+    digests = hash_files(index.files(root), jobs=jobs, algorithm=algorithm)
+    return {path.relative_to(root).as_posix(): digest for path, digest in digests.items()}
+
 # ─────────────────────────────────────────────
 # Backup / Restore
 # ─────────────────────────────────────────────
 
-def backup_once(path: Path):
-    if not path.exists():
-        return
-    backup_path = path.with_suffix(path.suffix + ".bak")
-    if backup_path.exists():
-        return
-    shutil.copy2(path, backup_path)
-    log(f"[BACKUP] {path} -> {backup_path}")
+# Pre-images of every file a run rewrites are kept in .veil/objects, keyed
+# by sha256, so identical content is stored once and the working tree stays
+# free of .bak files. Objects are reflinked (FICLONE) where the filesystem
+# supports it, otherwise copied (gzip-compressed when requested). Never
+# hardlinked: an in-place write to the live file, by an editor or the user,
+# would change the stored pre-image along with it.
+
+FICLONE = 0x40049409
+
+def _object_path(digest: str) -> Path:
+    return OBJECT_DIR / digest[:2] / digest[2:]
+
+def _reflink(src: Path, dst: Path) -> bool:
+    try:
+        import fcntl
+        with src.open("rb") as s, dst.open("wb") as d:
+            fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+        return True
+    except (ImportError, OSError):
+        dst.unlink(missing_ok=True)
+        return False
+
+def store_backup(path: Path, compress: bool = False):
+    """
+    Store the current content of path in the object store.
+
+    Returns the object digest, or None if path does not exist.
+    """
+    digest = file_hash(path)
+    if digest == "<missing>":
+        return None
+
+    obj = _object_path(digest)
+    gz = obj.with_name(obj.name + ".gz")
+    if obj.exists() or gz.exists():
+        return digest
+
+    obj.parent.mkdir(parents=True, exist_ok=True)
+    tmp = obj.with_name(f".{obj.name}.{threading.get_ident()}.tmp")
+    if _reflink(path, tmp):
+        method = "reflink"
+    elif compress:
+        with path.open("rb") as src, gzip.open(tmp, "wb") as dst:
+            shutil.copyfileobj(src, dst, HASH_CHUNK_SIZE)
+        obj, method = gz, "gzip"
+    else:
+        with path.open("rb", buffering=0) as src, tmp.open("wb", buffering=0) as dst:
+            _splice(src, dst, os.fstat(src.fileno()).st_size)
+        method = "copy"
+    os.replace(tmp, obj)
+    log(f"[BACKUP] {path} -> objects/{digest[:12]} ({method})")
+    return digest
+
+def restore_backup(digest: str, path: Path, mode: int = None, uid: int = None, gid: int = None):
+    """
+    Put the object digest back at path.
+
+    mode, uid and gid are the file's metadata as journaled before the
+    write; when given they are applied to the restored file.
+    """
+    obj = _object_path(digest)
+    gz = obj.with_name(obj.name + ".gz")
+    tmp = path.with_name(f".{path.name}.veil-tmp")
+    if obj.exists():
+        if not _reflink(obj, tmp):
+            shutil.copyfile(obj, tmp)
+    elif gz.exists():
+        with gzip.open(gz, "rb") as src, tmp.open("wb") as dst:
+            shutil.copyfileobj(src, dst, HASH_CHUNK_SIZE)
+    else:
+        raise FileNotFoundError(f"Missing backup object {digest} for {path}")
+
+    if file_hash(tmp) != digest:
+        tmp.unlink()
+        raise ValueError(f"Backup object {digest} is corrupt; not restoring {path}")
+    if mode is not None:
+        os.chmod(tmp, stat.S_IMODE(mode))
+    if uid is not None and hasattr(os, "chown"):
+        try:
+            os.chown(tmp, uid, gid)
+        except PermissionError:
+            pass
+    os.replace(tmp, path)
+
+def _restore(path: Path, digest, entry: dict = None):
+    if digest is None:
+        path.unlink(missing_ok=True)
+        log(f"[ROLLBACK] Removed {path}")
+    else:
+        entry = entry or {}
+        restore_backup(digest, path, entry.get("mode"), entry.get("uid"), entry.get("gid"))
+        log(f"[ROLLBACK] Restored {path} from objects/{digest[:12]}")
 
 def rollback_all():
-    for bak in PROJECT_ROOT.rglob("*.bak"):
-        original = bak.with_suffix("")
-        shutil.copy2(bak, original)
-        log(f"[ROLLBACK] Restored {original} from {bak}")
+    """
+    Undo every journaled hardening run, newest first.
+
+    Only the files each run's journal lists are touched. Trees hardened
+    before journals existed fall back to restoring every *.bak file.
+    """
+    journals = [
+        (path, entries) for path, entries in _read_journals()
+        if not any(e["op"] == "rollback" for e in entries)
+    ]
+    if not journals and not JOURNAL_DIR.exists():
+        for bak in PROJECT_ROOT.rglob("*.bak"):
+            original = bak.with_suffix("")
+            shutil.copy2(bak, original)
+            log(f"[ROLLBACK] Restored {original} from {bak}")
+        return
+
+    for journal, entries in reversed(journals):
+        _undo_journal(journal, entries, "rollback")
+
+def rollback_run(run_id: str):
+    """Restore the files changed by a single run to their state before it."""
+    journal = JOURNAL_DIR / f"{run_id}.jsonl"
+    for path, entries in _read_journals():
+        if path == journal:
+            _undo_journal(journal, entries, "rollback")
+            return
+    raise FileNotFoundError(f"No journal for run {run_id}")
+
+# ─────────────────────────────────────────────
+# Write Transactions
+# ─────────────────────────────────────────────
+# Every write goes to a temp file in the target directory and is moved
+# into place with os.replace, so a killed run never leaves a half-written
+# file. Each run appends to .veil/journal/<run_id>.jsonl before touching a
+# file; fsyncs are deferred to commit and issued once per directory.
+# A journal without a commit record marks an interrupted run.
+
+class WriteTransaction:
+    def __init__(self, run_id: str = None, compress: bool = False):
+        self.run_id = run_id or datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+        self.compress = compress
+        self.journal_path = JOURNAL_DIR / f"{self.run_id}.jsonl"
+        self.changed = []
+        self._lock = threading.Lock()
+        self._journal = None
+
+    def __enter__(self):
+        JOURNAL_DIR.mkdir(parents=True, exist_ok=True)
+        self._journal = self.journal_path.open("a", encoding="utf-8")
+        self._record({"op": "begin", "run_id": self.run_id})
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self._journal.close()
+        return False
+
+    def _record(self, entry: dict):
+        self._journal.write(json.dumps(entry, sort_keys=True) + "\n")
+        self._journal.flush()
+
+    def _journal_write(self, path: Path):
+        # The journal entry doubles as the run's backup index.
+        digest = store_backup(path, compress=self.compress)
+        entry = {"op": "write", "path": str(path), "object": digest}
+        if digest is not None:
+            st = os.stat(path)
+            entry.update(mode=st.st_mode, uid=st.st_uid, gid=st.st_gid)
+        with self._lock:
+            self._record(entry)
+            self.changed.append(path)
+
+    def write_text(self, path: Path, text: str):
+        self._journal_write(path)
+        atomic_write_text(path, text)
+
+    def prepend(self, path: Path, prefix: bytes):
+        self._journal_write(path)
+        atomic_prepend(path, prefix)
+
+    def replace(self, path: Path, tmp: Path):
+        self._journal_write(path)
+        atomic_replace(path, tmp)
+
+    def commit(self):
+        by_dir = {}
+        for path in self.changed:
+            by_dir.setdefault(path.parent, []).append(path)
+        for directory, paths in sorted(by_dir.items()):
+            for path in paths:
+                _fsync_path(path, os.O_RDONLY)
+            _fsync_path(directory, os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+
+        self._record({"op": "commit", "files": len(self.changed)})
+        os.fsync(self._journal.fileno())
+        self._journal.close()
+        if not self.changed:
+            # Nothing to roll back; keep the journal directory small.
+            self.journal_path.unlink()
+
+def _fsync_path(path: Path, flags: int):
+    try:
+        fd = os.open(path, flags)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+def _copy_owner_and_mode(path: Path, tmp: Path):
+    """Give tmp the mode and owner of the file it is about to replace."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return
+    shutil.copymode(path, tmp)
+    if hasattr(os, "chown"):
+        try:
+            os.chown(tmp, st.st_uid, st.st_gid)
+        except PermissionError:
+            # Only root may give a file away; keep at least the mode.
+            pass
+
+def _tmp_path(path: Path) -> Path:
+    return path.with_name(f".{path.name}.veil-tmp")
+
+def atomic_replace(path: Path, tmp: Path):
+    """Move a fully written tmp over path, keeping path's mode and owner."""
+    _copy_owner_and_mode(path, tmp)
+    os.replace(tmp, path)
+
+def atomic_write_text(path: Path, text: str):
+    tmp = _tmp_path(path)
+    with tmp.open("w", encoding="utf-8") as f:
+        f.write(text)
+    atomic_replace(path, tmp)
+
+def _splice(src, dst, count: int):
+    """
+    Copy count bytes from src to dst at their current offsets, in the
+    kernel via copy_file_range or sendfile when available.
+    """
+    remaining = count
+    for copy in (
+        getattr(os, "copy_file_range", None),
+        lambda s, d, n: os.sendfile(d, s, None, n),
+    ):
+        if copy is None:
+            continue
+        try:
+            while remaining > 0:
+                n = copy(src.fileno(), dst.fileno(), remaining)
+                if n == 0:
+                    return
+                remaining -= n
+            return
+        except OSError:
+            continue
+    shutil.copyfileobj(src, dst, HASH_CHUNK_SIZE)
+
+def atomic_prepend(path: Path, prefix: bytes):
+    """Write prefix + the current content of path without reading it into memory."""
+    tmp = _tmp_path(path)
+    with path.open("rb", buffering=0) as src, tmp.open("wb", buffering=0) as dst:
+        dst.write(prefix)
+        _splice(src, dst, os.fstat(src.fileno()).st_size)
+    atomic_replace(path, tmp)
+
+def write_text(path: Path, text: str, txn=None):
+    if txn is not None:
+        txn.write_text(path, text)
+    else:
+        store_backup(path)
+        atomic_write_text(path, text)
+
+def prepend_file(path: Path, prefix: bytes, txn=None):
+    if txn is not None:
+        txn.prepend(path, prefix)
+    else:
+        store_backup(path)
+        atomic_prepend(path, prefix)
+
+def replace_file(path: Path, tmp: Path, txn=None):
+    if txn is not None:
+        txn.replace(path, tmp)
+    else:
+        store_backup(path)
+        atomic_replace(path, tmp)
+
+def _read_journals():
+    if not JOURNAL_DIR.exists():
+        return []
+    journals = []
+    for path in sorted(JOURNAL_DIR.glob("*.jsonl")):
+        entries = []
+        for line in path.read_text(encoding="utf-8").splitlines():
+            if not line.strip():
+                continue
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                # Torn line from a killed run.
+                continue
+        journals.append((path, entries))
+    return journals
+
+def _undo_journal(journal: Path, entries, op: str):
+    # A file written twice in one run is restored to its first pre-image.
+    first_writes = {}
+    for entry in entries:
+        if entry["op"] == "write":
+            first_writes.setdefault(entry["path"], entry)
+    for entry in reversed(list(first_writes.values())):
+        path = Path(entry["path"])
+        if entry.get("backup"):
+            # Journals written before the object store referenced .bak files.
+            shutil.copy2(entry["backup"], path)
+            log(f"[ROLLBACK] Restored {path} from {entry['backup']}")
+        else:
+            _restore(path, entry.get("object"), entry)
+    with journal.open("a", encoding="utf-8") as f:
+        # Leading newline terminates a torn last line, if any.
+        f.write("\n" + json.dumps({"op": op}, sort_keys=True) + "\n")
+
+def recover_interrupted_runs():
+    """
+    Roll back runs whose journal has no commit record.
+
+    Cost is proportional to the files those runs touched.
+    """
+    for journal, entries in _read_journals():
+        ops = {e["op"] for e in entries}
+        if ops & {"commit", "recovered", "rollback"}:
+            continue
+        log(f"[RECOVER] Rolling back interrupted run {journal.stem}")
+        _undo_journal(journal, entries, "recovered")
 
 # ─────────────────────────────────────────────
 # Diff
 # ─────────────────────────────────────────────
 
-def show_diff(old: str, new: str, path: Path):
-    diff = difflib.unified_diff(
-        old.splitlines(),
-        new.splitlines(),
-        fromfile=str(path),
-        tofile=str(path),
-        lineterm=""
+# Myers O(ND) diff over interned lines, after trimming the common prefix
+# and suffix (which covers banner prepends and small edits). When the
+# remaining region exceeds DIFF_MAX_LINES or needs more than DIFF_MAX_EDITS
+# edits only a summary is printed. The whole diff is written with a single
+# emit() call.
+
+DIFF_MODES = ("full", "stat", "none")
+DIFF_MODE = "full"
+DIFF_CONTEXT = 3
+DIFF_MAX_LINES = 20000
+DIFF_MAX_EDITS = 1000
+
+def _myers_edits(a, b, max_edits: int):
+    """
+    Return the shortest edit script between a and b as a list of
+    ("=", "-", "+") tags, or None if it needs more than max_edits edits.
+    """
+    n, m = len(a), len(b)
+    offset = max_edits + 1
+    v = [0] * (2 * offset + 1)
+    trace = []
+    for d in range(min(n + m, max_edits) + 1):
+        trace.append(v[offset - d:offset + d + 1])
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and v[offset + k - 1] < v[offset + k + 1]):
+                x = v[offset + k + 1]
+            else:
+                x = v[offset + k - 1] + 1
+            y = x - k
+            while x < n and y < m and a[x] == b[y]:
+                x += 1
+                y += 1
+            v[offset + k] = x
+            if x >= n and y >= m:
+                return _myers_backtrack(trace, n, m)
+    return None
+
+def _myers_backtrack(trace, x: int, y: int):
+    tags = []
+    for d in range(len(trace) - 1, 0, -1):
+        prev = trace[d]
+        k = x - y
+        # prev holds diagonals -d..d of the previous round at index k + d.
+        if k == -d or (k != d and prev[k - 1 + d] < prev[k + 1 + d]):
+            prev_k = k + 1
+        else:
+            prev_k = k - 1
+        prev_x = prev[prev_k + d]
+        prev_y = prev_x - prev_k
+        while x > prev_x and y > prev_y:
+            tags.append("=")
+            x -= 1
+            y -= 1
+        tags.append("+" if x == prev_x else "-")
+        x, y = prev_x, prev_y
+    tags.extend("=" * x)
+    tags.reverse()
+    return tags
+
+def diff_opcodes(a, b, max_edits: int = DIFF_MAX_EDITS, max_lines: int = DIFF_MAX_LINES):
+    """
+    SequenceMatcher-style opcodes for two line lists, or None when the
+    differing region exceeds max_lines or the edit distance max_edits.
+    """
+    prefix = 0
+    limit = min(len(a), len(b))
+    while prefix < limit and a[prefix] == b[prefix]:
+        prefix += 1
+    suffix = 0
+    limit -= prefix
+    while suffix < limit and a[-1 - suffix] == b[-1 - suffix]:
+        suffix += 1
+    a_mid = a[prefix:len(a) - suffix]
+    b_mid = b[prefix:len(b) - suffix]
+    if len(a_mid) + len(b_mid) > max_lines or abs(len(a_mid) - len(b_mid)) > max_edits:
+        return None
+
+    # Intern lines so comparisons in the inner loop are int compares.
+    ids = {}
+    tags = _myers_edits(
+        [ids.setdefault(line, len(ids)) for line in a_mid],
+        [ids.setdefault(line, len(ids)) for line in b_mid],
+        max_edits,
     )
-    for line in diff:
-        print(line)
+    if tags is None:
+        return None
+
+    opcodes = []
+    i = j = prefix
+    if prefix:
+        opcodes.append(("equal", 0, prefix, 0, prefix))
+    pos = 0
+    while pos < len(tags):
+        i1, j1 = i, j
+        if tags[pos] == "=":
+            while pos < len(tags) and tags[pos] == "=":
+                i, j, pos = i + 1, j + 1, pos + 1
+            opcodes.append(("equal", i1, i, j1, j))
+            continue
+        while pos < len(tags) and tags[pos] != "=":
+            if tags[pos] == "-":
+                i += 1
+            else:
+                j += 1
+            pos += 1
+        tag = "replace" if i > i1 and j > j1 else ("delete" if i > i1 else "insert")
+        opcodes.append((tag, i1, i, j1, j))
+    if suffix:
+        opcodes.append(("equal", i, i + suffix, j, j + suffix))
+    return opcodes
+
+def _group_opcodes(opcodes, n: int):
+    """Split opcodes into hunks with n lines of context (as difflib does)."""
+    if not opcodes:
+        return
+    if opcodes[0][0] == "equal":
+        tag, i1, i2, j1, j2 = opcodes[0]
+        opcodes[0] = tag, max(i1, i2 - n), i2, max(j1, j2 - n), j2
+    if opcodes[-1][0] == "equal":
+        tag, i1, i2, j1, j2 = opcodes[-1]
+        opcodes[-1] = tag, i1, min(i2, i1 + n), j1, min(j2, j1 + n)
+
+    group = []
+    for tag, i1, i2, j1, j2 in opcodes:
+        if tag == "equal" and i2 - i1 > 2 * n:
+            group.append((tag, i1, min(i2, i1 + n), j1, min(j2, j1 + n)))
+            yield group
+            group = []
+            i1, j1 = max(i1, i2 - n), max(j1, j2 - n)
+        group.append((tag, i1, i2, j1, j2))
+    if group and not (len(group) == 1 and group[0][0] == "equal"):
+        yield group
+
+def _format_range(start: int, stop: int) -> str:
+    beginning = start + 1
+    length = stop - start
+    if length == 1:
+        return str(beginning)
+    if not length:
+        beginning -= 1
+    return f"{beginning},{length}"
+
+def show_diff(old: str, new: str, path: Path, mode: str = None):
+    mode = mode or DIFF_MODE
+    if mode == "none":
+        return
+
+    a = old.splitlines()
+    b = new.splitlines()
+    opcodes = diff_opcodes(a, b)
+    if opcodes is None:
+        emit(f"{path}: {len(a)} → {len(b)} lines (diff above threshold; summary only)")
+        return
+
+    if mode == "stat":
+        removed = sum(i2 - i1 for tag, i1, i2, _, _ in opcodes if tag != "equal")
+        added = sum(j2 - j1 for tag, _, _, j1, j2 in opcodes if tag != "equal")
+        emit(f"{path} | +{added} -{removed}")
+        return
+
+    out = []
+    for group in _group_opcodes(opcodes, DIFF_CONTEXT):
+        if not out:
+            out.append(f"--- {path}")
+            out.append(f"+++ {path}")
+        first, last = group[0], group[-1]
+        out.append(
+            f"@@ -{_format_range(first[1], last[2])} +{_format_range(first[3], last[4])} @@"
+        )
+        for tag, i1, i2, j1, j2 in group:
+            if tag == "equal":
+                out.extend(" " + line for line in a[i1:i2])
+                continue
+            out.extend("-" + line for line in a[i1:i2])
+            out.extend("+" + line for line in b[j1:j2])
+    if out:
+        emit("\n".join(out))
 
 # ─────────────────────────────────────────────
 # Template Loader
@@ -96,28 +1006,125 @@ def load_template(template_rel: str) -> str:
         raise FileNotFoundError(f"Missing template: {template_path}")
     return template_path.read_text(encoding="utf-8")
 
+# ─────────────────────────────────────────────
+# Compiled Template Bundle
+# ─────────────────────────────────────────────
+# `--compile-templates` writes template_bundle.json next to this module:
+# banner + template content and its sha256 for every entry in
+# FILES_FROM_TEMPLATES. It is a local build artifact, not shipped in the
+# package; without it templates are rendered from source. An entry is used
+# while the on-disk template (if present) still has the recorded size and
+# mtime.
+
+TEMPLATE_BUNDLE_NAME = "template_bundle.json"
+TEMPLATE_BUNDLE_VERSION = 1
+
+_rendered = {}
+
+def compile_template_bundle(path: Path = None) -> Path:
+    templates = {}
+    for _, template_rel in sorted(FILES_FROM_TEMPLATES):
+        content = HARDENED_BANNER + load_template(template_rel)
+        st = (TEMPLATE_ROOT / template_rel).stat()
+        templates[template_rel] = {
+            "content": content,
+            "sha256": text_hash(content),
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+        }
+
+    bundle = {
+        "version": TEMPLATE_BUNDLE_VERSION,
+        "banner_sha256": BANNER_SOURCE,
+        "templates": templates,
+    }
+    path = path or PROJECT_ROOT / TEMPLATE_BUNDLE_NAME
+    atomic_write_text(path, json.dumps(bundle, indent=2, sort_keys=True))
+    load_template_bundle.cache_clear()
+    _rendered.clear()
+    return path
+
+@functools.lru_cache(maxsize=None)
+def load_template_bundle() -> dict:
+    """Return the bundle's {template_rel: entry} map, or {} if unusable."""
+    try:
+        if __package__:
+            resource = importlib.resources.files(__package__) / TEMPLATE_BUNDLE_NAME
+        else:
+            resource = PROJECT_ROOT / TEMPLATE_BUNDLE_NAME
+        bundle = json.loads(resource.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if (
+        bundle.get("version") != TEMPLATE_BUNDLE_VERSION
+        or bundle.get("banner_sha256") != BANNER_SOURCE
+    ):
+        return {}
+    return bundle["templates"]
+
+def _fresh_bundle_entry(template_rel: str):
+    # A bundle compiled with --compile-templates is used while its size and
+    # mtime still match the template source; a changed source is rendered
+    # from disk instead. Without a source, the compiled entry is all there
+    # is to render from.
+    entry = load_template_bundle().get(template_rel)
+    if entry is None:
+        return None
+    try:
+        st = (TEMPLATE_ROOT / template_rel).stat()
+    except FileNotFoundError:
+        return entry
+    if st.st_size != entry["size"] or st.st_mtime_ns != entry["mtime_ns"]:
+        return None
+    return entry
+
+def rendered_template(template_rel: str):
+    """Return (banner + template, sha256), built at most once per process."""
+    cached = _rendered.get(template_rel)
+    if cached is not None:
+        return cached
+    entry = _fresh_bundle_entry(template_rel)
+    if entry is not None:
+        cached = (entry["content"], entry["sha256"])
+    else:
+        content = HARDENED_BANNER + load_template(template_rel)
+        cached = (content, text_hash(content))
+    _rendered[template_rel] = cached
+    return cached
+
+def invalidate_template(template_rel: str):
+    """Forget the rendered copy of a template that changed on disk."""
+    _rendered.pop(template_rel, None)
+
+def template_available(template_rel: str) -> bool:
+    return template_rel in load_template_bundle() or (TEMPLATE_ROOT / template_rel).exists()
+
 # ─────────────────────────────────────────────
 # Harden from Template
 # ─────────────────────────────────────────────
 
-def write_hardened_from_template(repo_rel: str, template_rel: str, dry_run=False):
+def write_hardened_from_template(repo_rel: str, template_rel: str, dry_run=False, manifest=None, index=None, txn=None):
     out_path = PROJECT_ROOT / repo_rel
-    content = load_template(template_rel)
-
-    banner = (
-        "# 🔱 Auto‑generated by Veil Sentinel Hardener\n"
-        "# Do not edit manually — changes will be overwritten.\n\n"
-    )
-    final = banner + content
 
-    out_path.parent.mkdir(parents=True, exist_ok=True)
+    source = rendered_template_hash(template_rel, manifest)
+    if manifest is not None and manifest_is_current(manifest, out_path, "template", source, index):
+        log(f"[SKIP] {repo_rel}: no changes")
+        return
 
-    old_content = out_path.read_text(encoding="utf-8") if out_path.exists() else ""
+    exists = index.exists(out_path) if index is not None else out_path.exists()
 
-    if old_content == final:
+    if exists and file_hash(out_path) == source:
         log(f"[SKIP] {repo_rel}: no changes")
+        if manifest is not None:
+            manifest_record(manifest, out_path, "template", source, source)
         return
 
+    final, _ = rendered_template(template_rel)
+
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+
+    old_content = out_path.read_text(encoding="utf-8") if exists else ""
+
     log(f"[DIFF] {repo_rel}")
     show_diff(old_content, final, out_path)
 
@@ -125,101 +1132,304 @@ def write_hardened_from_template(repo_rel: str, template_rel: str, dry_run=False
         log(f"[DRY‑RUN] Would write {out_path}")
         return
 
-    backup_once(out_path)
-    out_path.write_text(final, encoding="utf-8")
+    write_text(out_path, final, txn)
     log(f"[WRITE] {repo_rel}: {out_path}")
+    if index is not None:
+        index.add_file(out_path)
+    if manifest is not None:
+        manifest_record(manifest, out_path, "template", source, source)
+
+def harden_from_templates(dry_run=False, manifest=None, index=None, jobs: int = 1, txn=None):
+    run_per_file(
+        FILES_FROM_TEMPLATES,
+        lambda pair: write_hardened_from_template(
+            *pair, dry_run=dry_run, manifest=manifest, index=index, txn=txn
+        ),
+        jobs,
+    )
 
 # ─────────────────────────────────────────────
 # Harden entire /docs directory
 # ─────────────────────────────────────────────
+# Files are classified from their first block only: a NUL byte or invalid
+# UTF-8 marks them binary. Already-hardened files are recognised from that
+# block too. Files above DOCS_INLINE_LIMIT bytes are streamed through the
+# transforms into a temp file and are never loaded into memory; a
+# banner-only pass copies the body behind the banner in the kernel.
+
+SNIFF_BLOCK = 8192
+DOCS_INLINE_LIMIT = 4 * 1024 * 1024
+BANNER_BYTES = HARDENED_BANNER.encode("utf-8")
+
+def sniff_file(path: Path):
+    """Return ("text" | "binary", first block of bytes)."""
+    with path.open("rb") as f:
+        head = f.read(max(SNIFF_BLOCK, len(BANNER_BYTES)))
+    if b"\0" in head:
+        return "binary", head
+    try:
+        # final=False tolerates a multi-byte sequence cut at the block edge.
+        codecs.getincrementaldecoder("utf-8")().decode(head, final=False)
+    except UnicodeDecodeError:
+        return "binary", head
+    return "text", head
 
-def harden_docs_folder(docs_root: Path, dry_run=False):
-    banner = (
-        "# 🔱 Auto‑generated by Veil Sentinel Hardener\n"
-        "# Do not edit manually — changes will be overwritten.\n\n"
+
+# ─────────────────────────────────────────────
+# Docs Transform Pipeline
+# ─────────────────────────────────────────────
+# Each docs file is read once, run through an ordered chain of text
+# transforms (banner, language rules, then any registered plugins),
+# diffed once and written once. The manifest records a single "docs"
+# source per file: the hash of the transforms that apply to it.
+
+DOCS_SKIP_SUFFIXES = {
+    ".png", ".jpg", ".jpeg", ".gif", ".ico",
+    ".svg", ".ttf", ".woff", ".woff2"
+}
+
+class DocsTransform:
+    """
+    A named text → text step in the docs pipeline.
+
+    Args:
+        name: Label used in logs and in the manifest source hash.
+        apply: Callable taking and returning the full file text.
+        source: Hash of whatever drives the transform; changing it
+            invalidates files recorded in the manifest.
+        suffixes: Only apply to files with these suffixes (all if None).
+        stream: Optional callable taking and returning an iterable of text
+            chunks, equivalent to apply. Files above DOCS_INLINE_LIMIT are
+            only streamed when every transform in their chain has one.
+    """
+
+    def __init__(self, name: str, apply, source: str, suffixes=None, stream=None):
+        self.name = name
+        self.apply = apply
+        self.source = source
+        self.suffixes = suffixes
+        self.stream = stream
+
+    def applies_to(self, path: Path) -> bool:
+        return self.suffixes is None or path.suffix.lower() in self.suffixes
+
+DOCS_PLUGINS = []
+
+def register_docs_transform(transform: DocsTransform):
+    """Append a transform to the docs pipeline, after the built-in ones."""
+    DOCS_PLUGINS.append(transform)
+
+def add_banner(text: str) -> str:
+    if text.startswith(HARDENED_BANNER):
+        return text
+    return HARDENED_BANNER + text
+
+def add_banner_chunks(chunks):
+    """Streaming add_banner: only the first len(HARDENED_BANNER) characters are buffered."""
+    chunks = iter(chunks)
+    head = ""
+    for chunk in chunks:
+        head += chunk
+        if len(head) >= len(HARDENED_BANNER):
+            break
+    yield add_banner(head)
+    yield from chunks
+
+def docs_transforms():
+    """The docs pipeline for this run, in the order it is applied."""
+    return [
+        DocsTransform("banner", add_banner, BANNER_SOURCE, stream=add_banner_chunks),
+        DocsTransform(
+            "language", LANGUAGE_ENGINE.rewrite, LANGUAGE_SOURCE,
+            suffixes={".md"}, stream=LANGUAGE_ENGINE.rewrite_chunks,
+        ),
+        *DOCS_PLUGINS,
+    ]
+
+def harden_docs(docs_root: Path, dry_run=False, manifest=None, index=None, jobs: int = 1, txn=None, transforms=None):
+    index = index or build_tree_index([docs_root])
+    if transforms is None:
+        transforms = docs_transforms()
+    run_per_file(
+        index.files(docs_root),
+        lambda path: _harden_docs_file(path, transforms, dry_run, manifest, index, txn),
+        jobs,
     )
 
-    for path in docs_root.rglob("*"):
-        if path.is_dir():
-            continue
-        if path.suffix == ".bak":
-            continue
-        if path.suffix.lower() in [
-            ".png", ".jpg", ".jpeg", ".gif", ".ico",
-            ".svg", ".ttf", ".woff", ".woff2"
-        ]:
-            continue
+def harden_docs_folder(docs_root: Path, dry_run=False, manifest=None, index=None, jobs: int = 1, txn=None):
+    """Banner-only pass over the docs tree."""
+    transforms = [t for t in docs_transforms() if t.name == "banner"]
+    harden_docs(docs_root, dry_run, manifest, index, jobs, txn, transforms=transforms)
 
-        try:
-            old_content = path.read_text(encoding="utf-8")
-        except Exception:
-            log(f"[SKIP] Binary or unreadable file: {path}")
-            continue
+def harden_docs_language(docs_root: Path, dry_run=False, manifest=None, index=None, jobs: int = 1, txn=None):
+    """Language-only pass over the docs tree."""
+    transforms = [t for t in docs_transforms() if t.name == "language"]
+    harden_docs(docs_root, dry_run, manifest, index, jobs, txn, transforms=transforms)
 
-        new_content = banner + old_content
+def _harden_docs_file(path: Path, transforms, dry_run, manifest, index, txn):
+    if path.suffix == ".bak" or path.suffix.lower() in DOCS_SKIP_SUFFIXES:
+        return
 
-        if old_content == new_content:
-            log(f"[SKIP] {path}: already hardened")
-            continue
+    chain = [t for t in transforms if t.applies_to(path)]
+    if not chain:
+        return
+    source = text_hash("\n".join(f"{t.name}:{t.source}" for t in chain))
 
-        log(f"[DIFF] Hardening {path}")
-        show_diff(old_content, new_content, path)
+    if manifest is not None and manifest_is_current(manifest, path, "docs", source, index):
+        log(f"[SKIP] {path}: already hardened")
+        return
 
-        if dry_run:
-            log(f"[DRY‑RUN] Would harden {path}")
-            continue
+    try:
+        kind, head = sniff_file(path)
+    except OSError:
+        kind = "binary"
+    if kind == "binary":
+        log(f"[SKIP] Binary or unreadable file: {path}")
+        return
 
-        backup_once(path)
-        path.write_text(new_content, encoding="utf-8")
-        log(f"[WRITE] Hardened {path}")
+    # A banner-only chain can be decided from the first block.
+    banner_only = [t.name for t in chain] == ["banner"]
+    if banner_only and head.startswith(BANNER_BYTES):
+        log(f"[SKIP] {path}: already hardened")
+        if manifest is not None:
+            manifest_record(manifest, path, "docs", source, file_hash(path))
+        return
 
-# ─────────────────────────────────────────────
-# Docs Language Hardener (Updater → Hardener)
-# ─────────────────────────────────────────────
+    st = index.stat(path)
+    if st is not None and st.st_size > DOCS_INLINE_LIMIT and all(t.stream for t in chain):
+        if banner_only:
+            _harden_large_docs_file(path, st.st_size, source, dry_run, manifest, index, txn)
+        else:
+            _stream_docs_file(path, st.st_size, chain, source, dry_run, manifest, index, txn)
+        return
 
-def harden_docs_language(docs_root: Path, dry_run=False):
-    for path in docs_root.rglob("*.md"):
-        old = path.read_text(encoding="utf-8")
-        new = old.replace("Updater", "Hardener")
+    try:
+        old_content = path.read_text(encoding="utf-8")
+    except (OSError, UnicodeDecodeError):
+        log(f"[SKIP] Binary or unreadable file: {path}")
+        return
 
-        if old == new:
-            continue
+    new_content = old_content
+    applied = []
+    for transform in chain:
+        out = transform.apply(new_content)
+        if out != new_content:
+            applied.append(transform.name)
+            new_content = out
+
+    if not applied:
+        log(f"[SKIP] {path}: already hardened")
+        if manifest is not None:
+            manifest_record(manifest, path, "docs", source, text_hash(old_content))
+        return
 
-        log(f"[DIFF] Language update in {path}")
-        show_diff(old, new, path)
+    log(f"[DIFF] Hardening {path} ({', '.join(applied)})")
+    show_diff(old_content, new_content, path)
 
-        if dry_run:
-            log(f"[DRY‑RUN] Would update language in {path}")
-            continue
+    if dry_run:
+        log(f"[DRY‑RUN] Would harden {path}")
+        return
 
-        backup_once(path)
-        path.write_text(new, encoding="utf-8")
-        log(f"[WRITE] Updated language in {path}")
+    write_text(path, new_content, txn)
+    index.invalidate(path)
+    log(f"[WRITE] Hardened {path}")
+    if manifest is not None:
+        manifest_record(manifest, path, "docs", source, text_hash(new_content))
+
+def _harden_large_docs_file(path: Path, size: int, source: str, dry_run, manifest, index, txn):
+    log(f"[DIFF] Hardening {path} (banner)")
+    if DIFF_MODE != "none":
+        emit(f"{path}: +{HARDENED_BANNER.count(chr(10))} banner lines before {size} bytes (streamed)")
+
+    if dry_run:
+        log(f"[DRY‑RUN] Would harden {path}")
+        return
+
+    prepend_file(path, BANNER_BYTES, txn)
+    index.invalidate(path)
+    log(f"[WRITE] Hardened {path}")
+    if manifest is not None:
+        manifest_record(manifest, path, "docs", source, file_hash(path))
+
+def _stream_docs_file(path: Path, size: int, chain, source: str, dry_run, manifest, index, txn):
+    """Run a large file through the chain's stream transforms chunk by chunk."""
+    old_hash, new_hash = hashlib.sha256(), hashlib.sha256()
+    new_size = 0
+    tmp = None if dry_run else _tmp_path(path)
+    try:
+        # newline="" keeps line endings byte for byte.
+        with path.open("r", encoding="utf-8", newline="") as src, \
+                (tmp.open("wb") if tmp is not None else open(os.devnull, "wb")) as dst:
+            def read():
+                for chunk in iter(lambda: src.read(HASH_CHUNK_SIZE), ""):
+                    old_hash.update(chunk.encode("utf-8"))
+                    yield chunk
+
+            chunks = read()
+            for transform in chain:
+                chunks = transform.stream(chunks)
+            for chunk in chunks:
+                data = chunk.encode("utf-8")
+                new_hash.update(data)
+                new_size += len(data)
+                dst.write(data)
+    except (OSError, UnicodeDecodeError):
+        if tmp is not None:
+            tmp.unlink(missing_ok=True)
+        log(f"[SKIP] Binary or unreadable file: {path}")
+        return
+
+    if new_hash.digest() == old_hash.digest():
+        if tmp is not None:
+            tmp.unlink()
+        log(f"[SKIP] {path}: already hardened")
+        if manifest is not None:
+            manifest_record(manifest, path, "docs", source, new_hash.hexdigest())
+        return
+
+    log(f"[DIFF] Hardening {path} ({', '.join(t.name for t in chain)})")
+    if DIFF_MODE != "none":
+        emit(f"{path}: {size} -> {new_size} bytes (streamed)")
+
+    if dry_run:
+        log(f"[DRY‑RUN] Would harden {path}")
+        return
+
+    replace_file(path, tmp, txn)
+    index.invalidate(path)
+    log(f"[WRITE] Hardened {path}")
+    if manifest is not None:
+        manifest_record(manifest, path, "docs", source, new_hash.hexdigest())
 
 # ─────────────────────────────────────────────
 # Recursive __init__.py creation
 # ─────────────────────────────────────────────
 
-def ensure_init_recursive(root: Path, dry_run=False):
-    for dirpath, dirnames, filenames in os.walk(root):
-        dirpath = Path(dirpath)
+def ensure_init_recursive(root: Path, dry_run=False, index=None, jobs: int = 1, txn=None):
+    index = index or build_tree_index([root])
+    run_per_file(
+        list(index.walk_dirs(root)),
+        lambda dirpath: _ensure_init(dirpath, dry_run, index, txn),
+        jobs,
+    )
 
-        if dirpath.name.startswith(".") or dirpath.name == "__pycache__":
-            continue
+def _ensure_init(dirpath: Path, dry_run, index, txn):
+    if dirpath.name.startswith(".") or dirpath.name == "__pycache__":
+        return
 
-        init_path = dirpath / "__init__.py"
+    init_path = dirpath / "__init__.py"
 
-        if init_path.exists():
-            backup_once(init_path)
-            continue
+    if index.exists(init_path):
+        return
 
-        content = f'"""Hardened package initializer for {dirpath.name}."""\n'
+    content = f'"""Hardened package initializer for {dirpath.name}."""\n'
 
-        if dry_run:
-            log(f"[DRY‑RUN] Would create {init_path}")
-        else:
-            init_path.write_text(content, encoding="utf-8")
-            log(f"[INIT] Created {init_path}")
+    if dry_run:
+        log(f"[DRY‑RUN] Would create {init_path}")
+    else:
+        write_text(init_path, content, txn)
+        index.add_file(init_path)
+        log(f"[INIT] Created {init_path}")
 
 # ─────────────────────────────────────────────
 # Canonical Drift Detector
@@ -230,81 +1440,410 @@ CANONICAL_ZONES = [
     PROJECT_ROOT / "infra",
 ]
 
-def detect_drift(dry_run: bool = False):
-    log("── Drift Detector: Scanning for canonical mismatches")
+DRIFT_REASONS = ("missing", "modified", "undeclared")
+
+def scan_drift(index=None, jobs: int = 1) -> dict:
+    """
+    Scan the canonical zones once.
+
+    Returns:
+        dict: {repo_rel: "missing" | "modified" | "undeclared"} for every
+        drifted path, in sorted order.
+    """
+    index = index or build_tree_index(CANONICAL_ZONES)
+    drift = {}
 
     declared_canonicals = {Path(repo_rel) for repo_rel, _ in FILES_FROM_TEMPLATES}
 
     # 1. Missing canonical files
     for repo_rel, template_rel in FILES_FROM_TEMPLATES:
-        out_path = PROJECT_ROOT / repo_rel
-        if not out_path.exists():
-            log(f"[DRIFT] Missing canonical file: {out_path}")
-
-    # 2. Templates with no output file
-    for repo_rel, template_rel in FILES_FROM_TEMPLATES:
-        template_path = TEMPLATE_ROOT / template_rel
-        out_path = PROJECT_ROOT / repo_rel
-        if template_path.exists() and not out_path.exists():
-            log(f"[DRIFT] Template exists but output file missing: {repo_rel}")
+        if not index.exists(PROJECT_ROOT / repo_rel):
+            drift[repo_rel] = "missing"
+
+    # 2. Canonical files whose content no longer matches their template
+    present = {
+        PROJECT_ROOT / repo_rel: template_rel
+        for repo_rel, template_rel in FILES_FROM_TEMPLATES
+        if index.exists(PROJECT_ROOT / repo_rel) and template_available(template_rel)
+    }
+    for out_path, digest in hash_files(present, jobs=jobs).items():
+        if digest != rendered_template_hash(present[out_path]):
+            drift[out_path.relative_to(PROJECT_ROOT).as_posix()] = "modified"
 
     # 3. Undeclared files in canonical zones
     for zone in CANONICAL_ZONES:
-        if not zone.exists():
-            continue
-        for path in zone.rglob("*"):
-            if path.is_dir():
-                continue
+        for path in index.files(zone):
             if path.suffix == ".bak":
                 continue
-
             repo_rel = path.relative_to(PROJECT_ROOT)
-
             if repo_rel not in declared_canonicals:
-                log(f"[DRIFT] Undeclared file in canonical zone: {repo_rel}")
-                log("        → Consider templating this file or marking it non-canonical.")
+                drift[repo_rel.as_posix()] = "undeclared"
+
+    return dict(sorted(drift.items()))
+
+def drift_path_reason(path: Path):
+    """
+    Re-check one path inside a canonical zone without scanning the zone.
+    Ignore rules are the caller's business (see drift_watch).
+
+    Returns:
+        The drift reason for path, or None when it is clean.
+    """
+    template_rel = dict(FILES_FROM_TEMPLATES).get(path.relative_to(PROJECT_ROOT).as_posix())
+    if template_rel is not None:
+        if not path.is_file():
+            return "missing"
+        if template_available(template_rel) and file_hash(path) != rendered_template_hash(template_rel):
+            return "modified"
+        return None
+    if path.suffix == ".bak" or not path.is_file():
+        return None
+    if any(zone in path.parents for zone in CANONICAL_ZONES):
+        return "undeclared"
+    return None
+
+def log_drift(repo_rel: str, reason: str):
+    if reason == "missing":
+        log(f"[DRIFT] Missing canonical file: {PROJECT_ROOT / repo_rel}")
+        template_rel = dict(FILES_FROM_TEMPLATES).get(repo_rel)
+        if template_rel is not None and template_available(template_rel):
+            log(f"[DRIFT] Template exists but output file missing: {repo_rel}")
+    elif reason == "modified":
+        log(f"[DRIFT] Modified canonical file: {repo_rel}")
+    else:
+        log(f"[DRIFT] Undeclared file in canonical zone: {repo_rel}")
+        log("        → Consider templating this file or marking it non-canonical.")
+
+def save_drift_state(drift: dict):
+    """Publish the current drift set to .veil/drift.json."""
+    DRIFT_PATH.parent.mkdir(parents=True, exist_ok=True)
+    state = {"updated": datetime.now(timezone.utc).isoformat(), "drift": drift}
+    atomic_write_text(DRIFT_PATH, json.dumps(state, indent=2, sort_keys=True))
+
+def load_drift_state():
+    try:
+        return json.loads(DRIFT_PATH.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+def detect_drift(dry_run: bool = False, index=None, jobs: int = 1):
+    log("── Drift Detector: Scanning for canonical mismatches")
+
+    drift = scan_drift(index=index, jobs=jobs)
+    for reason in DRIFT_REASONS:
+        for repo_rel, found in drift.items():
+            if found == reason:
+                log_drift(repo_rel, reason)
+
+    if not dry_run:
+        save_drift_state(drift)
+    return drift
 
 # ─────────────────────────────────────────────
 # Main Hardening Flow
 # ─────────────────────────────────────────────
 
+def run_phases(docs_root: Path, dry, manifest, index, jobs, txn):
+    # Phase 1
+    log("── Phase 1: Ensuring package structure (__init__.py)")
+    ensure_init_recursive(PROJECT_ROOT / "app", dry_run=dry, index=index, jobs=jobs, txn=txn)
+    ensure_init_recursive(PROJECT_ROOT / "infra", dry_run=dry, index=index, jobs=jobs, txn=txn)
+
+    # Phase 2
+    log("── Phase 2: Hardening core files from templates")
+    harden_from_templates(dry_run=dry, manifest=manifest, index=index, jobs=jobs, txn=txn)
+
+    # Phase 3
+    log("── Phase 3: Hardening docs (banner, language Updater → Hardener)")
+    harden_docs(docs_root, dry_run=dry, manifest=manifest, index=index, jobs=jobs, txn=txn)
+
+    # Phase 4
+    log("── Phase 4: Drift Detection")
+    return detect_drift(dry_run=dry, index=index, jobs=jobs)
+
+def harden_project(dry=False, jobs: int = 1, incremental=False, compress_backups=False):
+    manifest = load_manifest() if incremental else None
+
+    log("🔱 Starting Veil Sentinel Hardening Pass")
+
+    if not dry:
+        recover_interrupted_runs()
+
+    docs_root = PROJECT_ROOT / "docs"
+    index = build_tree_index(CANONICAL_ZONES + [docs_root])
+
+    if dry:
+        drift = run_phases(docs_root, dry, manifest, index, jobs, txn=None)
+    else:
+        with WriteTransaction(compress=compress_backups) as txn:
+            drift = run_phases(docs_root, dry, manifest, index, jobs, txn=txn)
+            log(f"[COMMIT] Run {txn.run_id}: {len(txn.changed)} file(s) written")
+        if manifest is not None:
+            save_manifest(manifest)
+
+    log("🔱 Hardening complete")
+    return drift
+
+# ─────────────────────────────────────────────
+# Batch Hardening (many project roots)
+# ─────────────────────────────────────────────
+# Templates are rendered once in the parent and handed to each worker
+# process, which rebinds the per-target paths and hardens one root at a
+# time. Per-target console output is suppressed (it still goes to each
+# target's logs/hardener.log); the parent prints one summary line per
+# target.
+
+def bind_target(root: Path):
+    """Point every per-target path at another project root."""
+    global PROJECT_ROOT, LOG_PATH, MANIFEST_PATH, JOURNAL_DIR, OBJECT_DIR, DRIFT_PATH, CANONICAL_ZONES
+    PROJECT_ROOT = root
+    LOG_PATH = root / "logs" / "hardener.log"
+    MANIFEST_PATH = root / ".veil" / "manifest"
+    JOURNAL_DIR = root / ".veil" / "journal"
+    OBJECT_DIR = root / ".veil" / "objects"
+    DRIFT_PATH = root / ".veil" / "drift.json"
+    CANONICAL_ZONES = [root / "app", root / "infra"]
+
+def read_targets_file(path: Path):
+    targets = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if line and not line.startswith("#"):
+            targets.append(Path(line).expanduser())
+    return targets
+
+def _init_batch_worker(rendered: dict, diff_mode: str, inline_limit: int, language_rules):
+    global ECHO, DIFF_MODE, DOCS_INLINE_LIMIT
+    ECHO = False
+    DIFF_MODE = diff_mode
+    DOCS_INLINE_LIMIT = inline_limit
+    set_language_rules(language_rules)
+    _rendered.update(rendered)
+
+def harden_target(root: str, options: dict) -> dict:
+    root = Path(root).resolve()
+    bind_target(root)
+    for key in RUN_STATS:
+        RUN_STATS[key] = 0
+
+    summary = {"target": str(root), "ok": True}
+    try:
+        if not root.is_dir():
+            raise FileNotFoundError(f"Target is not a directory: {root}")
+        RUN_STATS["drifted"] = len(harden_project(**options))
+    except Exception as exc:
+        summary["ok"] = False
+        summary["error"] = f"{type(exc).__name__}: {exc}"
+    finally:
+        # Pool workers leave through os._exit, which skips atexit.
+        flush_logs()
+    summary.update(RUN_STATS)
+    return summary
+
+def run_batch(targets, options: dict, target_jobs: int = 1) -> list:
+    """Harden every target root on a process pool and return per-target summaries."""
+    rendered = {}
+    for _, template_rel in FILES_FROM_TEMPLATES:
+        if template_available(template_rel):
+            rendered[template_rel] = rendered_template(template_rel)
+
+    targets = sorted({str(Path(t).resolve()) for t in targets})
+    with ProcessPoolExecutor(
+        max_workers=max(1, min(target_jobs, len(targets))),
+        initializer=_init_batch_worker,
+        initargs=(rendered, DIFF_MODE, DOCS_INLINE_LIMIT, LANGUAGE_ENGINE.rules),
+    ) as pool:
+        return list(pool.map(harden_target, targets, [options] * len(targets)))
+
+def print_batch_summary(summaries):
+    totals = {"changed": 0, "skipped": 0, "drifted": 0}
+    for s in summaries:
+        status = "OK" if s["ok"] else "FAILED"
+        line = (
+            f"[BATCH] {status} {s['target']}: changed={s['changed']} "
+            f"skipped={s['skipped']} drifted={s['drifted']}"
+        )
+        if not s["ok"]:
+            line += f" error={s['error']}"
+        print(line)
+        for key in totals:
+            totals[key] += s[key]
+    failed = sum(not s["ok"] for s in summaries)
+    print(
+        f"[BATCH] {len(summaries)} target(s), {failed} failed: "
+        f"changed={totals['changed']} skipped={totals['skipped']} drifted={totals['drifted']}"
+    )
+
 def main():
+    global DIFF_MODE, DOCS_INLINE_LIMIT
+
     parser = argparse.ArgumentParser()
     parser.add_argument("--dry-run", action="store_true")
-    parser.add_argument("--rollback", action="store_true")
+    parser.add_argument(
+        "--rollback",
+        nargs="?",
+        const="all",
+        metavar="RUN_ID",
+        help="Undo every journaled run, or only RUN_ID.",
+    )
+    parser.add_argument(
+        "--compress-backups",
+        action="store_true",
+        help="gzip backup objects when they cannot be reflinked.",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Skip files whose stat and source hash match the manifest in .veil/manifest.",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Process files on N worker threads; output stays in sorted path order.",
+    )
+    parser.add_argument(
+        "--hash-tree",
+        type=Path,
+        metavar="ROOT",
+        help="Print a JSON path→digest map for every file under ROOT and exit.",
+    )
+    parser.add_argument(
+        "--compile-templates",
+        action="store_true",
+        help=f"Write {TEMPLATE_BUNDLE_NAME} (pre-bannered templates + digests) and exit.",
+    )
+    parser.add_argument(
+        "--diff",
+        choices=DIFF_MODES,
+        default="full",
+        help="Print full unified diffs, per-file +/- counts, or nothing.",
+    )
+    parser.add_argument(
+        "--max-inline-size",
+        type=int,
+        default=DOCS_INLINE_LIMIT,
+        metavar="BYTES",
+        help="Docs files larger than this are hardened by streaming instead of being read into memory.",
+    )
+    parser.add_argument(
+        "--hash-algorithm",
+        choices=sorted(HASH_ALGORITHMS),
+        default="sha256",
+    )
+    parser.add_argument(
+        "--target",
+        action="append",
+        type=Path,
+        default=[],
+        metavar="ROOT",
+        help="Harden ROOT instead of this checkout (repeatable; enables batch mode).",
+    )
+    parser.add_argument(
+        "--targets-file",
+        type=Path,
+        metavar="FILE",
+        help="Read batch target roots from FILE, one per line.",
+    )
+    parser.add_argument(
+        "--target-jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        metavar="N",
+        help="Harden up to N targets at once in batch mode.",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Scan the canonical zones once, then keep drift state current with inotify.",
+    )
+    parser.add_argument(
+        "--drift-status",
+        action="store_true",
+        help="Print the last recorded drift set from .veil/drift.json without rescanning.",
+    )
+    parser.add_argument(
+        "--rules",
+        type=Path,
+        metavar="FILE",
+        help="Load the docs language rewrite rules from a YAML file.",
+    )
     args = parser.parse_args()
 
-    if args.rollback:
+    if args.target or args.targets_file is not None:
+        # These act on this checkout and exit; they would silently ignore
+        # the batch targets.
+        exclusive = {
+            "--rollback": args.rollback is not None,
+            "--compile-templates": args.compile_templates,
+            "--drift-status": args.drift_status,
+            "--watch": args.watch,
+            "--hash-tree": args.hash_tree is not None,
+        }
+        for flag, given in exclusive.items():
+            if given:
+                parser.error(f"{flag} cannot be combined with --target/--targets-file")
+
+    if args.rollback == "all":
         rollback_all()
         return
+    if args.rollback:
+        rollback_run(args.rollback)
+        return
 
-    dry = args.dry_run
-
-    log("🔱 Starting Veil Sentinel Hardening Pass")
-
-    # Phase 1
-    log("── Phase 1: Ensuring package structure (__init__.py)")
-    ensure_init_recursive(PROJECT_ROOT / "app", dry_run=dry)
-    ensure_init_recursive(PROJECT_ROOT / "infra", dry_run=dry)
+    if args.compile_templates:
+        try:
+            path = compile_template_bundle()
+        except OSError as exc:
+            # Read-only install: runs keep rendering templates from source.
+            log(f"[BUNDLE] Could not compile {TEMPLATE_BUNDLE_NAME}: {exc}")
+            sys.exit(1)
+        log(f"[BUNDLE] Compiled {len(FILES_FROM_TEMPLATES)} template(s) into {path}")
+        return
 
-    # Phase 2
-    log("── Phase 2: Hardening core files from templates")
-    for repo_rel, template_rel in FILES_FROM_TEMPLATES:
-        write_hardened_from_template(repo_rel, template_rel, dry_run=dry)
+    if args.drift_status:
+        state = load_drift_state()
+        if state is None:
+            print(f"No drift state recorded at {DRIFT_PATH}", file=sys.stderr)
+            sys.exit(1)
+        print(json.dumps(state, indent=2, sort_keys=True))
+        return
 
-    # Phase 3
-    log("── Phase 3: Hardening docs banners")
-    harden_docs_folder(PROJECT_ROOT / "docs", dry_run=dry)
+    if args.watch:
+        from .drift_watch import watch_drift
+        watch_drift(jobs=max(1, args.jobs))
+        return
 
-    # Phase 4
-    log("── Phase 4: Hardening docs language (Updater → Hardener)")
-    harden_docs_language(PROJECT_ROOT / "docs", dry_run=dry)
+    if args.hash_tree is not None:
+        root = args.hash_tree.resolve()
+        digests = hash_tree(root, jobs=max(1, args.jobs), algorithm=args.hash_algorithm)
+        print(json.dumps(digests, indent=2))
+        return
 
-    # Phase 5
-    log("── Phase 5: Drift Detection")
-    detect_drift(dry_run=dry)
+    DIFF_MODE = args.diff
+    DOCS_INLINE_LIMIT = args.max_inline_size
+    if args.rules is not None:
+        set_language_rules(load_rules(args.rules))
+
+    options = {
+        "dry": args.dry_run,
+        "jobs": max(1, args.jobs),
+        "incremental": args.incremental,
+        "compress_backups": args.compress_backups,
+    }
+
+    targets = list(args.target)
+    if args.targets_file is not None:
+        targets.extend(read_targets_file(args.targets_file))
+    if targets:
+        summaries = run_batch(targets, options, target_jobs=args.target_jobs)
+        print_batch_summary(summaries)
+        if not all(s["ok"] for s in summaries):
+            sys.exit(1)
+        return
 
-    log("🔱 Hardening complete")
+    harden_project(**options)
 
 if __name__ == "__main__":
     main()
@@ -1,9 +1,55 @@
+import functools
 import textwrap
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
 
+# Distribution name in pyproject.toml; used to look up installed metadata.
+DIST_NAME = "trident-cli"
+
+
+class Identity:
+    """
+    Process-wide identity metadata, each field resolved on first access.
+
+    The version comes from the installed distribution's metadata and falls
+    back to pyproject.toml for source checkouts, so wheels without a
+    pyproject.toml still report their real version.
+    """
+
+    name = "The Veil"
+    codename = "GrafanaNetes Sentinel"
+
+    @functools.cached_property
+    def project_root(self) -> Path:
+        return Path(__file__).resolve().parent.parent
+
+    @functools.cached_property
+    def version(self) -> Optional[str]:
+        # importlib.metadata costs tens of milliseconds to import; only
+        # pay for it when the version is actually asked for.
+        from importlib import metadata
+
+        try:
+            return metadata.version(DIST_NAME)
+        except metadata.PackageNotFoundError:
+            pass
+        for pyproject in (get_pyproject_path(), self.project_root.parent / "pyproject.toml"):
+            version = _read_pyproject_version(pyproject)
+            if version:
+                return version
+        return None
+
+
+@functools.lru_cache(maxsize=None)
+def get_identity() -> Identity:
+    """
+    Return the shared Identity for this process.
+    """
+    return Identity()
+
+
 def get_project_root() -> Path:
     """
     Resolve the project root as the directory that contains the `veil` package.
@@ -19,7 +65,7 @@ def get_project_root() -> Path:
     Returns:
         Path: Absolute path to the project root directory.
     """
-    return Path(__file__).resolve().parent.parent
+    return get_identity().project_root
 
 
 def get_timestamp() -> str:
@@ -41,18 +87,21 @@ def get_pyproject_path() -> Path:
 
 def get_version(default: str = "0.0.0") -> str:
     """
-    Attempt to read the project version from pyproject.toml.
+    Return the installed version, resolved once per process (see Identity).
 
-    If not found or file is missing, falls back to `default`.
+    If it cannot be determined, falls back to `default`.
     """
-    pyproject = get_pyproject_path()
-    if not pyproject.exists():
-        return default
+    return get_identity().version or default
+
 
+def _read_pyproject_version(pyproject: Path) -> Optional[str]:
+    """
+    Read `version = "..."` from a pyproject.toml, or None.
+    """
     try:
         text = pyproject.read_text(encoding="utf-8")
     except OSError:
-        return default
+        return None
 
     # Extremely lightweight parse; avoid extra dependencies.
     for line in text.splitlines():
@@ -65,21 +114,21 @@ def get_version(default: str = "0.0.0") -> str:
                 if value:
                     return value
 
-    return default
+    return None
 
 
 def get_name() -> str:
     """
     Return the canonical name for this tool.
     """
-    return "The Veil"
+    return get_identity().name
 
 
 def get_codename() -> str:
     """
     Optional codename (for fun / flavor).
     """
-    return "GrafanaNetes Sentinel"
+    return get_identity().codename
 
 
 def get_banner(extra: Optional[str] = None) -> str:
@@ -92,16 +141,14 @@ def get_banner(extra: Optional[str] = None) -> str:
     Returns:
         str: A richly formatted ASCII banner.
     """
-    name = get_name()
-    codename = get_codename()
-    version = get_version()
+    identity = get_identity()
 
     banner = textwrap.dedent(
         f"""
-        🔱 {name} — {codename}
-        Version: {version}
+        🔱 {identity.name} — {identity.codename}
+        Version: {identity.version or "0.0.0"}
         Timestamp: {get_timestamp()}
-        Project root: {get_project_root()}
+        Project root: {identity.project_root}
         """
     ).strip()
 
@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+import time
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, Optional
+
+from .log_writer import list_segments, parse_timestamp, read_index
+
+
+LEVELS = {"DEBUG": 10, "INFO": 20, "WARN": 30, "WARNING": 30, "ERROR": 40}
+
+_RELATIVE = re.compile(r"^(\d+(?:\.\d+)?)([smhd])$")
+_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+# hardener.log lines look like "[<iso timestamp>] <message>".
+_BRACKETED = re.compile(r"^\[([^\]]+)\] ?(.*)$")
+
+
+def parse_since(value: str) -> float:
+    """
+    Parse a --since value: an ISO-8601 timestamp or an age such as
+    `90s`, `15m`, `2h` or `1d`.
+
+    Returns:
+        float: POSIX seconds.
+
+    Raises:
+        ValueError: If value is neither form.
+    """
+    match = _RELATIVE.match(value.strip())
+    if match:
+        return time.time() - float(match.group(1)) * _UNITS[match.group(2)]
+    ts = parse_timestamp(value.strip())
+    if ts is None:
+        raise ValueError(f"invalid --since value: {value!r}")
+    return ts
+
+
+def parse_record(line: str) -> Optional[Dict[str, Any]]:
+    """
+    Parse one log line from veil.log (JSON) or hardener.log (bracketed).
+
+    Returns:
+        Optional[Dict[str, Any]]: Record with `timestamp`, `level`,
+        `message` and a parsed `_ts`, or None for unparseable lines.
+    """
+    line = line.rstrip("\n")
+    if line.startswith("{"):
+        try:
+            record = json.loads(line)
+        except ValueError:
+            return None
+        if not isinstance(record, dict):
+            return None
+    else:
+        match = _BRACKETED.match(line)
+        if not match:
+            return None
+        record = {"timestamp": match.group(1), "level": "INFO", "message": match.group(2)}
+    record["_ts"] = parse_timestamp(str(record.get("timestamp", "")))
+    return record
+
+
+class LogFilter:
+    """
+    Record filter for `veil logs`.
+
+    Args:
+        since: Only records at or after this POSIX time.
+        level: Minimum level (DEBUG, INFO, WARN, ERROR).
+        message: Regular expression searched in the message (case-insensitive).
+    """
+
+    def __init__(self, since: Optional[float] = None, level: Optional[str] = None, message: Optional[str] = None):
+        self.since = since
+        self.min_level = LEVELS[level.upper()] if level else None
+        self.message = re.compile(message, re.IGNORECASE) if message else None
+
+    def matches(self, line: str) -> bool:
+        record = parse_record(line)
+        if record is None:
+            return False
+        if self.since is not None and (record["_ts"] is None or record["_ts"] < self.since):
+            return False
+        if self.min_level is not None:
+            if LEVELS.get(str(record.get("level", "INFO")).upper(), 0) < self.min_level:
+                return False
+        if self.message is not None and not self.message.search(str(record.get("message", ""))):
+            return False
+        return True
+
+
+def _start_offset(segment: Path, since: Optional[float]) -> int:
+    """Offset of the last index point strictly before `since`."""
+    if since is None:
+        return 0
+    start = 0
+    for ts, offset in read_index(segment):
+        if ts >= since:
+            break
+        start = offset
+    return start
+
+
+def _open_segment(segment: Path, offset: int) -> BinaryIO:
+    raw = segment.open("rb")
+    raw.seek(offset)
+    if segment.suffix == ".gz":
+        import gzip
+
+        # Index offsets are gzip member boundaries.
+        return gzip.GzipFile(fileobj=raw, mode="rb")
+    return raw
+
+
+def _first_timestamp(segment: Path) -> Optional[float]:
+    index = read_index(segment)
+    return index[0][0] if index else None
+
+
+def _history(path: Path, flt: LogFilter) -> Iterator[str]:
+    """Matching lines from the rotated segments, oldest first."""
+    segments = list_segments(path)
+    for segment, following in zip(segments, segments[1:]):
+        if flt.since is not None:
+            next_first = _first_timestamp(following)
+            if next_first is not None and next_first <= flt.since:
+                continue
+        try:
+            f = _open_segment(segment, _start_offset(segment, flt.since))
+        except FileNotFoundError:
+            # Compressed or pruned while we were listing.
+            continue
+        with f:
+            for raw in f:
+                line = raw.decode("utf-8", errors="replace")
+                if flt.matches(line):
+                    yield line
+
+
+def query_logs(path: Path, flt: LogFilter, follow: bool = False, poll_interval: float = 0.5) -> Iterator[str]:
+    """
+    Yield matching log lines across rotated segments and the active file.
+
+    Each segment's sparse index is used to seek to the first block that
+    can hold records at or after `flt.since`; segments that end before it
+    are skipped unopened. With follow=True the active file is tailed
+    (across rotations) until the caller stops iterating. Without --since,
+    following starts at the end of the file, like `tail -f`.
+    """
+    if not follow or flt.since is not None:
+        yield from _history(path, flt)
+
+    try:
+        f = path.open("rb")
+    except FileNotFoundError:
+        if not follow:
+            return
+        f = None
+    if f is not None:
+        if follow and flt.since is None:
+            f.seek(0, os.SEEK_END)
+        else:
+            f.seek(_start_offset(path, flt.since))
+
+    partial = b""
+    while True:
+        if f is not None:
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    partial += raw
+                    break
+                line = (partial + raw).decode("utf-8", errors="replace")
+                partial = b""
+                if flt.matches(line):
+                    yield line
+
+        if not follow:
+            if f is not None:
+                f.close()
+            return
+
+        # Rotated: finish the old file above, then switch to the new one.
+        try:
+            current = os.stat(path)
+        except FileNotFoundError:
+            current = None
+        if current is not None and (f is None or os.fstat(f.fileno()).st_ino != current.st_ino):
+            if f is not None:
+                for raw in f:
+                    line = (partial + raw).decode("utf-8", errors="replace")
+                    partial = b""
+                    if flt.matches(line):
+                        yield line
+                f.close()
+            f = path.open("rb")
+            partial = b""
+            continue
+        time.sleep(poll_interval)
@@ -0,0 +1,425 @@
+from __future__ import annotations
+
+import atexit
+import os
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: writers in one process are still serialized.
+    fcntl = None
+
+
+# Flush once this many bytes are buffered, or after this many seconds.
+FLUSH_BYTES = 64 * 1024
+FLUSH_INTERVAL = 0.5
+
+# Set VEIL_LOG_SYNC=1 to write every record before log() returns.
+SYNC_ENV = "VEIL_LOG_SYNC"
+
+# Rotate the active file past this size; keep this many rotated segments.
+MAX_BYTES = 16 * 1024 * 1024
+KEEP_SEGMENTS = 10
+
+# One sparse index entry (timestamp, byte offset) per this many bytes.
+INDEX_INTERVAL = 64 * 1024
+
+_writers: Dict[Path, "BufferedLogWriter"] = {}
+_writers_lock = threading.Lock()
+_sync = os.environ.get(SYNC_ENV, "").lower() in ("1", "true", "yes")
+
+
+def parse_timestamp(value: str) -> Optional[float]:
+    """
+    Parse an ISO-8601 timestamp (naive values are taken as UTC).
+
+    Returns:
+        Optional[float]: POSIX seconds, or None if value is not a timestamp.
+    """
+    try:
+        dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+def index_path(segment: Path) -> Path:
+    """Sparse index sidecar for a log segment."""
+    return segment.with_name(segment.name + ".idx")
+
+
+def lock_path(path: Path, purpose: str = "write") -> Path:
+    """
+    Lock file shared by every process logging to path: "write" guards
+    appends and rotation, "gzip" guards compression and pruning.
+    """
+    return path.with_name(f"{path.name}.{purpose}.lock")
+
+
+@contextmanager
+def _exclusive(fd: int, blocking: bool = True) -> Iterator[bool]:
+    """flock fd for the duration of the block; yields False if it is busy."""
+    if fcntl is None:
+        yield True
+        return
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+    except BlockingIOError:
+        yield False
+        return
+    try:
+        yield True
+    finally:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+def read_index(segment: Path) -> List[Tuple[float, int]]:
+    """
+    Load a segment's sparse index as sorted [(timestamp, offset), ...].
+
+    For .gz segments the offset is the start of an independent gzip
+    member, so a reader can seek there and decompress from that point.
+    """
+    entries = []
+    try:
+        with index_path(segment).open("r", encoding="utf-8") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) == 2:
+                    try:
+                        entries.append((float(parts[0]), int(parts[1])))
+                    except ValueError:
+                        continue
+    except OSError:
+        pass
+    return entries
+
+
+def list_segments(path: Path) -> List[Path]:
+    """
+    Return the rotated segments of a log file, oldest first, followed by
+    the active file itself.
+    """
+    prefix = path.name + "."
+    rotated = []
+    try:
+        names = os.listdir(path.parent)
+    except OSError:
+        names = []
+    for name in names:
+        if not name.startswith(prefix) or name.endswith((".idx", ".tmp", ".lock")):
+            continue
+        stamp = name[len(prefix):]
+        if stamp.endswith(".gz"):
+            stamp = stamp[:-3]
+        if stamp.isalnum():
+            rotated.append((stamp, name.endswith(".gz"), path.parent / name))
+    # A segment mid-compression exists in both forms; prefer the plain one.
+    segments = {}
+    for stamp, is_gz, segment in sorted(rotated):
+        segments.setdefault(stamp, segment)
+    return [segments[s] for s in sorted(segments)] + [path]
+
+
+def compress_segment(segment: Path) -> Path:
+    """
+    Gzip a rotated segment as one gzip member per index block and rewrite
+    its index with compressed offsets.
+
+    Returns:
+        Path: The .gz segment.
+    """
+    import gzip
+
+    target = segment.with_name(segment.name + ".gz")
+    # Unique per process and thread; the gzip lock makes this a safety net.
+    tmp = target.with_name(f"{target.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    index = read_index(segment)
+    size = segment.stat().st_size
+    starts = [offset for _, offset in index if 0 < offset < size]
+    bounds = [0] + starts + [size]
+
+    new_index = []
+    by_offset = {offset: ts for ts, offset in index}
+    with segment.open("rb") as src, tmp.open("wb") as dst:
+        for start, end in zip(bounds, bounds[1:]):
+            if end <= start:
+                continue
+            if start in by_offset:
+                new_index.append((by_offset[start], dst.tell()))
+            src.seek(start)
+            dst.write(gzip.compress(src.read(end - start), compresslevel=6))
+        os.fsync(dst.fileno())
+
+    idx_tmp = index_path(tmp)
+    idx_tmp.write_text("".join(f"{ts:.6f} {off}\n" for ts, off in new_index), encoding="utf-8")
+    os.replace(idx_tmp, index_path(target))
+    os.replace(tmp, target)
+    segment.unlink()
+    index_path(segment).unlink(missing_ok=True)
+    return target
+
+
+def _compress_and_prune(path: Path, keep: int) -> None:
+    fd = os.open(lock_path(path, "gzip"), os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        with _exclusive(fd, blocking=False) as locked:
+            if not locked:
+                # Another process is compressing; it or the next rotation
+                # picks up this segment.
+                return
+            for segment in list_segments(path)[:-1]:
+                if segment.suffix != ".gz":
+                    try:
+                        compress_segment(segment)
+                    except OSError:
+                        # Leave it plain; the next rotation retries.
+                        pass
+            segments = list_segments(path)[:-1]
+            for segment in segments[: max(0, len(segments) - keep)]:
+                segment.unlink(missing_ok=True)
+                index_path(segment).unlink(missing_ok=True)
+    finally:
+        os.close(fd)
+
+
+class BufferedLogWriter:
+    """
+    Append-only log file writer that batches records on a background thread.
+
+    The file is opened once. Records are queued in memory and written in
+    one call when FLUSH_BYTES are pending, FLUSH_INTERVAL has passed, or
+    the process exits. In sync mode every record is written and flushed
+    on the caller's thread, with no background thread.
+
+    Past `max_bytes` the file is renamed to `<name>.<UTC stamp>` and gzipped
+    on a separate thread. Every INDEX_INTERVAL bytes a (timestamp, offset)
+    pair is appended to `<name>.idx` so readers can seek by time.
+
+    Several processes may log to the same file. Each batch is written under
+    an flock on `<name>.write.lock`: the writer reopens the file if another
+    process rotated it, takes offsets from the file's real size and decides
+    rotation from it, so records never interleave and the index stays exact.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        flush_bytes: int = FLUSH_BYTES,
+        flush_interval: float = FLUSH_INTERVAL,
+        sync: bool = False,
+        max_bytes: int = MAX_BYTES,
+        keep: int = KEEP_SEGMENTS,
+    ):
+        self.path = path
+        self.flush_bytes = flush_bytes
+        self.flush_interval = flush_interval
+        self.sync = sync
+        self.max_bytes = max_bytes
+        self.keep = keep
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock_fd = os.open(lock_path(path), os.O_RDWR | os.O_CREAT, 0o644)
+        self._open()
+        self._pending: List[Tuple[str, Optional[str]]] = []
+        self._pending_bytes = 0
+        self._cond = threading.Condition()
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+        self._compressor: Optional[threading.Thread] = None
+
+    def _open(self) -> None:
+        self._file = self.path.open("ab")
+        self._index = index_path(self.path).open("a", encoding="utf-8")
+        entries = read_index(self.path)
+        self._indexed_at = entries[-1][1] if entries else None
+
+    def _reopen_if_rotated(self) -> None:
+        # Caller holds the write lock. Another process may have renamed the
+        # file away since this one last wrote to it.
+        try:
+            current = os.stat(self.path).st_ino
+        except FileNotFoundError:
+            current = None
+        if current != os.fstat(self._file.fileno()).st_ino:
+            self._file.close()
+            self._index.close()
+            self._open()
+
+    def write(self, line: str, timestamp: Optional[str] = None) -> None:
+        """
+        Queue one record. `line` must include its trailing newline;
+        `timestamp` (ISO-8601) feeds the sparse time index.
+        """
+        with self._cond:
+            if self._closed:
+                return
+            if self.sync:
+                self._write_records([(line, timestamp)])
+                return
+            self._pending.append((line, timestamp))
+            self._pending_bytes += len(line)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name=f"log-writer:{self.path.name}", daemon=True
+                )
+                self._thread.start()
+            if self._pending_bytes >= self.flush_bytes:
+                self._cond.notify()
+
+    def _write_records(self, records) -> None:
+        # Caller holds self._cond.
+        if self._file is None:
+            return
+        with _exclusive(self._lock_fd):
+            self._reopen_if_rotated()
+            size = os.fstat(self._file.fileno()).st_size
+            chunk = []
+            for line, timestamp in records:
+                data = line.encode("utf-8")
+                if size and size + len(data) > self.max_bytes:
+                    self._file.write(b"".join(chunk))
+                    chunk = []
+                    self._rotate()
+                    size = os.fstat(self._file.fileno()).st_size
+                if timestamp is not None and (
+                    self._indexed_at is None or size - self._indexed_at >= INDEX_INTERVAL
+                ):
+                    ts = parse_timestamp(timestamp)
+                    if ts is not None:
+                        self._index.write(f"{ts:.6f} {size}\n")
+                        self._indexed_at = size
+                chunk.append(data)
+                size += len(data)
+            self._file.write(b"".join(chunk))
+            self._file.flush()
+            self._index.flush()
+
+    def _rotate(self) -> None:
+        # Caller holds the write lock.
+        self._file.close()
+        self._index.close()
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+        segment = self.path.with_name(f"{self.path.name}.{stamp}")
+        os.replace(self.path, segment)
+        if index_path(self.path).exists():
+            os.replace(index_path(self.path), index_path(segment))
+        self._open()
+
+        if self._compressor is None or not self._compressor.is_alive():
+            # Not a daemon (explicitly: rotation usually runs on the daemon
+            # flush thread, whose flag would be inherited), so a rotated
+            # segment is finished before exit.
+            self._compressor = threading.Thread(
+                target=_compress_and_prune,
+                args=(self.path, self.keep),
+                name=f"log-gzip:{self.path.name}",
+                daemon=False,
+            )
+            self._compressor.start()
+
+    def _drain(self) -> None:
+        # Caller holds self._cond.
+        if self._pending:
+            self._write_records(self._pending)
+        self._pending = []
+        self._pending_bytes = 0
+
+    def _run(self) -> None:
+        with self._cond:
+            while not self._closed:
+                self._cond.wait_for(
+                    lambda: self._closed or self._pending_bytes >= self.flush_bytes,
+                    timeout=self.flush_interval,
+                )
+                self._drain()
+
+    def flush(self) -> None:
+        """Write every queued record now."""
+        with self._cond:
+            self._drain()
+
+    def set_sync(self, sync: bool) -> None:
+        with self._cond:
+            self._drain()
+            self.sync = sync
+
+    def close(self) -> None:
+        with self._cond:
+            self._drain()
+            self._closed = True
+            self._cond.notify()
+            if self._file is not None:
+                self._file.close()
+                self._index.close()
+                os.close(self._lock_fd)
+                self._file = None
+        # close() also runs from atexit, after the interpreter has stopped
+        # waiting for non-daemon threads.
+        if self._compressor is not None:
+            self._compressor.join()
+
+
+def get_writer(path: Path) -> BufferedLogWriter:
+    """
+    Return the shared writer for a log file, opening it on first use.
+
+    Args:
+        path: Log file path.
+
+    Returns:
+        BufferedLogWriter: One writer per path per process.
+    """
+    writer = _writers.get(path)
+    if writer is None:
+        with _writers_lock:
+            writer = _writers.get(path)
+            if writer is None:
+                writer = BufferedLogWriter(path, sync=_sync)
+                _writers[path] = writer
+    return writer
+
+
+def flush_logs() -> None:
+    """Flush every open log writer."""
+    for writer in list(_writers.values()):
+        writer.flush()
+
+
+def close_logs() -> None:
+    """Flush and close every open log writer."""
+    with _writers_lock:
+        writers = list(_writers.values())
+        _writers.clear()
+    for writer in writers:
+        writer.close()
+
+
+def set_sync_mode(enabled: bool) -> None:
+    """
+    Switch every writer, current and future, to synchronous writes.
+    Meant for tests that read the log file right after logging.
+    """
+    global _sync
+    _sync = enabled
+    for writer in list(_writers.values()):
+        writer.set_sync(enabled)
+
+
+def _reset_after_fork() -> None:
+    # The child inherits the parent's queued records and locks but not its
+    # writer threads; drop them so nothing is written twice.
+    global _writers_lock
+    _writers_lock = threading.Lock()
+    _writers.clear()
+
+
+atexit.register(close_logs)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(before=flush_logs, after_in_child=_reset_after_fork)
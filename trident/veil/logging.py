@@ -1,11 +1,18 @@
 from __future__ import annotations
 
 import json
+import os
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, Optional
 
 from .identity import get_project_root
+from .log_writer import get_writer
+
+_LOG_FILE: Optional[Path] = None
+
+# Overrides the log directory (e.g. a throwaway one for benchmarks).
+LOG_DIR_ENV = "VEIL_LOG_DIR"
 
 
 def _get_log_directory() -> Path:
@@ -16,21 +23,25 @@ def _get_log_directory() -> Path:
         <project_root>/logs/
 
     This ensures logs are outside the package directory and easy to rotate or inspect.
+    Set VEIL_LOG_DIR to use another directory.
     """
-    root = get_project_root()
-    log_dir = root / "logs"
+    override = os.environ.get(LOG_DIR_ENV)
+    log_dir = Path(override) if override else get_project_root() / "logs"
     log_dir.mkdir(parents=True, exist_ok=True)
     return log_dir
 
 
 def _get_log_file() -> Path:
     """
-    Return the primary log file path.
+    Return the primary log file path, resolved once per process.
 
     Currently:
         <project_root>/logs/veil.log
     """
-    return _get_log_directory() / "veil.log"
+    global _LOG_FILE
+    if _LOG_FILE is None:
+        _LOG_FILE = _get_log_directory() / "veil.log"
+    return _LOG_FILE
 
 
 def _serialize_log_record(record: Dict[str, Any]) -> str:
@@ -50,6 +61,9 @@ def log(
     """
     Append a JSON log entry to the primary log file.
 
+    Records are buffered and written on a background thread (see
+    log_writer); set VEIL_LOG_SYNC=1 to write them synchronously.
+
     Args:
         message: Human-readable message.
         level: Log level (INFO, WARN, ERROR, DEBUG).
@@ -63,13 +77,7 @@ def log(
     }
     record.update(context)
 
-    log_file = _get_log_file()
-    line = _serialize_log_record(record) + "\n"
-
-    # Append mode; if file doesn't exist it will be created.
-    log_file.parent.mkdir(parents=True, exist_ok=True)
-    with log_file.open("a", encoding="utf-8") as f:
-        f.write(line)
+    get_writer(_get_log_file()).write(_serialize_log_record(record) + "\n", record["timestamp"])
 
 
 def log_section(title: str) -> None:
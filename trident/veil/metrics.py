@@ -0,0 +1,196 @@
+"""
+Prometheus endpoint for diagnostics (`veil diagnostics --serve`).
+
+A background thread re-runs the checks every `interval` seconds and keeps
+the rendered exposition text in memory; HTTP requests only copy that
+buffer, so a scrape spawns no process and touches no disk.
+"""
+
+from __future__ import annotations
+
+import signal
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+from .diagnostics import run_diagnostics
+from .logging import log
+
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 9464
+DEFAULT_INTERVAL = 60.0
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+PREFIX = "veil_diagnostics"
+
+# Result fields that are not exported as veil_diagnostics_check_value.
+_SKIPPED_FIELDS = {"name", "ok", "timed_out", "duration_ms", "cached", "age_s"}
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value: Any) -> str:
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render_prometheus(
+    result: Optional[Dict[str, Any]],
+    run_ok: bool = True,
+    completed_at: Optional[float] = None,
+) -> str:
+    """
+    Render a run_diagnostics() result in the Prometheus text format.
+
+    Every numeric field of a check result (e.g. a perf probe's `mb_per_s`)
+    is exported as veil_diagnostics_check_value{check=..., field=...}.
+
+    Args:
+        result: Dict returned by run_diagnostics(), or None before the first run.
+        run_ok: False if the last scheduled run raised.
+        completed_at: Unix time the result was produced (default: now).
+
+    Returns:
+        str: Exposition text, newline-terminated.
+    """
+    families: Dict[str, List[str]] = {}
+    helps = {
+        "up": "1 if the last scheduled diagnostics run completed.",
+        "overall_ok": "1 if every check passed.",
+        "last_run_timestamp_seconds": "Unix time of the last completed run.",
+        "run_duration_seconds": "Wall time of the last run.",
+        "check_ok": "1 if the check passed.",
+        "check_timed_out": "1 if the check hit its timeout.",
+        "check_duration_seconds": "Time the check took.",
+        "check_value": "Numeric fields reported by a check.",
+    }
+
+    def add(metric: str, value: Any, **labels: str) -> None:
+        label_text = ",".join(f'{k}="{_escape(str(v))}"' for k, v in labels.items())
+        sample = f"{PREFIX}_{metric}{{{label_text}}}" if label_text else f"{PREFIX}_{metric}"
+        families.setdefault(metric, []).append(f"{sample} {_number(value)}")
+
+    add("up", run_ok and result is not None)
+    if result is not None:
+        add("overall_ok", result.get("overall_ok", False))
+        add("last_run_timestamp_seconds", round(completed_at or time.time(), 3))
+        add("run_duration_seconds", round(result.get("duration_ms", 0) / 1000, 6))
+        for check in result.get("checks", []):
+            name = str(check.get("name", "unknown"))
+            add("check_ok", check.get("ok", False), check=name)
+            add("check_timed_out", check.get("timed_out", False), check=name)
+            add("check_duration_seconds", round(check.get("duration_ms", 0) / 1000, 6), check=name)
+            for field, value in check.items():
+                if field in _SKIPPED_FIELDS or isinstance(value, bool):
+                    continue
+                if isinstance(value, (int, float)):
+                    add("check_value", value, check=name, field=field)
+
+    lines = []
+    for metric, samples in families.items():
+        lines.append(f"# HELP {PREFIX}_{metric} {helps[metric]}")
+        lines.append(f"# TYPE {PREFIX}_{metric} gauge")
+        lines.extend(samples)
+    return "\n".join(lines) + "\n"
+
+
+class DiagnosticsExporter:
+    """
+    Re-runs diagnostics on a schedule and holds the latest exposition text.
+
+    Args:
+        interval: Seconds between runs.
+        suites: Suites to run (see run_diagnostics).
+    """
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL, suites: Optional[List[str]] = None):
+        self.interval = interval
+        self.suites = suites
+        self._body = render_prometheus(None).encode("utf-8")
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def body(self) -> bytes:
+        return self._body
+
+    def refresh(self) -> None:
+        try:
+            # Never serve results older than one interval.
+            result = run_diagnostics(max_age=self.interval, suites=self.suites)
+            body = render_prometheus(result, completed_at=time.time() - result.get("age_s", 0))
+        except Exception as exc:
+            log("Diagnostics run failed", level="ERROR", context={"error": str(exc)})
+            body = render_prometheus(None, run_ok=False)
+        # One reference assignment: readers see the old or the new body.
+        self._body = body.encode("utf-8")
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            started = time.monotonic()
+            self.refresh()
+            self._stop.wait(max(0.0, self.interval - (time.monotonic() - started)))
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="diagnostics-exporter", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+
+def _handler(exporter: DiagnosticsExporter):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(404, "try /metrics")
+                return
+            body = exporter.body
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            # Scrapes arrive every few seconds; keep them out of the log.
+            pass
+
+    return Handler
+
+
+def serve_diagnostics(
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    interval: float = DEFAULT_INTERVAL,
+    suites: Optional[List[str]] = None,
+) -> None:
+    """
+    Serve diagnostics at http://<host>:<port>/metrics until interrupted.
+
+    Args:
+        host: Address to bind; loopback by default.
+        port: TCP port.
+        interval: Seconds between diagnostics runs.
+        suites: Suites to run (see run_diagnostics).
+    """
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    exporter = DiagnosticsExporter(interval=interval, suites=suites)
+    server = ThreadingHTTPServer((host, port), _handler(exporter))
+    server.daemon_threads = True
+    exporter.start()
+    log("Serving diagnostics metrics", context={"host": host, "port": server.server_address[1], "interval": interval})
+    print(f"Serving diagnostics on http://{host}:{server.server_address[1]}/metrics (every {interval:g}s)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        exporter.stop()
+        server.server_close()
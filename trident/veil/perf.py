@@ -0,0 +1,312 @@
+"""
+Host performance probes for `veil diagnostics --perf`.
+
+Importing this module registers the checks in the "perf" suite. Each
+probe measures one resource a hardening or update run depends on and
+compares it with a threshold below, so a slow node shows whether the
+disk, the filesystem, the CPU quota or memory is to blame.
+
+The disk check writes real data (a few MiB) and is never cached.
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .diagnostics import register_check
+from .identity import get_project_root
+
+
+SUITE = "perf"
+
+# Thresholds; a probe below (or above, for latencies) these reports WARN.
+MIN_SEQUENTIAL_MB_S = 50.0
+MAX_FSYNC_MS = 20.0
+MAX_METADATA_MS = 5.0
+MIN_CPUS = 1.0
+MIN_AVAILABLE_MB = 512.0
+MAX_LOAD_PER_CPU = 1.5
+
+# Probe sizes.
+SEQUENTIAL_BYTES = 32 * 1024 * 1024
+SEQUENTIAL_CHUNK = 1024 * 1024
+FSYNC_WRITES = 32
+FSYNC_CHUNK = 4096
+METADATA_FILES = 200
+
+DISK_TIMEOUT = 45.0
+
+CGROUP_ROOT = Path("/sys/fs/cgroup")
+
+
+def _logs_dir() -> Path:
+    logs_dir = get_project_root() / "logs"
+    logs_dir.mkdir(parents=True, exist_ok=True)
+    return logs_dir
+
+
+def _p95(samples: List[float]) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+
+# ─────────────────────────────────────────────
+# Disk and filesystem
+# ─────────────────────────────────────────────
+# The three disk probes run one after another inside a single check, so
+# they never measure each other and the check's timeout covers all of
+# them. They work in a private temp directory on the log volume, which
+# is removed even if a probe fails.
+
+def _probe_sequential_write(workdir: Path) -> Dict[str, Any]:
+    path = workdir / "seq"
+    chunk = os.urandom(SEQUENTIAL_CHUNK)
+    written = 0
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        t0 = time.perf_counter()
+        while written < SEQUENTIAL_BYTES:
+            written += os.write(fd, chunk)
+        # Include the flush to stable storage; page-cache speed alone
+        # says nothing about the device.
+        os.fsync(fd)
+        elapsed = time.perf_counter() - t0
+    finally:
+        os.close(fd)
+        path.unlink(missing_ok=True)
+
+    mb_per_s = written / (1024 * 1024) / max(elapsed, 1e-9)
+    return {
+        "sequential_bytes": written,
+        "sequential_mb_per_s": round(mb_per_s, 1),
+        "sequential_ok": mb_per_s >= MIN_SEQUENTIAL_MB_S,
+    }
+
+
+def _probe_fsync(workdir: Path) -> Dict[str, Any]:
+    path = workdir / "fsync"
+    chunk = b"\0" * FSYNC_CHUNK
+    samples = []
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_APPEND, 0o600)
+    try:
+        for _ in range(FSYNC_WRITES):
+            t0 = time.perf_counter()
+            os.write(fd, chunk)
+            os.fsync(fd)
+            samples.append((time.perf_counter() - t0) * 1000)
+    finally:
+        os.close(fd)
+        path.unlink(missing_ok=True)
+
+    median_ms = statistics.median(samples)
+    return {
+        "fsync_writes": len(samples),
+        "fsync_median_ms": round(median_ms, 3),
+        "fsync_p95_ms": round(_p95(samples), 3),
+        "fsyncs_per_s": round(1000 / max(median_ms, 1e-6), 1),
+        "fsync_ok": median_ms <= MAX_FSYNC_MS,
+    }
+
+
+def _probe_metadata(workdir: Path) -> Dict[str, Any]:
+    create, stat = [], []
+    for i in range(METADATA_FILES):
+        path = workdir / f"f{i}"
+        t0 = time.perf_counter()
+        os.close(os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600))
+        t1 = time.perf_counter()
+        os.stat(path)
+        t2 = time.perf_counter()
+        create.append((t1 - t0) * 1000)
+        stat.append((t2 - t1) * 1000)
+
+    create_p95, stat_p95 = _p95(create), _p95(stat)
+    return {
+        "metadata_files": METADATA_FILES,
+        "create_median_ms": round(statistics.median(create), 4),
+        "create_p95_ms": round(create_p95, 4),
+        "stat_median_ms": round(statistics.median(stat), 4),
+        "stat_p95_ms": round(stat_p95, 4),
+        "metadata_ok": create_p95 <= MAX_METADATA_MS and stat_p95 <= MAX_METADATA_MS,
+    }
+
+
+@register_check("disk_io", timeout=DISK_TIMEOUT, suite=SUITE)
+def _check_disk_io() -> Dict[str, Any]:
+    logs_dir = _logs_dir()
+    workdir = Path(tempfile.mkdtemp(prefix=".veil-perf-", dir=logs_dir))
+    result: Dict[str, Any] = {"name": "disk_io", "path": str(logs_dir)}
+    try:
+        for probe in (_probe_sequential_write, _probe_fsync, _probe_metadata):
+            result.update(probe(workdir))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    result["ok"] = result["sequential_ok"] and result["fsync_ok"] and result["metadata_ok"]
+    result["required"] = (
+        f"sequential >= {MIN_SEQUENTIAL_MB_S:g} MB/s, fsync median <= {MAX_FSYNC_MS:g} ms, "
+        f"metadata p95 <= {MAX_METADATA_MS:g} ms"
+    )
+    return result
+
+
+# ─────────────────────────────────────────────
+# CPU and memory
+# ─────────────────────────────────────────────
+
+def _read(path: Path) -> Optional[str]:
+    try:
+        return path.read_text(encoding="utf-8").strip()
+    except OSError:
+        return None
+
+
+def _cgroup_dirs() -> List[Path]:
+    """
+    This process's cgroup v2 directory and its ancestors, innermost first.
+    Empty when cgroup v2 is not mounted.
+    """
+    content = _read(Path("/proc/self/cgroup"))
+    if content is None or not (CGROUP_ROOT / "cgroup.controllers").exists():
+        return []
+    for line in content.splitlines():
+        if line.startswith("0::"):
+            leaf = CGROUP_ROOT / line[3:].lstrip("/")
+            break
+    else:
+        return []
+    dirs = [leaf, *leaf.parents]
+    return [d for d in dirs if d == CGROUP_ROOT or CGROUP_ROOT in d.parents]
+
+
+def _cpu_quota() -> Tuple[Optional[float], Optional[str]]:
+    """
+    The tightest cgroup v2 cpu.max along the hierarchy, as CPUs.
+
+    Returns:
+        (cpus, cgroup): (None, None) when no quota applies.
+    """
+    best: Tuple[Optional[float], Optional[str]] = (None, None)
+    for d in _cgroup_dirs():
+        value = _read(d / "cpu.max")
+        if not value:
+            continue
+        quota, _, period = value.partition(" ")
+        if quota == "max":
+            continue
+        try:
+            cpus = int(quota) / int(period or 100000)
+        except ValueError:
+            continue
+        if best[0] is None or cpus < best[0]:
+            best = (cpus, str(d))
+    return best
+
+
+def _online_cpus() -> int:
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _effective_cpus() -> float:
+    quota, _ = _cpu_quota()
+    online = _online_cpus()
+    return float(min(quota, online)) if quota is not None else float(online)
+
+
+@register_check("cpu_quota", suite=SUITE)
+def _check_cpu_quota() -> Dict[str, Any]:
+    quota, cgroup = _cpu_quota()
+    online = _online_cpus()
+    effective = float(min(quota, online)) if quota is not None else float(online)
+    result: Dict[str, Any] = {
+        "name": "cpu_quota",
+        "ok": effective >= MIN_CPUS,
+        "online_cpus": online,
+        "quota_cpus": round(quota, 3) if quota is not None else None,
+        "effective_cpus": round(effective, 3),
+        "cgroup": cgroup,
+        "required": f">= {MIN_CPUS:g} CPU",
+    }
+
+    dirs = _cgroup_dirs()
+    stat = _read(dirs[0] / "cpu.stat") if dirs else None
+    if stat:
+        fields = dict(line.split(" ", 1) for line in stat.splitlines() if " " in line)
+        periods = int(fields.get("nr_periods", 0))
+        throttled = int(fields.get("nr_throttled", 0))
+        result["throttled_periods"] = throttled
+        result["throttled_ratio"] = round(throttled / periods, 4) if periods else 0.0
+    return result
+
+
+def _meminfo() -> Dict[str, int]:
+    """/proc/meminfo values in bytes."""
+    values = {}
+    for line in (_read(Path("/proc/meminfo")) or "").splitlines():
+        key, _, rest = line.partition(":")
+        parts = rest.split()
+        if parts and parts[0].isdigit():
+            values[key] = int(parts[0]) * (1024 if parts[1:] == ["kB"] else 1)
+    return values
+
+
+@register_check("memory_available", suite=SUITE)
+def _check_memory() -> Dict[str, Any]:
+    meminfo = _meminfo()
+    available = meminfo.get("MemAvailable")
+    result: Dict[str, Any] = {
+        "name": "memory_available",
+        "total_mb": round(meminfo["MemTotal"] / 2**20, 1) if "MemTotal" in meminfo else None,
+        "host_available_mb": round(available / 2**20, 1) if available is not None else None,
+        "cgroup_limit_mb": None,
+    }
+
+    # A cgroup limit caps what this process can actually use.
+    dirs = _cgroup_dirs()
+    for d in dirs:
+        limit = _read(d / "memory.max")
+        if limit and limit != "max" and limit.isdigit():
+            current = _read(dirs[0] / "memory.current")
+            result["cgroup_limit_mb"] = round(int(limit) / 2**20, 1)
+            if current and current.isdigit():
+                headroom = max(0, int(limit) - int(current))
+                available = headroom if available is None else min(available, headroom)
+            break
+
+    if available is None:
+        result.update(ok=True, available_mb=None, note="memory information unavailable on this platform")
+        return result
+    available_mb = available / 2**20
+    result.update(
+        ok=available_mb >= MIN_AVAILABLE_MB,
+        available_mb=round(available_mb, 1),
+        required=f">= {MIN_AVAILABLE_MB:g} MB",
+    )
+    return result
+
+
+@register_check("load_average", suite=SUITE)
+def _check_load_average() -> Dict[str, Any]:
+    if not hasattr(os, "getloadavg"):
+        return {"name": "load_average", "ok": True, "note": "loadavg unavailable on this platform"}
+    load1, load5, load15 = os.getloadavg()
+    cpus = _effective_cpus()
+    per_cpu = load1 / max(cpus, 1e-9)
+    return {
+        "name": "load_average",
+        "ok": per_cpu <= MAX_LOAD_PER_CPU,
+        "load1": round(load1, 2),
+        "load5": round(load5, 2),
+        "load15": round(load15, 2),
+        "effective_cpus": round(cpus, 3),
+        "load1_per_cpu": round(per_cpu, 3),
+        "required": f"load1 per CPU <= {MAX_LOAD_PER_CPU:g}",
+    }
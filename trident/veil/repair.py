@@ -1,19 +1,80 @@
 from __future__ import annotations
 
+import errno
+import os
+import stat
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from .identity import get_project_root, get_timestamp
 from .logging import log, log_section
 
 
-def _repair_logs_directory() -> Dict[str, Any]:
+@dataclass(frozen=True)
+class PermissionPolicy:
+    """
+    Desired ownership and mode bits for a tree under the project root.
+
+    Modes are adjusted, not replaced: `*_set` bits are added and `*_clear`
+    bits removed, so executable bits and the like are left alone.
+
+    Attributes:
+        path: Directory relative to the project root.
+        uid: Desired owner (default: the owner of the project root).
+        gid: Desired group (default: the group of the project root).
+        file_set: Bits every non-directory must have.
+        file_clear: Bits no non-directory may have.
+        dir_set: Bits every directory must have.
+        dir_clear: Bits no directory may have.
+    """
+
+    path: str
+    uid: Optional[int] = None
+    gid: Optional[int] = None
+    file_set: int = 0o600
+    file_clear: int = 0o002
+    dir_set: int = 0o700
+    dir_clear: int = 0o002
+
+    def file_mode(self, mode: int) -> int:
+        return (mode & ~self.file_clear) | self.file_set
+
+    def dir_mode(self, mode: int) -> int:
+        return (mode & ~self.dir_clear) | self.dir_set
+
+
+# Trees that container runs tend to leave root-owned or world-writable.
+PERMISSION_POLICIES = (
+    PermissionPolicy("logs"),
+    PermissionPolicy("docs"),
+)
+
+# Changed paths and errors listed in a result; the counts are always complete.
+SAMPLE_LIMIT = 20
+
+# Never follow symlinks; O_NONBLOCK keeps a FIFO from blocking the open.
+_OPEN_FLAGS = os.O_RDONLY | os.O_NOFOLLOW | os.O_NONBLOCK | os.O_CLOEXEC
+_DIR_FLAGS = _OPEN_FLAGS | os.O_DIRECTORY
+
+
+def _repair_logs_directory(dry_run: bool = False) -> Dict[str, Any]:
     """
     Ensure the logs directory exists and is writable.
     """
     root = get_project_root()
     logs_dir = root / "logs"
 
+    if dry_run:
+        return {
+            "name": "logs_directory",
+            "ok": True,
+            "path": str(logs_dir),
+            "would_create": not logs_dir.is_dir(),
+        }
+
     try:
         logs_dir.mkdir(parents=True, exist_ok=True)
         ok = logs_dir.exists() and logs_dir.is_dir()
@@ -31,46 +92,453 @@ def _repair_logs_directory() -> Dict[str, Any]:
         }
 
 
-def _repair_permissions(path: Path) -> Dict[str, Any]:
+def _fix_entry(
+    dir_fd: Optional[int],
+    name: str,
+    st: os.stat_result,
+    owner: Tuple[int, int],
+    mode: Optional[int],
+    dry_run: bool,
+) -> Tuple[bool, bool]:
+    """
+    Bring one entry to the wanted owner and mode.
+
+    The entry is opened (without following symlinks) and fixed through
+    fchown/fchmod on that descriptor, after checking it is still the inode
+    that was stat'ed. Entries we cannot open (no read permission, sockets)
+    fall back to the dir_fd-relative chown/chmod. Symlinks only get lchown.
+
+    Returns:
+        (owner_changed, mode_changed) — what differs, whether or not dry_run.
+    """
+    uid, gid = owner
+    change_owner = st.st_uid != uid or st.st_gid != gid
+    change_mode = mode is not None and stat.S_IMODE(st.st_mode) != mode
+    if dry_run or not (change_owner or change_mode):
+        return change_owner, change_mode
+
+    if stat.S_ISLNK(st.st_mode):
+        os.chown(name, uid, gid, dir_fd=dir_fd, follow_symlinks=False)
+        return change_owner, False
+
+    try:
+        fd = os.open(name, _OPEN_FLAGS, dir_fd=dir_fd)
+    except OSError as exc:
+        if exc.errno not in (errno.EACCES, errno.ENXIO):
+            raise
+        fd = None
+
+    if fd is None:
+        if change_owner:
+            os.chown(name, uid, gid, dir_fd=dir_fd, follow_symlinks=False)
+        if change_mode:
+            os.chmod(name, mode, dir_fd=dir_fd)
+        return change_owner, change_mode
+
+    try:
+        current = os.fstat(fd)
+        if (current.st_dev, current.st_ino) != (st.st_dev, st.st_ino):
+            raise OSError(errno.ESTALE, "replaced during repair")
+        # chown can clear setuid/setgid bits, so it goes first.
+        if change_owner:
+            os.fchown(fd, uid, gid)
+        if change_mode:
+            os.fchmod(fd, mode)
+    finally:
+        os.close(fd)
+    return change_owner, change_mode
+
+
+def _repair_permissions(
+    path: Path,
+    policy: Optional[PermissionPolicy] = None,
+    dry_run: bool = False,
+    first_only: bool = False,
+) -> Dict[str, Any]:
     """
-    Placeholder for permission repair logic.
+    Recursively repair ownership and mode bits under path.
+
+    The tree is walked with os.scandir on directory descriptors, so every
+    entry costs one lstat and only entries that differ from the policy are
+    touched. At most one descriptor pair per directory level is open at a
+    time, and only counts plus a few sample paths are kept, so memory does
+    not grow with the size of the tree.
+
+    Args:
+        path: Root of the tree.
+        policy: Wanted owner and modes (default: PermissionPolicy for path).
+        dry_run: Only count what would change.
+        first_only: Stop at the first entry that differs or fails (for probes).
 
-    Currently just reports whether the path exists.
+    Returns:
+        Dict[str, Any]: Step result with `scanned`, `owner_changes`,
+        `mode_changes`, `errors` and sample `changed`/`failed` paths.
     """
-    ok = path.exists()
-    return {
-        "name": "permissions_check",
-        "ok": ok,
+    policy = policy or PermissionPolicy(str(path))
+    t0 = time.perf_counter()
+    result: Dict[str, Any] = {
+        "name": "permissions",
+        "ok": True,
         "path": str(path),
+        "dry_run": dry_run,
+        "scanned": 0,
+        "owner_changes": 0,
+        "mode_changes": 0,
+        "errors": 0,
+        "changed": [],
+        "failed": [],
     }
 
+    def record(rel: str, owner_changed: bool, mode_changed: bool) -> None:
+        result["owner_changes"] += owner_changed
+        result["mode_changes"] += mode_changed
+        if (owner_changed or mode_changed) and len(result["changed"]) < SAMPLE_LIMIT:
+            result["changed"].append(rel)
+
+    def fail(rel: str, exc: OSError) -> None:
+        result["errors"] += 1
+        if len(result["failed"]) < SAMPLE_LIMIT:
+            result["failed"].append({"path": rel, "error": exc.strerror or str(exc)})
+
+    try:
+        root_st = os.lstat(path)
+    except FileNotFoundError:
+        result["missing"] = True
+        result["duration_ms"] = round((time.perf_counter() - t0) * 1000, 2)
+        return result
+    if not stat.S_ISDIR(root_st.st_mode):
+        result.update(ok=False, error="not a directory")
+        return result
+
+    project_st = os.stat(get_project_root())
+    owner = (
+        policy.uid if policy.uid is not None else project_st.st_uid,
+        policy.gid if policy.gid is not None else project_st.st_gid,
+    )
+    result["owner"] = f"{owner[0]}:{owner[1]}"
+
+    result["scanned"] += 1
+    try:
+        record(".", *_fix_entry(None, str(path), root_st, owner, policy.dir_mode(stat.S_IMODE(root_st.st_mode)), dry_run))
+        top = os.open(path, _DIR_FLAGS)
+    except OSError as exc:
+        fail(".", exc)
+        top = None
+
+    # Depth-first; each level holds its directory fd and scandir iterator.
+    stack = []
+    if top is not None:
+        stack.append((top, os.scandir(top), ""))
+    try:
+        while stack:
+            if first_only and (result["owner_changes"] or result["mode_changes"] or result["errors"]):
+                break
+            dir_fd, it, rel = stack[-1]
+            try:
+                entry = next(it, None)
+            except OSError as exc:
+                fail(rel or ".", exc)
+                entry = None
+            if entry is None:
+                it.close()
+                os.close(dir_fd)
+                stack.pop()
+                continue
+
+            name = entry.name
+            try:
+                st = entry.stat(follow_symlinks=False)
+            except OSError as exc:
+                fail(f"{rel}{name}", exc)
+                continue
+            result["scanned"] += 1
+            mode = st.st_mode
 
-def run_repair() -> Dict[str, Any]:
+            if stat.S_ISDIR(mode):
+                try:
+                    record(f"{rel}{name}/", *_fix_entry(dir_fd, name, st, owner, policy.dir_mode(stat.S_IMODE(mode)), dry_run))
+                    sub = os.open(name, _DIR_FLAGS, dir_fd=dir_fd)
+                except OSError as exc:
+                    fail(f"{rel}{name}/", exc)
+                    continue
+                try:
+                    stack.append((sub, os.scandir(sub), f"{rel}{name}/"))
+                except OSError as exc:
+                    os.close(sub)
+                    fail(f"{rel}{name}/", exc)
+                continue
+
+            want = None if stat.S_ISLNK(mode) else policy.file_mode(stat.S_IMODE(mode))
+            try:
+                record(f"{rel}{name}", *_fix_entry(dir_fd, name, st, owner, want, dry_run))
+            except OSError as exc:
+                fail(f"{rel}{name}", exc)
+    finally:
+        for dir_fd, it, _ in stack:
+            it.close()
+            os.close(dir_fd)
+
+    result["ok"] = result["errors"] == 0
+    result["duration_ms"] = round((time.perf_counter() - t0) * 1000, 2)
+    return result
+
+
+# ─────────────────────────────────────────────
+# Step registry and planner
+# ─────────────────────────────────────────────
+
+@dataclass(frozen=True)
+class RepairStep:
+    """
+    A registered repair step.
+
+    Attributes:
+        name: Unique step name, used as the result's `name`.
+        func: Callable taking `dry_run` and returning a result dict with `ok`.
+        probe: Cheap zero-argument callable returning True when the step has
+            something to do. Steps without a probe always run.
+        requires: Names of steps that must finish before this one.
     """
-    Run a full repair routine.
 
-    Currently:
-    - Ensures logs directory exists.
-    - Performs basic permission checks on key locations.
+    name: str
+    func: Callable[[bool], Dict[str, Any]]
+    probe: Optional[Callable[[], bool]] = None
+    requires: Tuple[str, ...] = ()
+
+
+_REGISTRY: Dict[str, RepairStep] = {}
+
+
+def register_step(
+    name: str,
+    func: Optional[Callable[[bool], Dict[str, Any]]] = None,
+    probe: Optional[Callable[[], bool]] = None,
+    requires: Tuple[str, ...] = (),
+):
+    """
+    Register a repair step. Works directly or as a decorator:
+
+        @register_step("cache_dir", probe=lambda: not CACHE.is_dir(), requires=("logs_directory",))
+        def _repair_cache_dir(dry_run):
+            ...
+
+    Registering an existing name replaces that step.
+
+    Args:
+        name: Unique step name.
+        func: Callable taking `dry_run` and returning a result dict.
+        probe: Returns True when there is something to repair.
+        requires: Step names this step depends on.
+    """
+    def decorator(f: Callable[[bool], Dict[str, Any]]):
+        _REGISTRY[name] = RepairStep(name=name, func=f, probe=probe, requires=tuple(requires))
+        return f
+
+    if func is not None:
+        return decorator(func)
+    return decorator
+
+
+def unregister_step(name: str) -> None:
+    """
+    Remove a step from the registry (no-op if it is not registered).
+    """
+    _REGISTRY.pop(name, None)
+
+
+def registered_steps() -> List[RepairStep]:
+    """
+    Return every registered step in registration order.
+    """
+    return list(_REGISTRY.values())
+
+
+def _waves(steps: List[RepairStep]) -> List[List[RepairStep]]:
+    """
+    Group steps into waves: every step's dependencies are in earlier waves.
+
+    Raises:
+        ValueError: On an unknown dependency or a dependency cycle.
+    """
+    by_name = {step.name: step for step in steps}
+    for step in steps:
+        for dep in step.requires:
+            if dep not in by_name:
+                raise ValueError(f"repair step {step.name!r} requires unknown step {dep!r}")
+
+    level: Dict[str, int] = {}
+    waves: List[List[RepairStep]] = []
+    remaining = list(steps)
+    while remaining:
+        ready = [s for s in remaining if all(dep in level for dep in s.requires)]
+        if not ready:
+            names = ", ".join(s.name for s in remaining)
+            raise ValueError(f"repair steps have a dependency cycle: {names}")
+        for step in ready:
+            level[step.name] = len(waves)
+        waves.append(ready)
+        remaining = [s for s in remaining if s.name not in level]
+    return waves
+
+
+def _probe(step: RepairStep) -> Tuple[bool, float, Optional[str]]:
+    """Returns (needed, probe_ms, error); a failing probe counts as needed."""
+    if step.probe is None:
+        return True, 0.0, None
+    t0 = time.perf_counter()
+    try:
+        needed = bool(step.probe())
+        error = None
+    except Exception as exc:
+        needed, error = True, f"{type(exc).__name__}: {exc}"
+    return needed, round((time.perf_counter() - t0) * 1000, 3), error
+
+
+def plan_repair(steps: Optional[List[RepairStep]] = None) -> Dict[str, Any]:
+    """
+    Probe every step and build an execution plan without changing anything.
+
+    All probes run concurrently. A step is planned as:
+    - "run": its probe found something to repair (or it has no probe),
+    - "skip": its probe found nothing to do,
+    - "recheck": nothing to do now, but a dependency will run first, so
+      it is probed again once that dependency has finished.
+
+    Returns:
+        Dict[str, Any]: {"waves": [[name, ...], ...], "steps": [...]} where
+        each step entry has `name`, `requires`, `wave`, `action`,
+        `probe_ms` and optionally `probe_error`.
+    """
+    steps = registered_steps() if steps is None else steps
+    waves = _waves(steps)
+
+    with ThreadPoolExecutor(max_workers=max(1, len(steps))) as pool:
+        probes = dict(zip((s.name for s in steps), pool.map(_probe, steps)))
+
+    actions: Dict[str, str] = {}
+    entries: List[Dict[str, Any]] = []
+    for wave_no, wave in enumerate(waves):
+        for step in wave:
+            needed, probe_ms, error = probes[step.name]
+            if needed:
+                action = "run"
+            elif any(actions[dep] in ("run", "recheck") for dep in step.requires):
+                action = "recheck"
+            else:
+                action = "skip"
+            actions[step.name] = action
+            entry = {
+                "name": step.name,
+                "requires": list(step.requires),
+                "wave": wave_no,
+                "action": action,
+                "probe_ms": probe_ms,
+            }
+            if error is not None:
+                entry["probe_error"] = error
+            entries.append(entry)
+
+    return {"waves": [[s.name for s in wave] for wave in waves], "steps": entries}
+
+
+def _check_plan(plan: Dict[str, Any], by_name: Dict[str, RepairStep]) -> None:
+    """
+    Raises:
+        ValueError: If a saved plan does not match the registered steps.
+    """
+    seen = set()
+    for wave in plan["waves"]:
+        for name in wave:
+            step = by_name.get(name)
+            if step is None:
+                raise ValueError(f"plan names unknown repair step {name!r}")
+            missing = [dep for dep in step.requires if dep not in seen]
+            if missing:
+                raise ValueError(f"plan runs {name!r} before {', '.join(missing)}")
+        seen.update(wave)
+
+
+def _run_step(step: RepairStep, action: str, dry_run: bool) -> Dict[str, Any]:
+    if action == "recheck":
+        needed, _, _ = _probe(step)
+        if not needed:
+            return {"name": step.name, "ok": True, "skipped": True, "duration_ms": 0.0}
+    t0 = time.perf_counter()
+    try:
+        result = dict(step.func(dry_run) or {})
+    except Exception as exc:
+        result = {"ok": False, "error": f"{type(exc).__name__}: {exc}"}
+    result["name"] = step.name
+    result.setdefault("ok", False)
+    result["duration_ms"] = round((time.perf_counter() - t0) * 1000, 2)
+    return result
+
+
+def run_repair(dry_run: bool = False, plan: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Run the registered repair steps.
+
+    Steps are probed first (see plan_repair); steps with nothing to do are
+    skipped, and the steps of one wave run concurrently. A step whose
+    dependency failed is not run. On a healthy host only the probes run.
+
+    Args:
+        dry_run: Report what would change without touching anything.
+        plan: A plan from plan_repair() to execute instead of probing again.
+
+    Returns:
+        Dict[str, Any]: `overall_ok`, `summary` counts, the `plan` and one
+        result per step with its `duration_ms`.
     """
     log_section("Repair Run")
+    t0 = time.perf_counter()
 
-    root = get_project_root()
-    steps: List[Dict[str, Any]] = []
+    plan = plan_repair() if plan is None else plan
+    by_name = {step.name: step for step in registered_steps()}
+    actions = {entry["name"]: entry["action"] for entry in plan["steps"]}
+    _check_plan(plan, by_name)
 
-    logs_result = _repair_logs_directory()
-    steps.append(logs_result)
-    log("Repair step", context=logs_result)
+    results: Dict[str, Dict[str, Any]] = {}
+    with ThreadPoolExecutor(max_workers=max(1, max((len(w) for w in plan["waves"]), default=1))) as pool:
+        for wave in plan["waves"]:
+            futures = {}
+            for name in wave:
+                step = by_name[name]
+                failed = [dep for dep in step.requires if not results[dep].get("ok", False)]
+                if failed:
+                    results[name] = {
+                        "name": name,
+                        "ok": False,
+                        "blocked_by": failed,
+                        "duration_ms": 0.0,
+                    }
+                elif actions[name] == "skip":
+                    results[name] = {"name": name, "ok": True, "skipped": True, "duration_ms": 0.0}
+                else:
+                    futures[name] = pool.submit(_run_step, step, actions[name], dry_run)
+            for name, future in futures.items():
+                results[name] = future.result()
 
-    perm_result = _repair_permissions(root)
-    steps.append(perm_result)
-    log("Repair step", context=perm_result)
+    steps: List[Dict[str, Any]] = []
+    for entry in plan["steps"]:
+        step_result = results[entry["name"]]
+        steps.append(step_result)
+        log("Repair step", context=step_result)
 
     overall_ok = all(s.get("ok", False) for s in steps)
+    summary = {
+        key: sum(s.get(key, 0) for s in steps)
+        for key in ("scanned", "owner_changes", "mode_changes", "errors")
+    }
+    summary["skipped"] = sum(1 for s in steps if s.get("skipped"))
 
     result: Dict[str, Any] = {
         "timestamp": get_timestamp(),
         "overall_ok": overall_ok,
+        "dry_run": dry_run,
+        "duration_ms": round((time.perf_counter() - t0) * 1000, 2),
+        "summary": summary,
+        "plan": plan,
         "steps": steps,
     }
 
@@ -80,3 +548,34 @@ def run_repair() -> Dict[str, Any]:
         log("Repair completed with warnings", level="WARN", context={"overall_ok": False})
 
     return result
+
+
+# ─────────────────────────────────────────────
+# Built-in steps
+# ─────────────────────────────────────────────
+
+register_step(
+    "logs_directory",
+    lambda dry_run: _repair_logs_directory(dry_run=dry_run),
+    probe=lambda: not (get_project_root() / "logs").is_dir(),
+)
+
+
+def _register_permission_step(policy: PermissionPolicy) -> None:
+    def path() -> Path:
+        return get_project_root() / policy.path
+
+    def probe() -> bool:
+        found = _repair_permissions(path(), policy, dry_run=True, first_only=True)
+        return bool(found["owner_changes"] or found["mode_changes"] or found["errors"])
+
+    register_step(
+        f"permissions:{policy.path}",
+        lambda dry_run: _repair_permissions(path(), policy, dry_run=dry_run),
+        probe=probe,
+        requires=("logs_directory",) if policy.path == "logs" else (),
+    )
+
+
+for _policy in PERMISSION_POLICIES:
+    _register_permission_step(_policy)
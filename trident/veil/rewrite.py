@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, List, Tuple
+
+
+@dataclass(frozen=True)
+class RewriteRule:
+    """
+    A literal text substitution.
+
+    Attributes:
+        old: Text to find.
+        new: Replacement text.
+        word: Only match `old` on word boundaries.
+    """
+
+    old: str
+    new: str
+    word: bool = False
+
+
+class RewriteEngine:
+    """
+    Apply an ordered list of rules in a single scan of the text.
+
+    All rules are compiled into one alternation. The scan matches
+    leftmost first, and where several rules match at the same offset the
+    earliest rule in the list wins. Rules that do not feed into each other
+    give the same result as applying them one by one with `str.replace`,
+    without copying the document once per rule.
+
+    The alternation has no capture groups, which lets `re` skip ahead on
+    the rules' first characters; the replacement is looked up from the
+    matched text. Rule sets that repeat the same `old` text fall back to
+    one group per rule.
+    """
+
+    def __init__(self, rules: Iterable[RewriteRule]):
+        self.rules = tuple(rules)
+        olds = [rule.old for rule in self.rules]
+        self._by_text = None
+        if len(set(olds)) == len(olds):
+            self._by_text = {rule.old: rule.new for rule in self.rules}
+
+        parts = []
+        for rule in self.rules:
+            pattern = re.escape(rule.old)
+            if rule.word:
+                pattern = rf"\b{pattern}\b"
+            parts.append(pattern if self._by_text is not None else f"({pattern})")
+        self._regex = re.compile("|".join(parts)) if parts else None
+        # Text after a match start that decides the match: the longest
+        # `old` plus one character for a trailing word boundary.
+        self._horizon = max((len(o) for o in olds), default=0) + 1
+
+    def rewrite(self, text: str) -> str:
+        if self._regex is None:
+            return text
+        return self._regex.sub(self._replace, text)
+
+    def rewrite_chunks(self, chunks: Iterable[str]) -> Iterator[str]:
+        """
+        Rewrite text arriving in chunks, yielding the output in chunks.
+
+        Concatenating the output equals `rewrite()` of the concatenated
+        input. At most one horizon (the longest rule plus one character)
+        of each chunk is held back, so a match cut at a chunk boundary is
+        completed by the next chunk.
+        """
+        if self._regex is None:
+            yield from chunks
+            return
+        buf, pos = "", 0
+        for chunk in chunks:
+            buf += chunk
+            out, pos = self._scan(buf, pos, len(buf) - self._horizon)
+            if out:
+                yield out
+            if pos > 1:
+                # Keep one character before pos for a leading \b.
+                buf, pos = buf[pos - 1:], 1
+        out, _ = self._scan(buf, pos, len(buf))
+        if out:
+            yield out
+
+    def _scan(self, buf: str, pos: int, limit: int) -> Tuple[str, int]:
+        """
+        Replace matches in buf[pos:] that start at or before limit; every
+        such match is decided by text already in buf. Returns the output
+        and the offset up to which buf has been consumed.
+        """
+        pieces = []
+        while True:
+            match = self._regex.search(buf, pos)
+            if match is None or match.start() > limit:
+                break
+            pieces.append(buf[pos:match.start()])
+            pieces.append(self._replace(match))
+            pos = match.end()
+        # No match can start in buf[pos:limit + 1] any more.
+        end = max(pos, min(limit + 1, len(buf)))
+        pieces.append(buf[pos:end])
+        return "".join(pieces), end
+
+    def _replace(self, match: re.Match) -> str:
+        if self._by_text is not None:
+            return self._by_text[match.group()]
+        return self.rules[match.lastindex - 1].new
+
+    @property
+    def signature(self) -> str:
+        """
+        Stable sha256 of the rule set, suitable as a cache or manifest key.
+        """
+        payload = json.dumps([[r.old, r.new, r.word] for r in self.rules])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def load_rules(path: Path) -> List[RewriteRule]:
+    """
+    Load an ordered rule set from a YAML file.
+
+    The file holds a list (optionally under a top-level `rules:` key) of
+    mappings with `from`, `to` and an optional `word` flag:
+
+        rules:
+          - from: "Veil Updater"
+            to: "Veil Sentinel Hardener"
+          - from: "update"
+            to: "harden"
+            word: true
+
+    Args:
+        path: YAML file to read.
+
+    Returns:
+        List[RewriteRule]: Rules in file order.
+    """
+    import yaml
+
+    data = yaml.safe_load(path.read_text(encoding="utf-8")) or []
+    if isinstance(data, dict):
+        data = data.get("rules", [])
+
+    rules: List[RewriteRule] = []
+    for i, entry in enumerate(data):
+        if not isinstance(entry, dict) or "from" not in entry or "to" not in entry:
+            raise ValueError(f"{path}: rule {i} must be a mapping with 'from' and 'to'")
+        rules.append(
+            RewriteRule(str(entry["from"]), str(entry["to"]), bool(entry.get("word", False)))
+        )
+    return rules
+
+
+# Docs language rule used by the hardener (Updater → Hardener).
+LANGUAGE_RULES: List[RewriteRule] = [
+    RewriteRule("Updater", "Hardener"),
+]
+
+# Ordered rules for the docs refactor script. More specific phrases come
+# first so they win over the generic single-word swaps at the same offset.
+DOCS_REFACTOR_RULES: List[RewriteRule] = [
+    # Whole-word / capitalized forms first
+    RewriteRule("Veil Updater", "Veil Sentinel Hardener"),
+    RewriteRule("Updater Module", "Hardener Module"),
+    RewriteRule("updater module", "hardener module"),
+
+    RewriteRule("Updater", "Hardener"),
+    RewriteRule("updater", "hardener"),
+
+    # Action verbs – this is a bit heuristic
+    RewriteRule("run the updater", "run the hardener"),
+    RewriteRule("Run the updater", "Run the hardener"),
+    RewriteRule("update pass", "hardening pass"),
+    RewriteRule("update pipeline", "hardening pipeline"),
+    RewriteRule("Update pipeline", "Hardening pipeline"),
+
+    # Generic verb-ish swaps (careful: very broad)
+    RewriteRule("update run", "hardener run"),
+    RewriteRule("update", "harden"),
+    RewriteRule("Update", "Harden"),
+]
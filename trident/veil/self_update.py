@@ -1,43 +1,314 @@
 from __future__ import annotations
 
+import os
+import re
+import shutil
 import subprocess
 import sys
-from typing import Dict
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 
-from .identity import get_version, get_timestamp
+from .cache import read_cache, write_cache
+from .identity import DIST_NAME, get_version, get_timestamp
 from .logging import log, log_section
 
 
+# Package index JSON API. Point TRIDENT_INDEX_URL at a mirror or a local
+# stand-in; the project document is fetched from <index>/<name>/json.
+DEFAULT_INDEX_URL = "https://pypi.org/pypi"
+INDEX_URL_ENV = "TRIDENT_INDEX_URL"
+
+# Simple (PEP 503) index pip installs from. Derived from TRIDENT_INDEX_URL
+# unless set explicitly, so pip and the digest check use the same index;
+# with neither set, pip keeps its own configured index.
+SIMPLE_INDEX_URL_ENV = "TRIDENT_SIMPLE_INDEX_URL"
+
+# The cached latest version is served as-is for this many seconds; after
+# that it is still served, but refreshed in the background.
+VERSION_TTL = 3600.0
+VERSION_CACHE_FILE = "latest-version.json"
+
+REQUEST_TIMEOUT = 5
+
+_refresh_thread: Optional[threading.Thread] = None
+_refresh_lock = threading.Lock()
+
+
+# name-version(-build)?-python-abi-platform.whl
+_WHEEL_NAME = re.compile(r"^(?P<name>[^-]+)-(?P<version>[^-]+)-.+\.whl$")
+
+
+def get_index_url(name: str = DIST_NAME, version: Optional[str] = None) -> str:
+    """
+    Return the JSON API URL of a distribution (or one of its releases) on
+    the configured index.
+    """
+    base = (os.environ.get(INDEX_URL_ENV) or DEFAULT_INDEX_URL).rstrip("/")
+    if version is not None:
+        return f"{base}/{name}/{version}/json"
+    return f"{base}/{name}/json"
+
+
+def get_simple_index_url() -> Optional[str]:
+    """
+    Return the simple index URL to pass to pip as --index-url, or None to
+    leave the choice to pip's own configuration (pip.conf, PIP_INDEX_URL).
+
+    TRIDENT_SIMPLE_INDEX_URL wins; otherwise a TRIDENT_INDEX_URL ending in
+    /pypi maps to the sibling /simple (as on PyPI and its mirrors), and
+    any other base is assumed to serve /simple below it.
+    """
+    explicit = os.environ.get(SIMPLE_INDEX_URL_ENV)
+    if explicit:
+        return explicit.rstrip("/") + "/"
+    base = os.environ.get(INDEX_URL_ENV)
+    if not base:
+        return None
+    base = base.rstrip("/")
+    if base.endswith("/pypi"):
+        base = base[: -len("/pypi")]
+    return f"{base}/simple/"
+
+
+def _index_args() -> List[str]:
+    index_url = get_simple_index_url()
+    return ["--index-url", index_url] if index_url else []
+
+
+def _fetch_latest_version(url: str, cached: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Fetch the latest version, revalidating a cached entry if there is one.
+
+    Returns:
+        Dict[str, Any]: Cache entry with `url`, `version`, `etag`,
+        `last_modified` and `fetched_at`.
+
+    Raises:
+        Exception: On any network, HTTP or parse error.
+    """
+    from trident.core.http import get_session
+
+    headers = {"Accept": "application/json"}
+    if cached:
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+    response = get_session().get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+    if response.status_code == 304 and cached:
+        entry = dict(cached)
+    else:
+        response.raise_for_status()
+        entry = {
+            "url": url,
+            "version": response.json()["info"]["version"],
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+        }
+    entry["fetched_at"] = time.time()
+    write_cache(VERSION_CACHE_FILE, entry)
+    return entry
+
+
+def _refresh(url: str, cached: Dict[str, Any]) -> None:
+    try:
+        _fetch_latest_version(url, cached)
+    except Exception as exc:
+        log("Background version refresh failed", level="WARN", context={"url": url, "error": str(exc)})
+
+
+def _start_refresh(url: str, cached: Dict[str, Any]) -> None:
+    global _refresh_thread
+    with _refresh_lock:
+        if _refresh_thread is not None and _refresh_thread.is_alive():
+            return
+        # A daemon: the cached answer is already printed, so exit is never
+        # held up by the index. An interrupted refresh leaves the cache as
+        # it was (write_cache replaces atomically) and the next run retries.
+        _refresh_thread = threading.Thread(
+            target=_refresh, args=(url, cached), name="version-refresh", daemon=True
+        )
+        _refresh_thread.start()
+
+
+def _lookup_latest_version(ttl: float = VERSION_TTL, refresh: bool = False) -> Tuple[str, str]:
+    """
+    Return (version, source) for the latest release on the index.
+
+    Source is "index" (fetched or revalidated now), "cache" (within ttl),
+    "stale" (past ttl; a background refresh was started) or "unavailable".
+    """
+    url = get_index_url()
+    cached = read_cache(VERSION_CACHE_FILE)
+    if not isinstance(cached, dict) or cached.get("url") != url or not cached.get("version"):
+        cached = None
+
+    if cached and not refresh:
+        age = time.time() - cached.get("fetched_at", 0)
+        if 0 <= age <= ttl:
+            return cached["version"], "cache"
+        _start_refresh(url, cached)
+        return cached["version"], "stale"
+
+    try:
+        return _fetch_latest_version(url, cached)["version"], "index"
+    except Exception as exc:
+        log("Version check failed", level="WARN", context={"url": url, "error": str(exc)})
+        if cached:
+            return cached["version"], "stale"
+        return "unknown", "unavailable"
+
+
 def _get_latest_version() -> str:
     """
-    Query PyPI for the latest version of trident-cli.
+    Query the package index for the latest version of trident-cli.
+
+    Answers come from an on-disk cache (see _lookup_latest_version).
+    """
+    return _lookup_latest_version()[0]
+
+
+def _verify_wheel(path: Path) -> Dict[str, Any]:
+    """
+    Hash a downloaded wheel and compare it with the digest the index
+    publishes for that file.
+    """
+    from trident.core.http import get_session
+
+    from .wheel_cache import sha256_file
+
+    entry: Dict[str, Any] = {"file": path.name, "size": path.stat().st_size, "verified": False}
+    entry["sha256"] = sha256_file(path)
+    match = _WHEEL_NAME.match(path.name)
+    if not match:
+        entry["error"] = "not a wheel"
+        return entry
+    try:
+        response = get_session().get(
+            get_index_url(match.group("name"), match.group("version")), timeout=REQUEST_TIMEOUT
+        )
+        response.raise_for_status()
+        published = {
+            u.get("filename"): (u.get("digests") or {}).get("sha256")
+            for u in response.json().get("urls", [])
+        }
+    except Exception as exc:
+        entry["error"] = f"index lookup failed: {exc}"
+        return entry
+    if published.get(path.name) is None:
+        entry["error"] = "file not published on the index"
+    elif published[path.name] != entry["sha256"]:
+        entry["error"] = f"sha256 mismatch (index: {published[path.name]})"
+    else:
+        entry["verified"] = True
+    return entry
+
+
+def prefetch_update(version: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Download the target release and its dependencies as wheels, verify them
+    against the index's published sha256 digests and store them in the
+    wheel cache, so update-apply can install without index access.
+
+    Args:
+        version: Version to prefetch (default: the latest release).
     """
+    from . import wheel_cache
+
+    log_section("Self-Update Prefetch")
+
+    source = "argument"
+    if version is None:
+        version, source = _lookup_latest_version(refresh=True)
+    result: Dict[str, Any] = {
+        "timestamp": get_timestamp(),
+        "version": version,
+        "latest_source": source,
+        "ok": False,
+    }
+    if version == "unknown":
+        result["error"] = "latest version unavailable"
+        return result
+
+    existing = wheel_cache.verified_set(version)
+    if existing is not None:
+        result.update(ok=True, path=str(existing), already_cached=True)
+        return result
+
+    wheel_cache.wheel_cache_dir().mkdir(parents=True, exist_ok=True)
+    download_dir = Path(tempfile.mkdtemp(prefix=".download-", dir=wheel_cache.wheel_cache_dir()))
     try:
-        import requests
-        response = requests.get("https://pypi.org/pypi/trident-cli/json", timeout=5)
-        data = response.json()
-        return data["info"]["version"]
-    except Exception:
-        return "unknown"
+        # Wheels only: an sdist could not be built later without an index.
+        subprocess.check_call([
+            sys.executable, "-m", "pip", "download", "--quiet", *_index_args(),
+            "--only-binary=:all:", "--dest", str(download_dir),
+            f"{DIST_NAME}=={version}",
+        ])
+        wheels = sorted(download_dir.glob("*.whl"))
+        with ThreadPoolExecutor(max_workers=max(1, min(8, len(wheels)))) as pool:
+            files: List[Dict[str, Any]] = list(pool.map(_verify_wheel, wheels))
+        result["files"] = files
+        failed = [f for f in files if not f["verified"]]
+        if failed or not files:
+            result["error"] = f"{len(failed)} of {len(files)} wheel(s) failed verification"
+            log("Self-update prefetch failed", level="ERROR", context={"version": version, "failed": failed})
+            return result
+
+        target = wheel_cache.store_set(version, {w: f["sha256"] for w, f in zip(wheels, files)})
+        result.update(ok=True, path=str(target), pruned=wheel_cache.prune())
+        log("Self-update prefetched", context={"version": version, "files": len(files), "path": str(target)})
+    except Exception as exc:
+        log("Self-update prefetch failed", level="ERROR", context={"error": str(exc)})
+        result["error"] = str(exc)
+    finally:
+        shutil.rmtree(download_dir, ignore_errors=True)
+    return result
 
 
-def run_self_update(apply: bool = False) -> Dict[str, str]:
+def run_self_update(apply: bool = False, refresh: bool = False) -> Dict[str, Any]:
+    """
+    Compare the installed version with the latest release and optionally
+    install it.
+
+    Args:
+        apply: Run pip to install the newer release.
+        refresh: Bypass the version cache TTL and ask the index now.
+    """
     log_section("Self-Update Check")
 
     current = get_version()
-    latest = _get_latest_version()
+    # Never act on a stale answer when installing.
+    latest, source = _lookup_latest_version(refresh=refresh or apply)
 
     result = {
         "timestamp": get_timestamp(),
         "current_version": current,
         "latest_version": latest,
+        "latest_source": source,
         "update_available": latest != "unknown" and latest != current,
         "applied": False,
     }
 
     if apply and result["update_available"]:
+        from .wheel_cache import verified_set
+
+        prefetched = verified_set(latest)
+        if prefetched is not None:
+            # Everything was downloaded and verified by `update --prefetch`.
+            command = [
+                sys.executable, "-m", "pip", "install", "--upgrade",
+                "--no-index", "--find-links", str(prefetched), f"{DIST_NAME}=={latest}",
+            ]
+        else:
+            command = [sys.executable, "-m", "pip", "install", "--upgrade", *_index_args(), DIST_NAME]
+        result["prefetched"] = prefetched is not None
         try:
-            subprocess.check_call([sys.executable, "-m", "pip", "install", "--upgrade", "trident-cli"])
+            subprocess.check_call(command)
             result["applied"] = True
             log("Self-update applied", context=result)
         except Exception as exc:
@@ -0,0 +1,142 @@
+"""
+Content-addressed wheel cache for `veil update --prefetch`.
+
+Layout under <cache dir>/wheels:
+
+    blobs/<sha256>                 one file per distinct wheel
+    sets/<version>/<wheel file>    hard links into blobs/, usable as pip --find-links
+    sets/<version>/manifest.json   {"version", "files": {<wheel file>: <sha256>}}
+
+A set is only used once its manifest exists, and every file is hashed
+again before pip sees it.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .cache import get_cache_dir
+
+
+MANIFEST = "manifest.json"
+
+# Prefetched versions kept; older sets and unreferenced blobs are removed.
+KEEP_SETS = 2
+
+
+def wheel_cache_dir() -> Path:
+    return get_cache_dir() / "wheels"
+
+
+def sha256_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _link_or_copy(src: Path, dst: Path) -> None:
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def store_set(version: str, files: Dict[Path, str]) -> Path:
+    """
+    Move verified wheels into the blob store and publish them as a set.
+
+    Args:
+        version: Target version the set installs.
+        files: Downloaded wheel path -> verified sha256.
+
+    Returns:
+        Path: The set directory (for pip --find-links).
+    """
+    root = wheel_cache_dir()
+    blobs = root / "blobs"
+    blobs.mkdir(parents=True, exist_ok=True)
+
+    staging = root / "sets" / f".{version}.{os.getpid()}.tmp"
+    shutil.rmtree(staging, ignore_errors=True)
+    staging.mkdir(parents=True)
+
+    manifest = {}
+    for path, digest in files.items():
+        blob = blobs / digest
+        if not blob.exists():
+            tmp = blobs / f".{digest}.{os.getpid()}.tmp"
+            shutil.copyfile(path, tmp)
+            os.replace(tmp, blob)
+        _link_or_copy(blob, staging / path.name)
+        manifest[path.name] = digest
+    (staging / MANIFEST).write_text(
+        json.dumps({"version": version, "files": manifest}, indent=2, sort_keys=True), encoding="utf-8"
+    )
+
+    target = root / "sets" / version
+    shutil.rmtree(target, ignore_errors=True)
+    os.replace(staging, target)
+    return target
+
+
+def verified_set(version: str) -> Optional[Path]:
+    """
+    Return the set directory for version if every listed wheel is present
+    and still matches its recorded hash, else None.
+    """
+    target = wheel_cache_dir() / "sets" / version
+    try:
+        manifest = json.loads((target / MANIFEST).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    files = manifest.get("files") or {}
+    if not files:
+        return None
+    for name, digest in files.items():
+        try:
+            if sha256_file(target / name) != digest:
+                return None
+        except OSError:
+            return None
+    return target
+
+
+def prune(keep: int = KEEP_SETS) -> List[str]:
+    """
+    Keep the `keep` most recently prefetched sets and drop blobs no set uses.
+
+    Returns:
+        List[str]: Versions removed.
+    """
+    root = wheel_cache_dir()
+    sets_dir = root / "sets"
+    try:
+        sets = [p for p in sets_dir.iterdir() if (p / MANIFEST).exists()]
+    except OSError:
+        return []
+    sets.sort(key=lambda p: (p / MANIFEST).stat().st_mtime, reverse=True)
+
+    removed = []
+    for old in sets[keep:]:
+        shutil.rmtree(old, ignore_errors=True)
+        removed.append(old.name)
+
+    used = set()
+    for kept in sets[:keep]:
+        try:
+            used.update(json.loads((kept / MANIFEST).read_text(encoding="utf-8"))["files"].values())
+        except (OSError, ValueError, KeyError):
+            continue
+    blobs = root / "blobs"
+    if blobs.is_dir():
+        for blob in blobs.iterdir():
+            if blob.name not in used and not blob.name.startswith("."):
+                blob.unlink(missing_ok=True)
+    return removed